@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark da AsyncMusicAPI: milhares de buscas disparadas de uma vez contra
+um servidor local com latência simulada, limitadas pelo semáforo.
+
+Uso:
+    python benchmarks/benchmark_api_async.py [quantidade_de_musicas] [concorrencia]
+"""
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import api_music_async
+from api_music_async import AsyncMusicAPI
+from servidor_itunes_falso import iniciar_servidor
+
+
+async def rodar(url, musicas, concorrencia):
+    async with AsyncMusicAPI(url, cache=False, max_concorrencia=concorrencia) as api:
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados = await api.buscar_varias(musicas)
+        tempo = time.perf_counter() - inicio
+    encontradas = sum(1 for info in resultados if info)
+    print(f"{len(musicas)} buscas em {tempo:.2f}s ({len(musicas) / tempo:.0f}/s), "
+          f"{api.requisicoes} requisições, {encontradas} encontradas")
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concorrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    servidor = iniciar_servidor(atraso=0.02)
+
+    transporte = 'aiohttp' if api_music_async.aiohttp is not None else 'requests em threads'
+    print(f"Transporte: {transporte}; concorrência: {concorrencia}; latência: 20 ms")
+    musicas = [(f"Musica {i}", f"Artista{i % 50}") for i in range(quantidade)]
+    asyncio.run(rodar(servidor.url, musicas, concorrencia))
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark da busca aproximada (Biblioteca.buscar_aproximado) digitando um
+termo com erro letra por letra, como a busca da GUI faz a cada tecla, e
+comparação com a varredura que calcula a distância de cada palavra de cada
+música.
+
+Uso:
+    python benchmarks/benchmark_busca_aproximada.py [musicas]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from biblioteca import Biblioteca
+from busca_aproximada import distancia_edicao, orcamento_erros
+from normalizacao import dobrar_texto
+from track import Track
+
+
+SILABAS = ['ra', 'me', 'lo', 'ni', 'sce', 'bo', 'he', 'mi', 'an', 'so', 'lu', 'ta',
+           'cor', 'ção', 'vi', 'da', 'pri', 'ma', 'ver', 'ro']
+
+# Termos digitados com erro (o benchmark mede cada prefixo)
+TERMOS = ['reminsce', 'bohemain rapsody', 'corasao', 'artsta 1234']
+
+
+def _palavra(aleatorio):
+    return ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4)))
+
+
+def gerar_playlist(quantidade):
+    aleatorio = random.Random(42)
+    biblioteca = Biblioteca()
+    # Só a busca aproximada é medida: o índice de substring não é registrado
+    biblioteca.observadores.remove(biblioteca.indice_busca)
+    titulos = ['Reminisce', 'Bohemian Rhapsody', 'Coração']
+    biblioteca.carregar(
+        Track(titulos[i] if i < len(titulos) else
+              ' '.join(_palavra(aleatorio) for _ in range(aleatorio.randint(1, 4))),
+              f"Artista {aleatorio.randrange(20000)}",
+              f"Álbum {aleatorio.randrange(80000)}",
+              'Rock', '2000')
+        for i in range(quantidade))
+    return biblioteca
+
+
+def varredura(biblioteca, termo):
+    # Referência: distância de cada palavra digitada a cada palavra de cada música
+    palavras = dobrar_texto(termo).split()
+    encontradas = []
+    for musica in biblioteca:
+        vocabulario = re.findall(r'\w+', f"{musica.dobrado('titulo')} {musica.dobrado('artista')}")
+        if all(any(distancia_edicao(palavra, outra) <= orcamento_erros(len(palavra))
+                   for outra in vocabulario)
+               for palavra in palavras):
+            encontradas.append(musica)
+    return encontradas
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    inicio = time.perf_counter()
+    biblioteca = gerar_playlist(quantidade)
+    print(f"{quantidade} músicas geradas em {time.perf_counter() - inicio:.1f}s")
+
+    inicio = time.perf_counter()
+    indice = biblioteca.busca_aproximada()
+    print(f"Índice montado em {time.perf_counter() - inicio:.1f}s "
+          f"({len(indice._vocabulario)} palavras distintas)\n")
+
+    for termo in TERMOS:
+        tempos = []
+        for fim in range(1, len(termo) + 1):
+            inicio = time.perf_counter()
+            biblioteca.buscar_aproximado(termo[:fim], prefixo=True)
+            tempos.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        resultado = biblioteca.buscar_aproximado(termo)
+        tempo_final = time.perf_counter() - inicio
+        print(f"{termo!r:<20} por tecla: média {sum(tempos) / len(tempos) * 1000:6.1f} ms, "
+              f"pior {max(tempos) * 1000:6.1f} ms | termo completo {tempo_final * 1000:6.1f} ms, "
+              f"{len(resultado)} música(s)")
+
+    # Conferência com a varredura (uma vez, é lenta)
+    termo = TERMOS[0]
+    inicio = time.perf_counter()
+    esperado = varredura(biblioteca, termo)
+    tempo_varredura = time.perf_counter() - inicio
+    assert set(map(id, biblioteca.buscar_aproximado(termo))) == set(map(id, esperado)), termo
+    print(f"\nVarredura de {termo!r}: {tempo_varredura:.1f}s (mesmo resultado)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark de buscar_informacoes_completas: estratégias em sequência x em paralelo,
+contra um servidor local com latência simulada (sem cache).
+
+Uso:
+    python benchmarks/benchmark_busca_paralela.py [latencia_em_ms]
+"""
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api_music import MusicAPI
+from servidor_itunes_falso import iniciar_servidor
+
+
+# (descrição, título, artista)
+CASOS = [
+    ('encontrada', 'Musica Boa', 'Artista'),
+    ('não encontrada', 'Inexistente', 'Ninguem'),
+]
+
+
+def main():
+    latencia = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.2
+    servidor = iniciar_servidor(atraso=latencia)
+    api = MusicAPI(servidor.url, cache=False)
+
+    print(f"Latência simulada: {latencia * 1000:.0f} ms por requisição\n")
+    for descricao, titulo, artista in CASOS:
+        for paralelo in (False, True):
+            antes = servidor.requisicoes
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                info = api.buscar_informacoes_completas(titulo, artista, paralelo=paralelo)
+            tempo = time.perf_counter() - inicio
+            modo = 'paralelo' if paralelo else 'sequencial'
+            print(f"{descricao:<16} {modo:<11} {tempo * 1000:>8.1f} ms  "
+                  f"{servidor.requisicoes - antes} requisições  -> {info and info['titulo']}")
+
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark do cache da API: duas rodadas de buscar_informacoes_completas
+contra um servidor local. A segunda rodada e a rodada com o cache reaberto
+do disco não devem fazer requisições; se fizerem, o script termina com
+código de saída 1.
+
+Uso:
+    python benchmarks/benchmark_cache_api.py [quantidade_de_musicas]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api_music import MusicAPI
+from cache_api import CacheAPI
+from servidor_itunes_falso import iniciar_servidor
+
+
+def rodada(descricao, api, servidor, musicas):
+    """Busca todas as músicas, mostra tempo e requisições e retorna quantas o servidor recebeu"""
+    antes = servidor.requisicoes
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        encontradas = sum(1 for titulo, artista in musicas
+                          if api.buscar_informacoes_completas(titulo, artista))
+    tempo = time.perf_counter() - inicio
+    requisicoes = servidor.requisicoes - antes
+    print(f"{descricao:<16} {tempo * 1000:>9.1f} ms  {requisicoes:>6} requisições  "
+          f"({encontradas}/{len(musicas)} encontradas)")
+    return requisicoes
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    # Um quarto das músicas não existe na API (testa o cache negativo)
+    musicas = [(f"Musica {i}", f"Artista{i % 37}") if i % 4 else (f"Inexistente {i}", "Ninguem")
+               for i in range(quantidade)]
+    servidor = iniciar_servidor()
+    # Rodadas que deveriam ser atendidas só pelo cache -> requisições feitas
+    falhas = {}
+
+    with tempfile.TemporaryDirectory() as pasta:
+        cache = CacheAPI(Path(pasta) / 'cache_api.db')
+        rodada('1ª rodada', MusicAPI(servidor.url, cache), servidor, musicas)
+        falhas['2ª rodada'] = rodada('2ª rodada', MusicAPI(servidor.url, cache), servidor, musicas)
+        cache.fechar()
+
+        # Cache reaberto do disco (nova execução do programa)
+        cache = CacheAPI(Path(pasta) / 'cache_api.db')
+        falhas['cache reaberto'] = rodada('cache reaberto', MusicAPI(servidor.url, cache),
+                                          servidor, musicas)
+        print(f"\nEstatísticas: {cache.estatisticas()}")
+        cache.fechar()
+
+    servidor.shutdown()
+
+    falhas = {descricao: requisicoes for descricao, requisicoes in falhas.items() if requisicoes}
+    for descricao, requisicoes in falhas.items():
+        print(f">> FALHA: {descricao} fez {requisicoes} requisição(ões); esperado 0")
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark do download de capas: várias músicas do mesmo álbum buscadas ao
+mesmo tempo (como no enriquecimento em lote) devem baixar cada capa uma
+única vez, e uma segunda rodada não deve baixar nada.
+
+As capas são gravadas em data/album_covers com o prefixo "benchmark" e
+apagadas no final.
+
+Uso:
+    python benchmarks/benchmark_capas.py [musicas] [albuns] [trabalhadores]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from PIL import Image
+
+from api_music import MusicAPI, caminho_capa
+from api_music_async import AsyncMusicAPI
+from servidor_itunes_falso import iniciar_servidor
+
+
+def gerar_capa():
+    """JPEG 600x600 com ruído (tamanho parecido com uma capa real)"""
+    img = Image.effect_noise((600, 600), 64).convert('RGB')
+    saida = BytesIO()
+    img.save(saida, 'JPEG', quality=90)
+    return saida.getvalue()
+
+
+def apagar_capas(albuns):
+    for album in albuns:
+        caminho_capa(album).unlink(missing_ok=True)
+
+
+def rodada_threads(api, servidor, pedidos, trabalhadores):
+    baixadas = servidor.capas_servidas
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(trabalhadores) as executor:
+        caminhos = list(executor.map(lambda pedido: api.baixar_imagem(*pedido), pedidos))
+    assert all(caminhos)
+    return time.perf_counter() - inicio, servidor.capas_servidas - baixadas
+
+
+def rodada_async(servidor, pedidos, trabalhadores):
+    async def baixar_todas():
+        async with AsyncMusicAPI(servidor.url, cache=False, max_concorrencia=trabalhadores,
+                                 miniaturas=False) as api:
+            return await asyncio.gather(*(api.baixar_imagem(*pedido) for pedido in pedidos))
+
+    baixadas = servidor.capas_servidas
+    inicio = time.perf_counter()
+    assert all(asyncio.run(baixar_todas()))
+    return time.perf_counter() - inicio, servidor.capas_servidas - baixadas
+
+
+def main():
+    musicas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    albuns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    trabalhadores = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+
+    servidor = iniciar_servidor(atraso=0.05, imagem=gerar_capa())
+    url = servidor.url.replace('/search', '/capa/benchmark/600x600bb.jpg')
+    nomes = [f"benchmark capas {i}" for i in range(albuns)]
+    pedidos = [(url, nomes[i % albuns]) for i in range(musicas)]
+
+    print(f"{musicas} músicas de {albuns} álbuns, {trabalhadores} simultâneas "
+          f"(capa de {len(servidor.imagem) / 1024:.0f} KB)\n")
+    api = MusicAPI(servidor.url, cache=False, miniaturas=False)
+    try:
+        apagar_capas(nomes)
+        for descricao, rodada in (
+                ('threads, sem capas', lambda: rodada_threads(api, servidor, pedidos, trabalhadores)),
+                ('threads, capas salvas', lambda: rodada_threads(api, servidor, pedidos, trabalhadores)),
+                ('asyncio, sem capas', lambda: (apagar_capas(nomes),
+                                                rodada_async(servidor, pedidos, trabalhadores))[1])):
+            tempo, baixadas = rodada()
+            print(f"{descricao:<24} {tempo * 1000:>8.1f} ms  {baixadas:>4} downloads")
+    finally:
+        apagar_capas(nomes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark dos relatórios: consulta composta (Biblioteca.consultar) x list
+comprehension que normaliza cada campo de cada música (como o relatório
+da GUI fazia).
+
+A playlist sintética não registra o índice de n-gramas (a consulta não o
+usa), para que montar 1 milhão de músicas caiba em memória e tempo razoáveis.
+
+Uso:
+    python benchmarks/benchmark_consulta.py [musicas]
+"""
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from biblioteca import Biblioteca
+from track import Track
+
+
+GENEROS = ['Rock', 'Pop', 'MPB', 'Samba', 'Jazz', 'Música Clássica', 'Eletrônica', 'Forró']
+PALAVRAS = ['amor', 'noite', 'coração', 'love', 'lua', 'sol', 'live', 'saudade', 'fogo', 'mar']
+
+
+def _norm(s):
+    # Normalização por campo do relatório antigo da GUI
+    s = s or ""
+    s = unicodedata.normalize('NFKD', s)
+    s = s.encode('ASCII', 'ignore').decode('ASCII')
+    return s.casefold().strip()
+
+
+def _ano(musica):
+    return int(musica['ano']) if musica['ano'].isdigit() else None
+
+
+# (consulta, filtro equivalente por música)
+CASOS = [
+    ("genero = rock",
+     lambda m: _norm(m['genero']) == 'rock'),
+    ("genero = rock E ano ENTRE 1980 E 1990",
+     lambda m: _norm(m['genero']) == 'rock' and _ano(m) is not None and 1980 <= _ano(m) <= 1990),
+    ("artista ^ 'artista 12' OU album ~ 'album 777'",
+     lambda m: _norm(m['artista']).startswith('artista 12') or 'album 777' in _norm(m['album'])),
+    ("titulo ~ coracao E NAO genero = jazz",
+     lambda m: 'coracao' in _norm(m['titulo']) and _norm(m['genero']) != 'jazz'),
+    ("titulo REGEX '^(love|amor) ' E ano >= 2000",
+     lambda m: re.search('^(love|amor) ', m['titulo'], re.I) and (_ano(m) or 0) >= 2000),
+]
+
+
+def gerar_playlist(quantidade):
+    random.seed(42)
+    biblioteca = Biblioteca()
+    biblioteca.observadores.remove(biblioteca.indice_busca)
+    biblioteca.carregar(
+        Track(f"{random.choice(PALAVRAS)} {random.choice(PALAVRAS)} {i}",
+              f"Artista {random.randrange(20000)}",
+              f"Álbum {random.randrange(80000)}",
+              random.choice(GENEROS),
+              str(random.randrange(1950, 2025)))
+        for i in range(quantidade))
+    return biblioteca
+
+
+def medir(funcao, repeticoes=3):
+    melhor, resultado = None, None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempo = time.perf_counter() - inicio
+        melhor = tempo if melhor is None else min(melhor, tempo)
+    return melhor, resultado
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    inicio = time.perf_counter()
+    biblioteca = gerar_playlist(quantidade)
+    print(f"{quantidade} músicas geradas em {time.perf_counter() - inicio:.1f}s\n")
+
+    # A primeira consulta monta as colunas (valores distintos de cada campo)
+    inicio = time.perf_counter()
+    biblioteca.consultar(CASOS[-1][0] + " OU artista = x OU album = x")
+    print(f"Primeira consulta (monta as colunas): {(time.perf_counter() - inicio) * 1000:.0f} ms\n")
+
+    print(f"{'consulta':<48} {'comprehension':>14} {'consultar':>10} {'resultado':>10}")
+    for consulta, filtro in CASOS:
+        tempo_lista, esperado = medir(lambda: [m for m in biblioteca if filtro(m)], repeticoes=1)
+        tempo_consulta, encontrado = medir(lambda: biblioteca.consultar(consulta))
+        assert encontrado == esperado, consulta
+        print(f"{consulta:<48} {tempo_lista * 1000:>11.0f} ms {tempo_consulta * 1000:>7.1f} ms "
+              f"{len(encontrado):>10}")
+
+
+if __name__ == '__main__':
+    main()
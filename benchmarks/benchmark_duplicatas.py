@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark da detecção de duplicatas (duplicatas.detectar_duplicatas) em
+playlists de milhões de músicas, com uma fração de cópias alteradas
+(maiúsculas, acentos, sufixos de versão e erros de digitação).
+
+Mede o tempo por tamanho de playlist (deve crescer de forma ~linear) e
+confere quantas das cópias geradas foram encontradas.
+
+Uso:
+    python benchmarks/benchmark_duplicatas.py [musicas] [fracao_copias]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from duplicatas import detectar_duplicatas
+from track import Track
+
+
+SILABAS = ['ra', 'me', 'lo', 'ni', 'sce', 'bo', 'he', 'mi', 'an', 'so', 'lu', 'ta',
+           'cor', 'ção', 'vi', 'da', 'pri', 'ma', 'ver', 'ro']
+SUFIXOS = [' - Single', ' (Remastered 2011)', ' [Ao Vivo]', ' - Radio Edit']
+
+
+def _palavra(aleatorio):
+    return ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4)))
+
+
+def _copia(aleatorio, titulo):
+    # Variação do título que deve ser reconhecida como a mesma música
+    variacao = aleatorio.randrange(3)
+    if variacao == 0:
+        return titulo.upper()
+    if variacao == 1:
+        return titulo + aleatorio.choice(SUFIXOS)
+    # Erro de digitação: troca uma letra no meio de um título longo
+    meio = len(titulo) // 2
+    return titulo[:meio] + 'x' + titulo[meio + 1:] if len(titulo) >= 8 else titulo.lower()
+
+
+def gerar_musicas(quantidade, fracao_copias):
+    aleatorio = random.Random(42)
+    originais = int(quantidade * (1 - fracao_copias))
+    # Títulos únicos por artista (o número garante que originais não colidam)
+    musicas = [Track(f"{_palavra(aleatorio)} {_palavra(aleatorio)} {i}",
+                     f"Artista {aleatorio.randrange(quantidade // 20 + 1)}",
+                     f"Álbum {aleatorio.randrange(80000)}", 'Rock', '2000')
+               for i in range(originais)]
+    copias = [Track(_copia(aleatorio, original['titulo']), original['artista'], '----', '', '----')
+              for original in aleatorio.sample(musicas, quantidade - originais)]
+    musicas.extend(copias)
+    aleatorio.shuffle(musicas)
+    return musicas, len(copias)
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    fracao_copias = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    print(f"{'músicas':>10} {'tempo':>8} {'por música':>11} {'grupos':>8} {'removidas':>10} {'cópias':>8}")
+    quantidade = maximo // 4
+    while quantidade <= maximo:
+        musicas, copias = gerar_musicas(quantidade, fracao_copias)
+        inicio = time.perf_counter()
+        fila = detectar_duplicatas(musicas)
+        tempo = time.perf_counter() - inicio
+        removidas = sum(len(proposta.duplicatas) for proposta in fila.pendentes())
+        print(f"{quantidade:>10} {tempo:>7.1f}s {tempo / quantidade * 1e6:>8.1f} µs "
+              f"{len(fila):>8} {removidas:>10} {copias:>8}")
+        quantidade *= 2
+
+
+if __name__ == '__main__':
+    main()
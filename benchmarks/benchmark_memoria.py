@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark de memória: lista de dicionários x lista de Track x TrackTable.
+
+Uso:
+    python benchmarks/benchmark_memoria.py [quantidade_de_musicas]
+"""
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Permite importar os módulos de src/ executando a partir da raiz
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from main import _linha_para_musica
+from track import TrackTable
+
+
+def gerar_linhas(quantidade, semente=42):
+    """Gera linhas sintéticas no formato do playlist.txt, com repetição realista"""
+    aleatorio = random.Random(semente)
+    artistas = [f"Artista {i}" for i in range(max(1, quantidade // 20))]
+    generos = ['Pop', 'Rock', 'Electronic', 'Dance', 'Jazz', 'Hip Hop', 'Classical']
+
+    for i in range(quantidade):
+        artista = aleatorio.choice(artistas)
+        album = f"{artista} - Album {aleatorio.randint(1, 5)}"
+        ano = str(aleatorio.randint(1960, 2025)) if aleatorio.random() > 0.05 else '----'
+        yield f"Musica {i};{artista};{album};{aleatorio.choice(generos)};{ano}\n"
+
+
+def linha_para_dict(linha):
+    """Reproduz o formato antigo de carregar_dados (um dict por música)"""
+    dados = linha.strip().split(';')
+    return {
+        'titulo': dados[0],
+        'artista': dados[1],
+        'album': dados[2],
+        'genero': dados[3],
+        'ano': dados[4]
+    }
+
+
+def medir(descricao, construir):
+    """Mede a memória alocada (tracemalloc) para construir a estrutura"""
+    gc.collect()
+    tracemalloc.start()
+    estrutura = construir()
+    atual, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{descricao:<20} {atual / (1024 * 1024):>10.1f} MiB  ({len(estrutura)} músicas)")
+    del estrutura
+    return atual
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    linhas = list(gerar_linhas(quantidade))
+
+    print("=" * 60)
+    print(f"BENCHMARK DE MEMÓRIA - {quantidade} músicas".center(60))
+    print("=" * 60)
+
+    base = medir("Lista de dicts", lambda: [linha_para_dict(l) for l in linhas])
+    tracks = medir("Lista de Track", lambda: [_linha_para_musica(l) for l in linhas])
+    tabela = medir("TrackTable", lambda: TrackTable.de_musicas(_linha_para_musica(l) for l in linhas))
+
+    print("-" * 60)
+    print(f"Track:      {base / tracks:.1f}x menos memória que dicts")
+    print(f"TrackTable: {base / tabela:.1f}x menos memória que dicts")
+
+
+if __name__ == '__main__':
+    main()
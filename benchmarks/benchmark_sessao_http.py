@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark de latência por busca: requests.get avulso (uma conexão por
+requisição) x sessão com pool de conexões (keep-alive), contra um servidor
+local. Também mostra as novas tentativas após respostas 429.
+
+Em um servidor remoto com HTTPS a diferença é maior, pois cada conexão nova
+paga também o handshake TLS e a latência de rede.
+
+Uso:
+    python benchmarks/benchmark_sessao_http.py [quantidade_de_buscas]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import requests
+
+from api_music import MusicAPI
+from servidor_itunes_falso import iniciar_servidor
+
+
+def medir(descricao, servidor, buscar, quantidade):
+    """Faz as buscas e mostra latência média/p95 e conexões abertas"""
+    conexoes = servidor.conexoes
+    tempos = []
+    for i in range(quantidade):
+        inicio = time.perf_counter()
+        buscar(f"Artista Musica {i}")
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    print(f"{descricao:<22} média {statistics.mean(tempos) * 1000:>6.2f} ms  "
+          f"p95 {tempos[int(len(tempos) * 0.95)] * 1000:>6.2f} ms  "
+          f"{servidor.conexoes - conexoes:>5} conexões")
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    servidor = iniciar_servidor()
+    parametros = {'media': 'music', 'entity': 'song', 'limit': 10}
+
+    def buscar_avulso(termo):
+        requests.get(servidor.url, params=dict(parametros, term=termo), timeout=10).json()
+
+    api = MusicAPI(servidor.url, cache=False)
+
+    def buscar_sessao(termo):
+        api._consultar(termo, 10)
+
+    print(f"{quantidade} buscas por modo\n")
+    medir('requests.get avulso', servidor, buscar_avulso, quantidade)
+    medir('sessão com pool', servidor, buscar_sessao, quantidade)
+
+    # Novas tentativas: as duas primeiras respostas são 429
+    servidor.falhas = 2
+    antes = servidor.requisicoes
+    resultados = api._consultar("Artista Retry", 10)
+    print(f"\nCom 2 respostas 429: {servidor.requisicoes - antes} requisições, "
+          f"{len(resultados)} resultado(s) na última")
+
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Benchmark de abertura: leitura do playlist.txt x snapshot binário.
+
+Cada medição roda em um processo novo (abertura "a frio" do interpretador
+já carregado, com o arquivo no cache do sistema operacional).
+
+Uso:
+    python benchmarks/benchmark_snapshot.py [quantidade_de_musicas]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PASTA_SRC = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(PASTA_SRC))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_memoria import gerar_linhas
+from snapshot import caminho_snapshot, escrever_snapshot
+from main import ler_musicas
+
+
+# Código executado no processo filho; imprime o tempo em segundos
+_MEDICOES = {
+    'texto (ler_musicas)': (
+        "from main import ler_musicas\n"
+        "inicio = time.perf_counter()\n"
+        "playlist = list(ler_musicas(ARQUIVO))\n"
+    ),
+    'snapshot (tabela)': (
+        "from snapshot import carregar_tabela\n"
+        "inicio = time.perf_counter()\n"
+        "playlist = carregar_tabela(ARQUIVO)\n"
+        "assert playlist is not None\n"
+    ),
+    'carregar_dados': (
+        "from main import carregar_dados\n"
+        "inicio = time.perf_counter()\n"
+        "playlist = carregar_dados(ARQUIVO)\n"
+    ),
+}
+
+
+def medir(descricao, codigo, arquivo, repeticoes=3):
+    """Roda o código em processos novos e retorna o melhor tempo"""
+    programa = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(PASTA_SRC)!r})\n"
+        f"ARQUIVO = {str(arquivo)!r}\n"
+        + codigo +
+        "print(time.perf_counter() - inicio, len(playlist))\n"
+    )
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', programa], check=True,
+                               capture_output=True, text=True).stdout.splitlines()[-1].split()
+        tempos.append(float(saida[0]))
+    melhor = min(tempos)
+    print(f"{descricao:<22} {melhor * 1000:>10.1f} ms  ({saida[1]} músicas)")
+    return melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = Path(pasta) / 'playlist.txt'
+        with open(arquivo, 'w', encoding='utf-8') as saida:
+            saida.writelines(gerar_linhas(quantidade))
+
+        inicio = time.perf_counter()
+        escrever_snapshot(arquivo, ler_musicas(str(arquivo)))
+        print(f"Snapshot gravado em {time.perf_counter() - inicio:.2f} s "
+              f"(texto: {arquivo.stat().st_size / 1e6:.1f} MB, "
+              f"snapshot: {Path(caminho_snapshot(arquivo)).stat().st_size / 1e6:.1f} MB)\n")
+
+        print(f"{'Abertura':<22} {'Tempo':>13}")
+        for descricao, codigo in _MEDICOES.items():
+            medir(descricao, codigo, arquivo)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Servidor HTTP local que imita a busca da iTunes API, para benchmarks.
+
+Responde a /search?term=... com até "limit" resultados derivados do termo
+e conta quantas requisições recebeu (servidor.requisicoes) e quantas
+conexões TCP foram abertas (servidor.conexoes). Com uma imagem, também
+serve capas em /capa/... (contadas em servidor.capas_servidas).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _Tratador(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Permite conexões keep-alive
+    # Cabeçalho e corpo saem em escritas separadas; sem isso o keep-alive
+    # esbarra no Nagle + ACK atrasado (~40 ms por resposta)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.requisicoes += 1
+            falhar = servidor.falhas > 0
+            if falhar:
+                servidor.falhas -= 1
+        if falhar:
+            # Simula limite de taxa da API
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.path.startswith('/capa/'):
+            self._responder(servidor.imagem, 'image/jpeg')
+            with servidor.lock:
+                servidor.capas_servidas += 1
+            return
+
+        parametros = parse_qs(urlparse(self.path).query)
+        termo = parametros.get('term', [''])[0]
+        limite = int(parametros.get('limit', ['10'])[0])
+        palavras = termo.split()
+
+        resultados = []
+        if palavras and 'inexistente' not in termo.lower():
+            # "Artista Titulo": o primeiro termo vira o artista, o resto o título
+            artista, titulo = palavras[0], ' '.join(palavras[1:]) or palavras[0]
+            resultados = [{
+                'trackName': titulo,
+                'artistName': artista,
+                'collectionName': f"{artista} - Album",
+                'primaryGenreName': 'Pop',
+                'releaseDate': '2001-01-01T00:00:00Z',
+            }][:limite]
+            if servidor.imagem is not None:
+                endereco = f"http://{self.headers['Host']}/capa/{artista}/100x100bb.jpg"
+                for resultado in resultados:
+                    resultado['artworkUrl100'] = endereco
+
+        corpo = json.dumps({'resultCount': len(resultados), 'results': resultados}).encode('utf-8')
+        self._responder(corpo, 'application/json')
+
+    def _responder(self, corpo, tipo):
+        servidor = self.server
+        if servidor.atraso:
+            threading.Event().wait(servidor.atraso)
+        self.send_response(200)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass  # Sem log por requisição
+
+
+class _Servidor(ThreadingHTTPServer):
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.conexoes += 1
+        super().process_request(request, client_address)
+
+
+def iniciar_servidor(atraso=0.0, falhas=0, imagem=None):
+    """
+    Inicia o servidor em uma thread, numa porta livre de 127.0.0.1.
+
+    Args:
+        atraso (float): Espera (segundos) antes de cada resposta
+        falhas (int): Quantidade de respostas 429 antes de responder normalmente
+        imagem (bytes): Capa servida em /capa/...; None não inclui capas nos resultados
+
+    Returns:
+        ThreadingHTTPServer: Servidor; a URL de busca fica em servidor.url
+    """
+    servidor = _Servidor(('127.0.0.1', 0), _Tratador)
+    servidor.daemon_threads = True
+    servidor.requisicoes = 0
+    servidor.conexoes = 0
+    servidor.atraso = atraso
+    servidor.falhas = falhas
+    servidor.imagem = imagem
+    servidor.capas_servidas = 0
+    servidor.lock = threading.Lock()
+    servidor.url = f"http://127.0.0.1:{servidor.server_address[1]}/search"
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
@@ -9,45 +9,472 @@ Suporta: iTunes API (sem necessidade de chave de autenticação)
 """
 
 import requests
-from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
 from pathlib import Path
-import unicodedata
-import re
+import os
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
+from cache_api import obter_cache
+from miniaturas import obter_miniaturas
+# normalizar_texto continua disponível por aqui (api_music.normalizar_texto)
+from normalizacao import normalizar_texto
 
-def normalizar_texto(texto):
+
+# Endereço da busca da iTunes API
+ITUNES_URL = "https://itunes.apple.com/search"
+
+# Score a partir do qual um resultado é aceito sem tentar outras estratégias
+SCORE_BOM = 80
+
+# Score mínimo para aceitar um resultado
+SCORE_MINIMO = 30
+
+# Máximo de buscas simultâneas no modo paralelo (uma por estratégia)
+BUSCAS_PARALELAS = 6
+
+# Conexões mantidas abertas por host na sessão HTTP
+TAMANHO_POOL = 10
+
+# Novas tentativas em erros temporários (429 e 5xx), com espera exponencial
+TENTATIVAS = 3
+FATOR_ESPERA = 0.5  # 0.5s, 1s, 2s... (ou o Retry-After do servidor)
+STATUS_REPETIR = (429, 500, 502, 503, 504)
+
+# Tamanho dos blocos gravados durante o download das capas
+TAMANHO_BLOCO_DOWNLOAD = 64 * 1024
+
+_api_padrao = None
+_lock_api_padrao = threading.Lock()
+
+# Downloads de capas em andamento: caminho de destino -> Future
+_downloads_em_andamento = {}
+_lock_downloads = threading.Lock()
+
+
+def criar_sessao(tamanho_pool=TAMANHO_POOL, tentativas=TENTATIVAS, fator_espera=FATOR_ESPERA):
+    """
+    Cria uma sessão HTTP com conexões reaproveitadas (keep-alive) e novas tentativas.
+
+    Args:
+        tamanho_pool (int): Conexões mantidas abertas por host
+        tentativas (int): Novas tentativas em 429/5xx e falhas de conexão
+        fator_espera (float): Base da espera exponencial entre tentativas
+
+    Returns:
+        requests.Session: Sessão pronta para uso (pode ser compartilhada entre threads)
+    """
+    repeticao = Retry(total=tentativas,
+                      backoff_factor=fator_espera,
+                      status_forcelist=STATUS_REPETIR,
+                      allowed_methods=('GET',),
+                      respect_retry_after_header=True,
+                      raise_on_status=False)
+    adaptador = HTTPAdapter(pool_connections=tamanho_pool,
+                            pool_maxsize=tamanho_pool,
+                            max_retries=repeticao)
+    sessao = requests.Session()
+    sessao.mount('https://', adaptador)
+    sessao.mount('http://', adaptador)
+    return sessao
+
+
+def obter_api():
+    """Retorna a MusicAPI compartilhada pelo processo, criando na primeira chamada"""
+    global _api_padrao
+    with _lock_api_padrao:
+        if _api_padrao is None:
+            _api_padrao = MusicAPI()
+        return _api_padrao
+
+
+def _preparar_consulta(titulo, artista):
+    """Formas do título e do artista procurados usadas na pontuação (calculadas uma vez)"""
+    return (titulo.lower(), normalizar_texto(titulo).lower(),
+            artista.lower(), normalizar_texto(artista).lower())
+
+
+def _pontuar_resultado(resultado, consulta):
+    """
+    Calcula a similaridade entre um resultado da API e a música procurada.
+
+    Args:
+        resultado (dict): Resultado da iTunes API
+        consulta (tuple): Título e artista procurados (ver _preparar_consulta)
+
+    Returns:
+        int: Score (0 a 160)
+    """
+    titulo, titulo_norm, artista, artista_norm = consulta
+    track_name = resultado.get('trackName', '').lower()
+    artist_name = resultado.get('artistName', '').lower()
+
+    score = 0
+
+    # Verifica se o título está presente
+    if titulo in track_name or track_name in titulo:
+        score += 50
+    if titulo_norm in normalizar_texto(track_name).lower():
+        score += 30
+
+    # Verifica se o artista está presente
+    if artista in artist_name or artist_name in artista:
+        score += 50
+    if artista_norm in normalizar_texto(artist_name).lower():
+        score += 30
+
+    return score
+
+
+def _escolher_melhor(respostas, titulo, artista):
+    """
+    Escolhe o melhor resultado percorrendo as respostas na ordem das estratégias.
+
+    Em empate fica o primeiro encontrado; a busca para no primeiro
+    resultado com score >= SCORE_BOM.
+
+    Args:
+        respostas (iterable): Lista de resultados de cada estratégia, em ordem
+        titulo (str): Título procurado
+        artista (str): Artista procurado
+
+    Returns:
+        tuple: (melhor resultado ou None, score)
+    """
+    melhor_resultado = None
+    melhor_score = 0
+    consulta = _preparar_consulta(titulo, artista)
+
+    for resultados in respostas:
+        # Procura o melhor match entre os resultados
+        for resultado in resultados:
+            score = _pontuar_resultado(resultado, consulta)
+
+            # Atualiza melhor resultado se score for maior
+            if score > melhor_score:
+                melhor_score = score
+                melhor_resultado = resultado
+
+                # Se encontrou um match muito bom, para de buscar
+                if score >= SCORE_BOM:
+                    break
+
+        # Se encontrou um match razoável, para de tentar outras estratégias
+        if melhor_score >= SCORE_BOM:
+            break
+
+    return melhor_resultado, melhor_score
+
+
+def _chave_musica(titulo, artista):
+    """Chave do cache para o resultado final de uma música"""
+    return f"musica:{normalizar_texto(titulo).casefold()}|{normalizar_texto(artista).casefold()}"
+
+
+def _estrategias_busca(titulo, artista):
+    """Textos de busca tentados, na ordem de preferência"""
+    titulo_norm = normalizar_texto(titulo)
+    artista_norm = normalizar_texto(artista)
+    return [
+        # 1. Artista + Título (normalizado)
+        f"{artista_norm} {titulo_norm}",
+        # 2. Título + Artista (normalizado)
+        f"{titulo_norm} {artista_norm}",
+        # 3. Artista + Título (original)
+        f"{artista} {titulo}",
+        # 4. Título + Artista (original)
+        f"{titulo} {artista}",
+        # 5. Apenas título (normalizado)
+        titulo_norm,
+        # 6. Apenas título (original)
+        titulo,
+    ]
+
+
+def _parametros_busca(termo, limite):
+    """Parâmetros da requisição de busca da iTunes API"""
+    return {
+        'term': termo,
+        'media': 'music',
+        'entity': 'song',
+        'limit': limite
+    }
+
+
+def _extrair_info(resultado, titulo, artista):
+    """Converte um resultado da API no dicionário de informações da música (sem a capa)"""
+    return {
+        'titulo': resultado.get('trackName', titulo),
+        'artista': resultado.get('artistName', artista),
+        'album': resultado.get('collectionName', 'Desconhecido'),
+        'genero': resultado.get('primaryGenreName', 'Desconhecido'),
+        'ano': resultado.get('releaseDate', '').split('-')[0] if resultado.get('releaseDate') else '----',
+        'capa_url': resultado.get('artworkUrl100', '').replace('100x100', '600x600'),
+        'preview_url': resultado.get('previewUrl', '')
+    }
+
+
+def _mostrar_info(info, score):
+    print(f"Informações encontradas (score: {score}):")
+    print(f"Música: {info['titulo']}")
+    print(f"Artista: {info['artista']}")
+    print(f"Álbum: {info['album']}")
+    print(f"Gênero: {info['genero']}")
+    print(f"Ano: {info['ano']}")
+
+
+# Pasta das capas baixadas ou importadas (data/album_covers)
+PASTA_CAPAS = Path(__file__).resolve().parent.parent / 'data' / 'album_covers'
+
+
+def _nome_limpo(texto):
+    """Texto sem caracteres especiais, usável como nome de arquivo ou pasta"""
+    nome = "".join(c for c in texto if c.isalnum() or c in (' ', '-', '_')).strip()
+    return nome.replace(' ', '_').lower()
+
+
+def nome_arquivo_capa(album_nome):
+    """Nome do arquivo da capa de um álbum (sem acessar o disco)"""
+    return f"{_nome_limpo(album_nome)}.png"
+
+
+def arquivo_capa(album_nome, artista=''):
     """
-    Normaliza texto removendo acentos e caracteres especiais para melhorar busca.
+    Caminho da capa de um álbum, sem acessar o disco.
+
+    Álbuns de mesmo nome de artistas diferentes ("Greatest Hits") têm capas
+    diferentes: cada artista tem sua pasta em data/album_covers. Sem artista,
+    a capa fica direto na pasta (como as capas gravadas por versões anteriores).
 
     Args:
-        texto (str): Texto a ser normalizado
+        album_nome (str): Nome do álbum
+        artista (str): Artista do álbum
 
     Returns:
-        str: Texto normalizado
+        Path: Caminho do PNG
     """
-    if not texto:
-        return ""
+    pasta = _nome_limpo(artista)
+    if not pasta:
+        return PASTA_CAPAS / nome_arquivo_capa(album_nome)
+    return PASTA_CAPAS / pasta / nome_arquivo_capa(album_nome)
 
-    # Remove acentos
-    texto_nfd = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(char for char in texto_nfd if unicodedata.category(char) != 'Mn')
 
-    # Remove caracteres especiais exceto espaços e hífens
-    texto_limpo = re.sub(r'[^\w\s-]', '', texto_sem_acento)
+def capa_antiga(caminho):
+    """Caminho da mesma capa na pasta única usada antes das pastas por artista"""
+    return PASTA_CAPAS / Path(caminho).name
 
-    # Remove espaços extras
-    texto_limpo = ' '.join(texto_limpo.split())
 
-    return texto_limpo
+def caminho_capa(album_nome, artista=''):
+    """
+    Caminho do arquivo da capa de um álbum em data/album_covers.
+
+    Args:
+        album_nome (str): Nome do álbum
+        artista (str): Artista do álbum (ver arquivo_capa)
+
+    Returns:
+        Path: Caminho do PNG (a pasta é criada se necessário)
+    """
+    destino = arquivo_capa(album_nome, artista)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    return destino
+
+
+def imagem_valida(caminho):
+    """True se o arquivo existe e é uma imagem íntegra"""
+    try:
+        with Image.open(caminho) as img:
+            img.verify()
+        return True
+    except (OSError, SyntaxError, ValueError):
+        return False
+
+
+def _novo_temporario(destino):
+    """Cria um arquivo temporário na pasta do destino (o rename final é atômico)"""
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix=destino.name + '.',
+                                             suffix='.tmp')
+    return os.fdopen(descritor, 'wb'), Path(temporario)
+
+
+def finalizar_imagem(temporario, destino):
+    """
+    Valida a imagem baixada e a coloca no destino com um rename atômico.
+
+    Só reconverte para PNG se o arquivo baixado estiver em outro formato.
+
+    Args:
+        temporario (Path): Arquivo baixado (removido ao final)
+        destino (Path): Caminho final da capa (.png)
+
+    Returns:
+        str: Caminho da imagem salva
+    """
+    convertido = None
+    try:
+        with Image.open(temporario) as img:
+            formato = img.format
+            img.verify()
+
+        if formato != 'PNG':
+            convertido_arquivo, convertido = _novo_temporario(destino)
+            with convertido_arquivo, Image.open(temporario) as img:
+                img.save(convertido_arquivo, 'PNG')
+            os.replace(convertido, destino)
+        else:
+            os.replace(temporario, destino)
+    finally:
+        # Depois de um rename bem-sucedido o temporário já não existe
+        for arquivo in (temporario, convertido):
+            if arquivo is not None and arquivo.exists():
+                arquivo.unlink()
+
+    print(f"Capa do álbum salva: {destino}")
+    return str(destino)
+
+
+def baixar_para_arquivo(sessao, url, destino):
+    """
+    Baixa a URL em blocos para um temporário e finaliza no destino.
+
+    Args:
+        sessao (requests.Session): Sessão HTTP
+        url (str): URL da imagem
+        destino (Path): Caminho final da capa
+
+    Returns:
+        str: Caminho da imagem salva
+    """
+    arquivo, temporario = _novo_temporario(destino)
+    try:
+        with arquivo, sessao.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            for bloco in response.iter_content(TAMANHO_BLOCO_DOWNLOAD):
+                arquivo.write(bloco)
+    except BaseException:
+        temporario.unlink()
+        raise
+    return finalizar_imagem(temporario, destino)
+
+
+def _executar_uma_vez(chave, funcao):
+    """
+    Executa funcao() uma única vez por chave entre threads simultâneas.
+
+    Quem chega enquanto a execução está em andamento espera e recebe o mesmo
+    resultado (ou a mesma exceção), sem repetir o trabalho.
+    """
+    with _lock_downloads:
+        futuro = _downloads_em_andamento.get(chave)
+        responsavel = futuro is None
+        if responsavel:
+            futuro = _downloads_em_andamento[chave] = Future()
+
+    if not responsavel:
+        return futuro.result()
+
+    try:
+        resultado = funcao()
+    except BaseException as e:
+        futuro.set_exception(e)
+        raise
+    else:
+        futuro.set_result(resultado)
+        return resultado
+    finally:
+        with _lock_downloads:
+            del _downloads_em_andamento[chave]
+
+
+def _maior_score(resultados, consulta):
+    """Maior score entre os resultados de uma estratégia (0 se não houver)"""
+    return max((_pontuar_resultado(resultado, consulta) for resultado in resultados), default=0)
+
+
+def _estrategias_necessarias(ordem, maiores_scores):
+    """
+    Quantas estratégias, na ordem, ainda importam para a escolha.
+
+    A busca sequencial para na primeira estratégia com um resultado de score
+    >= SCORE_BOM; as posteriores a ela podem ser descartadas.
+
+    Args:
+        ordem (list): Identificador de cada estratégia, na ordem original
+        maiores_scores (dict): Identificador -> maior score (só as já respondidas)
+
+    Returns:
+        int: Quantidade de estratégias iniciais que ainda importam
+    """
+    for i, identificador in enumerate(ordem):
+        if maiores_scores.get(identificador, 0) >= SCORE_BOM:
+            return i + 1
+    return len(ordem)
 
 
 class MusicAPI:
     """Classe para buscar informações de músicas via APIs"""
 
-    def __init__(self):
+    def __init__(self, base_url=ITUNES_URL, cache=None, limitador=None,
+                 tamanho_pool=TAMANHO_POOL, tentativas=TENTATIVAS, miniaturas=None):
+        """
+        Args:
+            base_url (str): Endereço da busca (permite apontar para um servidor local)
+            cache (CacheAPI): Cache das respostas; None usa o cache padrão
+                (data/cache_api.db) e False desativa o cache
+            limitador: Objeto com aguardar(url), chamado antes de cada
+                requisição (ex.: enriquecimento.LimitadorPorHost)
+            miniaturas (CacheMiniaturas): Gera as miniaturas de cada capa baixada;
+                None usa o cache padrão (data/miniaturas) e False desativa
+            tamanho_pool (int): Conexões mantidas abertas por host
+            tentativas (int): Novas tentativas em 429/5xx
+        """
         # iTunes API (não requer autenticação)
-        self.itunes_base_url = "https://itunes.apple.com/search"
+        self.itunes_base_url = base_url
+        # Sessão com keep-alive: evita um novo handshake TCP+TLS por requisição
+        self.sessao = criar_sessao(tamanho_pool, tentativas)
+        self.cache = obter_cache() if cache is None else (cache or None)
+        self.limitador = limitador
+        self.miniaturas = obter_miniaturas() if miniaturas is None else (miniaturas or None)
+        # Requisições de busca feitas de fato (sem contar acertos do cache)
+        self.requisicoes = 0
+        self._lock = threading.Lock()
+        self._executor = None  # Criado na primeira busca paralela
+
+    def _consultar(self, termo, limite):
+        """
+        Busca na iTunes API, passando antes pelo cache.
+
+        Erros de rede/HTTP são propagados e não vão para o cache;
+        uma resposta sem resultados é guardada como negativa.
+
+        Args:
+            termo (str): Texto da busca
+            limite (int): Número máximo de resultados
+
+        Returns:
+            list: Resultados da API (dicts)
+        """
+        chave = f"busca:{limite}:{termo}"
+        if self.cache is not None:
+            encontrado, resultados = self.cache.obter(chave)
+            if encontrado:
+                return resultados or []
+
+        params = _parametros_busca(termo, limite)
+        with self._lock:
+            self.requisicoes += 1
+        if self.limitador is not None:
+            self.limitador.aguardar(self.itunes_base_url)
+        response = self.sessao.get(self.itunes_base_url, params=params, timeout=10)
+        response.raise_for_status()
+
+        resultados = response.json().get('results', [])
+        if self.cache is not None:
+            self.cache.guardar(chave, resultados)
+        return resultados
 
     def buscar_capa_album(self, titulo, artista):
         """
@@ -64,24 +491,15 @@ class MusicAPI:
         try:
             # Monta a query de busca
             query = f"{artista} {titulo}"
-            params = {
-                'term': query,
-                'media': 'music',
-                'entity': 'song',
-                'limit': 1
-            }
 
             print(f"Buscando: {query}")
 
-            # Faz requisição para a iTunes API
-            response = requests.get(self.itunes_base_url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+            # Faz requisição para a iTunes API (ou usa o cache)
+            resultados = self._consultar(query, 1)
 
             # Verifica se encontrou resultados
-            if data['resultCount'] > 0:
-                resultado = data['results'][0]
+            if resultados:
+                resultado = resultados[0]
 
                 # Obtém a URL da imagem em alta resolução
                 imagem_url = resultado.get('artworkUrl100', '')
@@ -91,7 +509,7 @@ class MusicAPI:
 
                 if imagem_url:
                     album_nome = resultado.get('collectionName', 'unknown')
-                    return self.baixar_imagem(imagem_url, album_nome)
+                    return self.baixar_imagem(imagem_url, album_nome, artista)
 
             print("Nenhum resultado encontrado na API")
             return None
@@ -100,48 +518,117 @@ class MusicAPI:
             print(f"Erro ao buscar capa do álbum: {e}")
             return None
 
-    def baixar_imagem(self, url, album_nome):
+    def baixar_imagem(self, url, album_nome, artista=''):
         """
         Baixa a imagem da URL e salva localmente.
 
         Args:
             url (str): URL da imagem
             album_nome (str): Nome do álbum (usado para nomear o arquivo)
+            artista (str): Artista do álbum (ver arquivo_capa)
 
         Returns:
             str: Caminho da imagem salva
         """
         try:
-            print(f"📥 Baixando imagem do álbum...")
+            # Uma capa por álbum e artista: se já está no disco, não baixa de novo
+            destino = caminho_capa(album_nome, artista)
+            if imagem_valida(destino):
+                return str(destino)
+
+            def baixar():
+                # Outra thread pode ter terminado o mesmo álbum enquanto esperávamos
+                if imagem_valida(destino):
+                    return str(destino)
+                print(f"📥 Baixando imagem do álbum...")
+                if self.limitador is not None:
+                    self.limitador.aguardar(url)
+                caminho = baixar_para_arquivo(self.sessao, url, destino)
+                if self.miniaturas is not None:
+                    self.miniaturas.agendar(caminho)
+                return caminho
+
+            # Pedidos simultâneos do mesmo álbum compartilham um único download
+            return _executar_uma_vez(str(destino), baixar)
 
-            # Faz download da imagem
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            # Abre a imagem com PIL
-            img = Image.open(BytesIO(response.content))
+        except Exception as e:
+            print(f"Erro ao baixar imagem: {e}")
+            return None
 
-            # Define pasta de destino dentro de data/album_covers
-            project_root = Path(__file__).resolve().parent.parent
-            pasta_destino = project_root / 'data' / 'album_covers'
-            pasta_destino.mkdir(parents=True, exist_ok=True)
+    def _consultar_em_sequencia(self, estrategias, erros):
+        """Gera as respostas das estratégias uma a uma, só quando pedidas"""
+        for i, query in enumerate(estrategias):
+            if not query.strip():
+                continue
+            try:
+                if i == 0:  # Só mostra a primeira tentativa
+                    print(f"   Tentando: {query}")
 
-            # Nome do arquivo (limpa caracteres especiais)
-            nome_arquivo = "".join(c for c in album_nome if c.isalnum() or c in (' ', '-', '_')).strip()
-            nome_arquivo = nome_arquivo.replace(' ', '_').lower()
-            caminho_destino = pasta_destino / f"{nome_arquivo}.png"
+                # Aumenta limite para ter mais opções
+                yield self._consultar(query, 10)
+            except Exception as e:
+                erros.append(e)
+                if i == 0:  # Só mostra erro na primeira tentativa
+                    print(f"Erro na busca: {e}")
+                yield []
 
-            # Salva a imagem
-            img.save(str(caminho_destino), 'PNG')
-            print(f"Capa do álbum salva: {caminho_destino}")
+    def _obter_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=BUSCAS_PARALELAS,
+                                                    thread_name_prefix='busca-api')
+            return self._executor
 
-            return str(caminho_destino)
+    def _consultar_em_paralelo(self, estrategias, titulo, artista, erros):
+        """
+        Dispara todas as estratégias ao mesmo tempo e pontua as respostas conforme chegam.
 
-        except Exception as e:
-            print(f"Erro ao baixar imagem: {e}")
-            return None
+        Assim que uma estratégia tem um resultado com score >= SCORE_BOM, as
+        estratégias posteriores deixam de importar (a busca sequencial pararia
+        nela ou antes) e são canceladas; só se espera pelas anteriores.
 
-    def buscar_informacoes_completas(self, titulo, artista):
+        Returns:
+            list: Respostas das estratégias necessárias, na ordem original
+        """
+        executor = self._obter_executor()
+        futuros = {}  # query -> futuro (estratégias repetidas compartilham a requisição)
+        ordem = []    # futuro de cada estratégia, na ordem original
+        for query in estrategias:
+            if not query.strip():
+                continue
+            futuro = futuros.get(query)
+            if futuro is None:
+                futuro = futuros[query] = executor.submit(self._consultar, query, 10)
+            ordem.append(futuro)
+
+        print(f"   Tentando {len(futuros)} buscas em paralelo")
+
+        respostas = {}
+        maiores_scores = {}
+        consulta = _preparar_consulta(titulo, artista)
+        necessarias = len(ordem)
+        pendentes = set(futuros.values())
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                try:
+                    respostas[futuro] = futuro.result()
+                except Exception as e:
+                    if not erros:
+                        print(f"Erro na busca: {e}")
+                    erros.append(e)
+                    respostas[futuro] = []
+                maiores_scores[futuro] = _maior_score(respostas[futuro], consulta)
+
+            necessarias = _estrategias_necessarias(ordem, maiores_scores)
+            usados = set(ordem[:necessarias])
+            for futuro in pendentes - usados:
+                futuro.cancel()  # Requisições já em andamento terminam em segundo plano
+            pendentes &= usados
+
+        return [respostas[futuro] for futuro in ordem[:necessarias]]
+
+    def buscar_informacoes_completas(self, titulo, artista, paralelo=False, propagar_erros=False):
         """
         Busca informações completas da música (álbum, gênero, ano, capa).
         Tenta múltiplas estratégias de busca para aumentar chances de sucesso.
@@ -149,124 +636,69 @@ class MusicAPI:
         Args:
             titulo (str): Título da música
             artista (str): Nome do artista
+            paralelo (bool): Faz as buscas das estratégias ao mesmo tempo
+                (o resultado escolhido é o mesmo da ordem sequencial)
+            propagar_erros (bool): Se nada foi encontrado e alguma estratégia
+                falhou, levanta o primeiro erro em vez de retornar None
 
         Returns:
             dict: Dicionário com informações da música ou None
         """
-        # Normaliza os textos de entrada
-        titulo_norm = normalizar_texto(titulo)
-        artista_norm = normalizar_texto(artista)
+        # Resultado já conhecido (positivo ou negativo) para esta música
+        chave = _chave_musica(titulo, artista)
+        if self.cache is not None:
+            encontrado, info = self.cache.obter(chave)
+            if encontrado:
+                if info is None:
+                    print(f"Nenhum resultado encontrado para '{titulo}' - '{artista}' (cache)")
+                    return None
+                print(f"Informações encontradas (cache): {info['titulo']} - {info['artista']}")
+                # A capa pode ter sido apagada desde a última busca
+                if not (info.get('capa_path') and Path(info['capa_path']).exists()):
+                    info['capa_path'] = (
+                        self.baixar_imagem(info['capa_url'], info['album'], artista)
+                        if info.get('capa_url') else None)
+                return info
 
         # Tenta diferentes estratégias de busca
-        estrategias = [
-            # 1. Artista + Título (normalizado)
-            f"{artista_norm} {titulo_norm}",
-            # 2. Título + Artista (normalizado)
-            f"{titulo_norm} {artista_norm}",
-            # 3. Artista + Título (original)
-            f"{artista} {titulo}",
-            # 4. Título + Artista (original)
-            f"{titulo} {artista}",
-            # 5. Apenas título (normalizado)
-            titulo_norm,
-            # 6. Apenas título (original)
-            titulo,
-        ]
+        estrategias = _estrategias_busca(titulo, artista)
 
         print(f"🔍 Buscando: '{titulo}' por '{artista}'")
 
-        melhor_resultado = None
-        melhor_score = 0
-
-        for i, query in enumerate(estrategias):
-            if not query.strip():
-                continue
-
-            try:
-                params = {
-                    'term': query,
-                    'media': 'music',
-                    'entity': 'song',
-                    'limit': 10  # Aumenta limite para ter mais opções
-                }
-
-                if i == 0:  # Só mostra a primeira tentativa
-                    print(f"   Tentando: {query}")
-
-                response = requests.get(self.itunes_base_url, params=params, timeout=10)
-                response.raise_for_status()
-
-                data = response.json()
-
-                if data['resultCount'] > 0:
-                    # Procura o melhor match entre os resultados
-                    for resultado in data['results']:
-                        track_name = resultado.get('trackName', '').lower()
-                        artist_name = resultado.get('artistName', '').lower()
-
-                        # Calcula score de similaridade
-                        score = 0
-
-                        # Verifica se o título está presente
-                        if titulo.lower() in track_name or track_name in titulo.lower():
-                            score += 50
-                        if normalizar_texto(titulo).lower() in normalizar_texto(track_name).lower():
-                            score += 30
+        # Erros de rede/HTTP das estratégias (uma estratégia com erro conta como sem resultados)
+        erros = []
+        if paralelo:
+            respostas = self._consultar_em_paralelo(estrategias, titulo, artista, erros)
+        else:
+            respostas = self._consultar_em_sequencia(estrategias, erros)
 
-                        # Verifica se o artista está presente
-                        if artista.lower() in artist_name or artist_name in artista.lower():
-                            score += 50
-                        if normalizar_texto(artista).lower() in normalizar_texto(artist_name).lower():
-                            score += 30
-
-                        # Atualiza melhor resultado se score for maior
-                        if score > melhor_score:
-                            melhor_score = score
-                            melhor_resultado = resultado
-
-                            # Se encontrou um match muito bom (score >= 80), para de buscar
-                            if score >= 80:
-                                break
-
-                    # Se encontrou um match razoável, para de tentar outras estratégias
-                    if melhor_score >= 80:
-                        break
-
-            except Exception as e:
-                if i == 0:  # Só mostra erro na primeira tentativa
-                    print(f"Erro na busca: {e}")
-                continue
+        melhor_resultado, melhor_score = _escolher_melhor(respostas, titulo, artista)
+        houve_erro = bool(erros)
 
         # Se encontrou algum resultado
-        if melhor_resultado and melhor_score >= 30:  # Score mínimo aceitável
+        if melhor_resultado and melhor_score >= SCORE_MINIMO:  # Score mínimo aceitável
             # Extrai informações
-            info = {
-                'titulo': melhor_resultado.get('trackName', titulo),
-                'artista': melhor_resultado.get('artistName', artista),
-                'album': melhor_resultado.get('collectionName', 'Desconhecido'),
-                'genero': melhor_resultado.get('primaryGenreName', 'Desconhecido'),
-                'ano': melhor_resultado.get('releaseDate', '').split('-')[0] if melhor_resultado.get('releaseDate') else '----',
-                'capa_url': melhor_resultado.get('artworkUrl100', '').replace('100x100', '600x600'),
-                'preview_url': melhor_resultado.get('previewUrl', '')
-            }
-
-            print(f"Informações encontradas (score: {melhor_score}):")
-            print(f"Música: {info['titulo']}")
-            print(f"Artista: {info['artista']}")
-            print(f"Álbum: {info['album']}")
-            print(f"Gênero: {info['genero']}")
-            print(f"Ano: {info['ano']}")
+            info = _extrair_info(melhor_resultado, titulo, artista)
+            _mostrar_info(info, melhor_score)
 
             # Baixa a capa
             if info['capa_url']:
-                info['capa_path'] = self.baixar_imagem(info['capa_url'], info['album'])
+                info['capa_path'] = self.baixar_imagem(info['capa_url'], info['album'], artista)
             else:
                 info['capa_path'] = None
 
+            if self.cache is not None:
+                self.cache.guardar(chave, info)
             return info
 
         print(f"Nenhum resultado encontrado para '{titulo}' - '{artista}'")
         print(f"   Melhor score alcançado: {melhor_score}")
+        # Falha de rede não é um "não encontrado": só guarda se todas as buscas responderam
+        if houve_erro:
+            if propagar_erros:
+                raise erros[0]
+        elif self.cache is not None:
+            self.cache.guardar(chave, None)
         return None
 
 
@@ -282,20 +714,21 @@ def buscar_e_salvar_capa(titulo, artista):
     Returns:
         str: Caminho da imagem ou None
     """
-    api = MusicAPI()
+    api = obter_api()
     return api.buscar_capa_album(titulo, artista)
 
 
-def buscar_informacoes_musica(titulo, artista):
+def buscar_informacoes_musica(titulo, artista, paralelo=False):
     """
     Função simplificada para buscar informações completas.
 
     Args:
         titulo (str): Título da música
         artista (str): Nome do artista
+        paralelo (bool): Faz as buscas das estratégias ao mesmo tempo
 
     Returns:
         dict: Informações da música ou None
     """
-    api = MusicAPI()
-    return api.buscar_informacoes_completas(titulo, artista)
+    api = obter_api()
+    return api.buscar_informacoes_completas(titulo, artista, paralelo)
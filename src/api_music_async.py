@@ -0,0 +1,362 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Versão assíncrona (asyncio) da MusicAPI.
+
+Usa as mesmas estratégias, pontuação, normalização e cache da MusicAPI
+(api_music). As requisições passam por um semáforo, então é possível
+disparar milhares de buscas ao mesmo tempo (buscar_varias) sem abrir mais
+que max_concorrencia conexões.
+
+Com o pacote opcional aiohttp instalado as requisições são nativas do
+asyncio; sem ele, cada requisição roda a sessão do requests em um
+ThreadPoolExecutor próprio com max_concorrencia threads, com a mesma
+interface. O cache (SQLite) e a conferência das capas (Pillow) também
+bloqueiam: rodam em threads (asyncio.to_thread), fora do loop de eventos.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    import aiohttp
+except ImportError:  # Opcional: sem aiohttp as requisições usam threads
+    aiohttp = None
+
+from api_music import (FATOR_ESPERA, ITUNES_URL, SCORE_BOM, SCORE_MINIMO, STATUS_REPETIR,
+                       TAMANHO_BLOCO_DOWNLOAD, TENTATIVAS, _chave_musica, _escolher_melhor,
+                       _estrategias_busca, _estrategias_necessarias, _extrair_info,
+                       _maior_score, _mostrar_info, _novo_temporario, _parametros_busca,
+                       _preparar_consulta, baixar_para_arquivo, caminho_capa, criar_sessao,
+                       finalizar_imagem, imagem_valida)
+from cache_api import obter_cache
+from miniaturas import obter_miniaturas
+
+
+# Requisições simultâneas por padrão
+CONCORRENCIA_PADRAO = 50
+
+# Tempo máximo de cada requisição (segundos)
+TEMPO_LIMITE = 10
+
+
+class AsyncMusicAPI:
+    """Cliente assíncrono da iTunes API, com limite de requisições simultâneas"""
+
+    def __init__(self, base_url=ITUNES_URL, cache=None,
+                 max_concorrencia=CONCORRENCIA_PADRAO, tentativas=TENTATIVAS, miniaturas=None):
+        """
+        Args:
+            base_url (str): Endereço da busca (permite apontar para um servidor local)
+            cache (CacheAPI): Cache das respostas; None usa o cache padrão
+                (data/cache_api.db) e False desativa o cache
+            max_concorrencia (int): Requisições HTTP simultâneas
+            tentativas (int): Novas tentativas em 429/5xx
+            miniaturas (CacheMiniaturas): Gera as miniaturas de cada capa baixada;
+                None usa o cache padrão (data/miniaturas) e False desativa
+        """
+        self.itunes_base_url = base_url
+        self.cache = obter_cache() if cache is None else (cache or None)
+        self.miniaturas = obter_miniaturas() if miniaturas is None else (miniaturas or None)
+        self.max_concorrencia = max_concorrencia
+        self.tentativas = tentativas
+        # Requisições feitas de fato (sem contar acertos do cache)
+        self.requisicoes = 0
+        # Criados no primeiro uso, dentro do loop de eventos
+        self._semaforo = None
+        self._sessao = None
+        self._executor = None  # Requisições do requests (sem aiohttp)
+        # Downloads de capas em andamento: caminho de destino -> tarefa
+        self._downloads = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.fechar()
+
+    async def fechar(self):
+        """Fecha a sessão HTTP"""
+        if self._sessao is not None:
+            if aiohttp is not None:
+                await self._sessao.close()
+            else:
+                self._sessao.close()
+            self._sessao = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _obter_sessao(self):
+        if self._sessao is None:
+            if aiohttp is not None:
+                self._sessao = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.max_concorrencia),
+                    timeout=aiohttp.ClientTimeout(total=TEMPO_LIMITE))
+            else:
+                self._sessao = criar_sessao(self.max_concorrencia, self.tentativas)
+        return self._sessao
+
+    async def _em_thread(self, funcao, *args, **kwargs):
+        """Roda uma chamada bloqueante do requests no executor próprio (uma thread por conexão)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concorrencia,
+                                                thread_name_prefix='api-async')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(funcao, *args, **kwargs))
+
+    async def _get(self, url, params=None, como_json=False, destino=None):
+        """
+        GET respeitando o limite de concorrência; novas tentativas em 429/5xx.
+
+        Com destino (Path), o corpo é gravado em blocos em um temporário e
+        finalizado como capa (ver finalizar_imagem), sem ficar todo na memória.
+        """
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_concorrencia)
+        sessao = self._obter_sessao()
+
+        async with self._semaforo:
+            self.requisicoes += 1
+            if aiohttp is None:
+                # A sessão do requests já faz as novas tentativas
+                if destino is not None:
+                    return await self._em_thread(baixar_para_arquivo, sessao, url, destino)
+                resposta = await self._em_thread(sessao.get, url, params=params, timeout=TEMPO_LIMITE)
+                resposta.raise_for_status()
+                return resposta.json() if como_json else resposta.content
+
+            for tentativa in range(self.tentativas + 1):
+                async with sessao.get(url, params=params) as resposta:
+                    if resposta.status not in STATUS_REPETIR or tentativa == self.tentativas:
+                        resposta.raise_for_status()
+                        if destino is not None:
+                            return await self._gravar_capa(resposta, destino)
+                        if como_json:
+                            # A iTunes API responde JSON como text/javascript
+                            return await resposta.json(content_type=None)
+                        return await resposta.read()
+                    espera = resposta.headers.get('Retry-After', '')
+                    espera = float(espera) if espera.isdigit() else FATOR_ESPERA * 2 ** tentativa
+                await asyncio.sleep(espera)
+
+    @staticmethod
+    async def _gravar_capa(resposta, destino):
+        """Grava o corpo da resposta aiohttp em blocos e finaliza a capa"""
+        arquivo, temporario = _novo_temporario(destino)
+        try:
+            with arquivo:
+                async for bloco in resposta.content.iter_chunked(TAMANHO_BLOCO_DOWNLOAD):
+                    arquivo.write(bloco)
+        except BaseException:
+            temporario.unlink()
+            raise
+        return await asyncio.to_thread(finalizar_imagem, temporario, destino)
+
+    async def _consultar(self, termo, limite):
+        """Busca na iTunes API, passando antes pelo cache (ver MusicAPI._consultar)"""
+        chave = f"busca:{limite}:{termo}"
+        if self.cache is not None:
+            encontrado, resultados = await asyncio.to_thread(self.cache.obter, chave)
+            if encontrado:
+                return resultados or []
+
+        dados = await self._get(self.itunes_base_url, _parametros_busca(termo, limite), como_json=True)
+        resultados = dados.get('results', [])
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.guardar, chave, resultados)
+        return resultados
+
+    async def baixar_imagem(self, url, album_nome, artista=''):
+        """
+        Baixa a capa do álbum em blocos, uma única vez por álbum e artista.
+
+        Args:
+            url (str): URL da imagem
+            album_nome (str): Nome do álbum (usado para nomear o arquivo)
+            artista (str): Artista do álbum (ver api_music.arquivo_capa)
+
+        Returns:
+            str: Caminho da imagem salva ou None
+        """
+        try:
+            # Uma capa por álbum e artista: se já está no disco, não baixa de novo
+            destino = caminho_capa(album_nome, artista)
+            if await asyncio.to_thread(imagem_valida, destino):
+                return str(destino)
+
+            # Pedidos simultâneos do mesmo álbum aguardam o mesmo download
+            chave = str(destino)
+            tarefa = self._downloads.get(chave)
+            if tarefa is None:
+                print("📥 Baixando imagem do álbum...")
+                tarefa = self._downloads[chave] = asyncio.ensure_future(
+                    self._baixar_capa(url, destino))
+                tarefa.add_done_callback(lambda _: self._downloads.pop(chave, None))
+            # shield: cancelar um dos interessados não cancela o download dos outros
+            return await asyncio.shield(tarefa)
+        except Exception as e:
+            print(f"Erro ao baixar imagem: {e}")
+            return None
+
+    async def _baixar_capa(self, url, destino):
+        caminho = await self._get(url, destino=destino)
+        if self.miniaturas is not None:
+            self.miniaturas.agendar(caminho)
+        return caminho
+
+    async def buscar_capa_album(self, titulo, artista):
+        """
+        Busca a capa do álbum e retorna o caminho da imagem salva ou None.
+
+        Args:
+            titulo (str): Título da música
+            artista (str): Nome do artista
+
+        Returns:
+            str: Caminho da imagem salva ou None
+        """
+        try:
+            query = f"{artista} {titulo}"
+            print(f"Buscando: {query}")
+            resultados = await self._consultar(query, 1)
+            if resultados:
+                resultado = resultados[0]
+                imagem_url = resultado.get('artworkUrl100', '').replace('100x100', '600x600')
+                if imagem_url:
+                    return await self.baixar_imagem(imagem_url, resultado.get('collectionName', 'unknown'),
+                                                    artista)
+
+            print("Nenhum resultado encontrado na API")
+            return None
+
+        except Exception as e:
+            print(f"Erro ao buscar capa do álbum: {e}")
+            return None
+
+    async def _resposta(self, query, erros):
+        """Resultados de uma estratégia; erros contam como 'sem resultados'"""
+        try:
+            return await self._consultar(query, 10)
+        except Exception as e:
+            if not erros:
+                print(f"Erro na busca: {e}")
+            erros.append(e)
+            return []
+
+    async def _consultar_em_sequencia(self, estrategias, titulo, artista, erros):
+        consulta = _preparar_consulta(titulo, artista)
+        respostas = []
+        for query in estrategias:
+            if not query.strip():
+                continue
+            resultados = await self._resposta(query, erros)
+            respostas.append(resultados)
+            if _maior_score(resultados, consulta) >= SCORE_BOM:
+                break
+        return respostas
+
+    async def _consultar_em_paralelo(self, estrategias, titulo, artista, erros):
+        """Dispara as estratégias juntas e cancela as que deixam de importar"""
+        tarefas = {}  # query -> tarefa (estratégias repetidas compartilham a requisição)
+        ordem = []
+        for query in estrategias:
+            if not query.strip():
+                continue
+            tarefa = tarefas.get(query)
+            if tarefa is None:
+                tarefa = tarefas[query] = asyncio.ensure_future(self._resposta(query, erros))
+            ordem.append(tarefa)
+
+        consulta = _preparar_consulta(titulo, artista)
+        maiores_scores = {}
+        necessarias = len(ordem)
+        pendentes = set(tarefas.values())
+        while pendentes:
+            prontas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in prontas:
+                maiores_scores[tarefa] = _maior_score(tarefa.result(), consulta)
+
+            necessarias = _estrategias_necessarias(ordem, maiores_scores)
+            usadas = set(ordem[:necessarias])
+            for tarefa in pendentes - usadas:
+                tarefa.cancel()
+            pendentes &= usadas
+
+        return [tarefa.result() for tarefa in ordem[:necessarias]]
+
+    async def buscar_informacoes_completas(self, titulo, artista, paralelo=False, propagar_erros=False):
+        """
+        Busca informações completas da música (álbum, gênero, ano, capa).
+
+        Mesmo resultado de MusicAPI.buscar_informacoes_completas.
+
+        Args:
+            titulo (str): Título da música
+            artista (str): Nome do artista
+            paralelo (bool): Faz as buscas das estratégias ao mesmo tempo
+            propagar_erros (bool): Se nada foi encontrado e alguma estratégia
+                falhou, levanta o primeiro erro em vez de retornar None
+
+        Returns:
+            dict: Dicionário com informações da música ou None
+        """
+        chave = _chave_musica(titulo, artista)
+        if self.cache is not None:
+            encontrado, info = await asyncio.to_thread(self.cache.obter, chave)
+            if encontrado:
+                if info is None:
+                    print(f"Nenhum resultado encontrado para '{titulo}' - '{artista}' (cache)")
+                    return None
+                print(f"Informações encontradas (cache): {info['titulo']} - {info['artista']}")
+                if not (info.get('capa_path') and os.path.exists(info['capa_path'])):
+                    info['capa_path'] = (await self.baixar_imagem(info['capa_url'], info['album'], artista)
+                                         if info.get('capa_url') else None)
+                return info
+
+        estrategias = _estrategias_busca(titulo, artista)
+        print(f"🔍 Buscando: '{titulo}' por '{artista}'")
+
+        erros = []
+        if paralelo:
+            respostas = await self._consultar_em_paralelo(estrategias, titulo, artista, erros)
+        else:
+            respostas = await self._consultar_em_sequencia(estrategias, titulo, artista, erros)
+
+        melhor_resultado, melhor_score = _escolher_melhor(respostas, titulo, artista)
+
+        if melhor_resultado and melhor_score >= SCORE_MINIMO:
+            info = _extrair_info(melhor_resultado, titulo, artista)
+            _mostrar_info(info, melhor_score)
+            info['capa_path'] = (await self.baixar_imagem(info['capa_url'], info['album'], artista)
+                                 if info['capa_url'] else None)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.guardar, chave, info)
+            return info
+
+        print(f"Nenhum resultado encontrado para '{titulo}' - '{artista}'")
+        print(f"   Melhor score alcançado: {melhor_score}")
+        if erros:
+            if propagar_erros:
+                raise erros[0]
+        elif self.cache is not None:
+            await asyncio.to_thread(self.cache.guardar, chave, None)
+        return None
+
+    async def buscar_varias(self, musicas, paralelo=False):
+        """
+        Busca várias músicas ao mesmo tempo (limitadas pelo semáforo).
+
+        Args:
+            musicas (iterable): Pares (titulo, artista)
+            paralelo (bool): Também paraleliza as estratégias de cada música
+
+        Returns:
+            list: Informações (ou None) de cada música, na mesma ordem
+        """
+        return await asyncio.gather(*(self.buscar_informacoes_completas(titulo, artista, paralelo)
+                                      for titulo, artista in musicas))
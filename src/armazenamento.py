@@ -0,0 +1,509 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Backends de armazenamento da playlist.
+
+- ArmazenamentoTexto: o formato original (playlist.txt, Titulo;Artista;Album;Genero;Ano)
+  com o diário de alterações.
+- ArmazenamentoSQLite: banco SQLite (playlist.db) com índice em cada campo
+  e tabela FTS5 para busca; cada alteração afeta só uma linha. No modo
+  somente leitura (main.py --somente-leitura) as buscas vão direto ao banco
+  (PlaylistSQLiteSomenteLeitura), sem carregar a playlist.
+
+O backend é escolhido por configuração: variável de ambiente
+PLAYLIST_ARMAZENAMENTO ou chave "armazenamento" em data/config.json
+("texto" ou "sqlite"; padrão "texto").
+
+Importação única do texto para o SQLite:
+    python src/armazenamento.py [data/playlist.txt] [data/playlist.db]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from itertools import islice
+from pathlib import Path
+
+from diario import DiarioAlteracoes, recuperar
+from main import carregar_dados, ler_musicas_em_lotes, salvar_dados
+from snapshot import carregar_tabela
+from track import CAMPOS, Track
+
+
+# Tipos de armazenamento disponíveis
+TEXTO = 'texto'
+SQLITE = 'sqlite'
+
+VARIAVEL_AMBIENTE = 'PLAYLIST_ARMAZENAMENTO'
+ARQUIVO_CONFIGURACAO = 'config.json'
+
+# Nomes dos arquivos dentro da pasta data/
+ARQUIVOS = {TEXTO: 'playlist.txt', SQLITE: 'playlist.db'}
+
+
+def ler_configuracao(pasta_dados):
+    """
+    Lê data/config.json (se existir).
+
+    Args:
+        pasta_dados (str | Path): Pasta data/ do projeto
+
+    Returns:
+        dict: Configuração (vazia se o arquivo não existir ou for inválido)
+    """
+    caminho = Path(pasta_dados) / ARQUIVO_CONFIGURACAO
+    try:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            configuracao = json.load(arquivo)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print(f">> Aviso: {caminho} inválido ({e}). Usando configuração padrão.")
+        return {}
+    return configuracao if isinstance(configuracao, dict) else {}
+
+
+def tipo_configurado(pasta_dados):
+    """Retorna o tipo de armazenamento configurado (variável de ambiente tem prioridade)"""
+    tipo = os.environ.get(VARIAVEL_AMBIENTE) or ler_configuracao(pasta_dados).get('armazenamento', TEXTO)
+    tipo = str(tipo).strip().lower()
+    if tipo not in ARQUIVOS:
+        print(f">> Aviso: armazenamento '{tipo}' desconhecido. Usando '{TEXTO}'.")
+        return TEXTO
+    return tipo
+
+
+def criar_armazenamento(pasta_dados, tipo=None):
+    """
+    Cria o backend de armazenamento escolhido.
+
+    Ao escolher SQLite pela primeira vez, o playlist.txt existente é importado.
+
+    Args:
+        pasta_dados (str | Path): Pasta data/ do projeto
+        tipo (str): 'texto' ou 'sqlite' (padrão: o configurado)
+
+    Returns:
+        Armazenamento: Backend pronto para carregar()
+    """
+    pasta_dados = Path(pasta_dados)
+    tipo = tipo or tipo_configurado(pasta_dados)
+
+    if tipo == SQLITE:
+        caminho = pasta_dados / ARQUIVOS[SQLITE]
+        origem = pasta_dados / ARQUIVOS[TEXTO]
+        if not caminho.exists() and origem.exists():
+            importar_texto_para_sqlite(origem, caminho)
+        return ArmazenamentoSQLite(caminho)
+
+    return ArmazenamentoTexto(pasta_dados / ARQUIVOS[TEXTO])
+
+
+class Armazenamento:
+    """
+    Interface comum dos backends.
+
+    Depois de carregar(), o backend é anexado à Biblioteca como observador
+    e recebe cada alteração (adicionar/atualizar/remover).
+    """
+
+    # Músicas lidas do próprio backend não devem ser gravadas de novo
+    registra_carregamento = False
+
+    def __init__(self, caminho):
+        self.caminho = str(caminho)
+
+    def carregar(self):
+        """Retorna a lista completa de músicas"""
+        raise NotImplementedError
+
+    def ler_em_lotes(self, tamanho_lote=1000):
+        """Gera listas de até tamanho_lote músicas (carregamento incremental)"""
+        raise NotImplementedError
+
+    def salvar(self, musicas):
+        """Substitui todo o conteúdo salvo pelas músicas informadas"""
+        raise NotImplementedError
+
+    def anexar(self, biblioteca):
+        """Passa a receber as alterações da biblioteca"""
+        biblioteca.observadores.append(self)
+
+    def adicionar(self, musica):
+        raise NotImplementedError
+
+    def atualizar(self, musica, antes):
+        raise NotImplementedError
+
+    def remover(self, musica):
+        raise NotImplementedError
+
+    def sincronizar(self):
+        """Garante que as alterações já recebidas estão no disco"""
+
+    def compactar(self, em_segundo_plano=True):
+        """Consolida o armazenamento (quando fizer sentido para o backend)"""
+
+    def aguardar_compactacao(self):
+        """Espera a consolidação iniciada em segundo plano, se houver"""
+
+    def fechar(self):
+        """Libera arquivos e conexões"""
+
+
+def _lotes_da_tabela(tabela, tamanho_lote):
+    """Materializa a TrackTable do snapshot em lotes de Tracks (percorrendo as colunas)"""
+    musicas = iter(tabela)
+    while True:
+        lote = list(islice(musicas, tamanho_lote))
+        if not lote:
+            return
+        yield lote
+
+
+class ArmazenamentoTexto(Armazenamento):
+    """Arquivo Titulo;Artista;Album;Genero;Ano + diário de alterações"""
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self.diario = None
+
+    def carregar(self):
+        return carregar_dados(self.caminho)
+
+    def ler_em_lotes(self, tamanho_lote=1000):
+        # A leitura em streaming não reaplica o diário: incorpora antes
+        recuperar(self.caminho)
+        tabela = carregar_tabela(self.caminho)
+        if tabela is None:
+            return ler_musicas_em_lotes(self.caminho, tamanho_lote)
+        return _lotes_da_tabela(tabela, tamanho_lote)
+
+    def salvar(self, musicas):
+        salvar_dados(musicas, self.caminho)
+
+    def anexar(self, biblioteca):
+        # Quem registra as alterações é o diário
+        self.diario = DiarioAlteracoes.anexar(biblioteca, self.caminho)
+
+    def sincronizar(self):
+        if self.diario is not None:
+            self.diario.sincronizar()
+
+    def compactar(self, em_segundo_plano=True):
+        if self.diario is not None:
+            self.diario.compactar(em_segundo_plano)
+
+    def aguardar_compactacao(self):
+        if self.diario is not None:
+            self.diario.aguardar_compactacao()
+
+    def fechar(self):
+        if self.diario is not None:
+            self.diario.fechar()
+            self.diario = None
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """Banco SQLite com índice por campo e busca FTS5"""
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self._conexao = None
+        self._lock = threading.Lock()
+        self._ids = {}  # id(música) -> rowid
+        self.tem_fts = False
+
+    def _conectar(self):
+        if self._conexao is None:
+            Path(self.caminho).parent.mkdir(parents=True, exist_ok=True)
+            # A GUI grava a partir de threads de trabalho; o acesso é protegido por _lock
+            self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+            self._criar_tabelas()
+        return self._conexao
+
+    def _criar_tabelas(self):
+        conexao = self._conexao
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS musicas (
+                id INTEGER PRIMARY KEY,
+                titulo TEXT NOT NULL,
+                artista TEXT NOT NULL,
+                album TEXT NOT NULL,
+                genero TEXT NOT NULL,
+                ano TEXT NOT NULL
+            )""")
+        for campo in CAMPOS:
+            conexao.execute(f"CREATE INDEX IF NOT EXISTS idx_musicas_{campo} "
+                            f"ON musicas ({campo} COLLATE NOCASE)")
+
+        # FTS5 com tokenizador de trigramas (SQLite 3.34+); sem ele, a busca usa LIKE
+        try:
+            conexao.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS musicas_fts USING fts5(
+                    titulo, artista, album, genero,
+                    content='musicas', content_rowid='id', tokenize='trigram'
+                )""")
+            conexao.executescript("""
+                CREATE TRIGGER IF NOT EXISTS musicas_ai AFTER INSERT ON musicas BEGIN
+                    INSERT INTO musicas_fts(rowid, titulo, artista, album, genero)
+                    VALUES (new.id, new.titulo, new.artista, new.album, new.genero);
+                END;
+                CREATE TRIGGER IF NOT EXISTS musicas_ad AFTER DELETE ON musicas BEGIN
+                    INSERT INTO musicas_fts(musicas_fts, rowid, titulo, artista, album, genero)
+                    VALUES ('delete', old.id, old.titulo, old.artista, old.album, old.genero);
+                END;
+                CREATE TRIGGER IF NOT EXISTS musicas_au AFTER UPDATE ON musicas BEGIN
+                    INSERT INTO musicas_fts(musicas_fts, rowid, titulo, artista, album, genero)
+                    VALUES ('delete', old.id, old.titulo, old.artista, old.album, old.genero);
+                    INSERT INTO musicas_fts(rowid, titulo, artista, album, genero)
+                    VALUES (new.id, new.titulo, new.artista, new.album, new.genero);
+                END;
+            """)
+            self.tem_fts = True
+        except sqlite3.OperationalError as e:
+            print(f">> Aviso: FTS5 indisponível ({e}). Busca usará LIKE.")
+        conexao.commit()
+
+    def _linhas_para_musicas(self, linhas):
+        musicas = []
+        for linha in linhas:
+            musica = Track(*linha[1:])
+            self._ids[id(musica)] = linha[0]
+            musicas.append(musica)
+        return musicas
+
+    def ler_em_lotes(self, tamanho_lote=1000):
+        with self._lock:
+            cursor = self._conectar().execute(
+                "SELECT id, titulo, artista, album, genero, ano FROM musicas ORDER BY id")
+            self._ids.clear()
+        while True:
+            with self._lock:
+                linhas = cursor.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            yield self._linhas_para_musicas(linhas)
+
+    def carregar(self):
+        musicas = []
+        for lote in self.ler_em_lotes():
+            musicas.extend(lote)
+        print(f">> {len(musicas)} música(s) carregada(s) do banco")
+        return musicas
+
+    def salvar(self, musicas):
+        with self._lock:
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute("DELETE FROM musicas")
+                self._ids.clear()
+                for musica in musicas:
+                    self._inserir(conexao, musica)
+        print(">> Playlist salva com sucesso no banco!")
+
+    def _inserir(self, conexao, musica):
+        cursor = conexao.execute(
+            "INSERT INTO musicas (titulo, artista, album, genero, ano) VALUES (?, ?, ?, ?, ?)",
+            tuple(musica[campo] for campo in CAMPOS))
+        self._ids[id(musica)] = cursor.lastrowid
+
+    # ===== Observador da Biblioteca: cada alteração toca uma linha =====
+
+    def adicionar(self, musica):
+        with self._lock:
+            conexao = self._conectar()
+            with conexao:
+                self._inserir(conexao, musica)
+
+    def atualizar(self, musica, antes):
+        with self._lock:
+            rowid = self._ids.get(id(musica))
+            if rowid is None:
+                # Música que não veio do banco nem foi adicionada por ele: a alteração se perderia
+                print(f">> Aviso: {musica!r} não está no banco; alteração não gravada")
+                return
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute(
+                    "UPDATE musicas SET titulo=?, artista=?, album=?, genero=?, ano=? WHERE id=?",
+                    tuple(musica[campo] for campo in CAMPOS) + (rowid,))
+
+    def remover(self, musica):
+        with self._lock:
+            rowid = self._ids.pop(id(musica), None)
+            if rowid is None:
+                print(f">> Aviso: {musica!r} não está no banco; remoção não gravada")
+                return
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute("DELETE FROM musicas WHERE id=?", (rowid,))
+
+    # ===== Consultas diretas no banco =====
+
+    def buscar(self, termo, campos=None):
+        """
+        Busca por substring direto no banco (FTS5 com trigramas ou LIKE).
+
+        Args:
+            termo (str): Substring procurada (sem diferenciar maiúsculas)
+            campos (iterable): Campos pesquisados (padrão: titulo, artista, album, genero)
+
+        Returns:
+            list: Músicas encontradas (Track), na ordem de inserção
+        """
+        campos = tuple(campos or ('titulo', 'artista', 'album', 'genero'))
+        with self._lock:
+            conexao = self._conectar()
+            # O tokenizador de trigramas só atende termos com 3+ caracteres
+            if self.tem_fts and len(termo) >= 3:
+                consulta = '"' + termo.replace('"', '""') + '"'
+                filtro = ' OR '.join(f"{campo} : {consulta}" for campo in campos)
+                linhas = conexao.execute(
+                    "SELECT m.id, m.titulo, m.artista, m.album, m.genero, m.ano "
+                    "FROM musicas_fts JOIN musicas m ON m.id = musicas_fts.rowid "
+                    "WHERE musicas_fts MATCH ? ORDER BY m.id", (filtro,)).fetchall()
+            else:
+                padrao = '%' + termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                filtro = ' OR '.join(f"{campo} LIKE ? ESCAPE '\\'" for campo in campos)
+                linhas = conexao.execute(
+                    f"SELECT id, titulo, artista, album, genero, ano FROM musicas "
+                    f"WHERE {filtro} ORDER BY id", (padrao,) * len(campos)).fetchall()
+        return [Track(*linha[1:]) for linha in linhas]
+
+    def contar(self):
+        """Quantidade de músicas no banco"""
+        with self._lock:
+            return self._conectar().execute("SELECT COUNT(*) FROM musicas").fetchone()[0]
+
+    def pagina(self, inicio, quantidade):
+        """
+        Lê apenas as músicas de uma página (na ordem de inserção).
+
+        Args:
+            inicio (int): Primeira música (0-based)
+            quantidade (int): Número máximo de músicas
+
+        Returns:
+            list: Músicas da página (Track)
+        """
+        with self._lock:
+            linhas = self._conectar().execute(
+                "SELECT id, titulo, artista, album, genero, ano FROM musicas "
+                "ORDER BY id LIMIT ? OFFSET ?", (quantidade, inicio)).fetchall()
+        return [Track(*linha[1:]) for linha in linhas]
+
+    def buscar_exato(self, campo, valor):
+        """Busca por igualdade (sem diferenciar maiúsculas) usando o índice do campo"""
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        with self._lock:
+            linhas = self._conectar().execute(
+                f"SELECT id, titulo, artista, album, genero, ano FROM musicas "
+                f"WHERE {campo} = ? COLLATE NOCASE ORDER BY id", (valor,)).fetchall()
+        return [Track(*linha[1:]) for linha in linhas]
+
+    def fechar(self):
+        with self._lock:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+
+class PlaylistSQLiteSomenteLeitura:
+    """
+    Playlist do banco consultada sem ser carregada (mesma interface de
+    leitura_mmap.PlaylistSomenteLeitura): a listagem lê só a página exibida
+    e as buscas usam o FTS5 e os índices de cada campo.
+    """
+
+    def __init__(self, caminho):
+        if not Path(caminho).exists():
+            raise FileNotFoundError(caminho)
+        self.banco = ArmazenamentoSQLite(caminho)
+        self._total = self.banco.contar()
+
+    def __len__(self):
+        return self._total
+
+    def __bool__(self):
+        return self._total > 0
+
+    def __iter__(self):
+        for lote in self.banco.ler_em_lotes():
+            yield from lote
+
+    def pagina(self, inicio, quantidade):
+        """Músicas de uma página (ver ArmazenamentoSQLite.pagina)"""
+        return self.banco.pagina(inicio, quantidade)
+
+    def buscar(self, termo, campos=None):
+        """Busca por substring no banco (ver ArmazenamentoSQLite.buscar)"""
+        return self.banco.buscar(termo, campos)
+
+    def buscar_exato(self, campo, valor):
+        """Busca por igualdade no banco (ver ArmazenamentoSQLite.buscar_exato)"""
+        return self.banco.buscar_exato(campo, valor)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.banco.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def importar_texto_para_sqlite(origem, destino, tamanho_lote=5000):
+    """
+    Importa (uma única vez) o playlist.txt para um banco SQLite.
+
+    Args:
+        origem (str | Path): Arquivo playlist.txt (o diário pendente é reaplicado)
+        destino (str | Path): Arquivo do banco a criar
+
+    Returns:
+        int: Quantidade de músicas importadas
+    """
+    print(f">> Importando {origem} para {destino}...")
+    banco = ArmazenamentoSQLite(destino)
+    total = 0
+    try:
+        musicas = carregar_dados(str(origem))
+        with banco._lock:
+            conexao = banco._conectar()
+            with conexao:
+                for inicio in range(0, len(musicas), tamanho_lote):
+                    lote = musicas[inicio:inicio + tamanho_lote]
+                    conexao.executemany(
+                        "INSERT INTO musicas (titulo, artista, album, genero, ano) VALUES (?, ?, ?, ?, ?)",
+                        [tuple(musica[campo] for campo in CAMPOS) for musica in lote])
+                    total += len(lote)
+    finally:
+        banco.fechar()
+    print(f">> {total} música(s) importada(s)")
+    return total
+
+
+def main():
+    """Importa o playlist.txt para o SQLite pela linha de comando"""
+    pasta_dados = Path(__file__).resolve().parent.parent / 'data'
+    origem = sys.argv[1] if len(sys.argv) > 1 else pasta_dados / ARQUIVOS[TEXTO]
+    destino = sys.argv[2] if len(sys.argv) > 2 else pasta_dados / ARQUIVOS[SQLITE]
+
+    if Path(destino).exists():
+        print(f">> {destino} já existe. Remova-o antes de importar novamente.")
+        return
+    importar_texto_para_sqlite(origem, destino)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Biblioteca: a playlist em memória com índices secundários.
+
+Funciona como a LISTA usada antes (append, remove, len, for), mas mantém
+índices hash por campo (texto em casefold) para buscas exatas em O(1) e
+faz a remoção marcando uma lápide (None) em vez de deslocar a lista.
+Toda alteração passa por adicionar/atualizar/remover, que avisam os
+observadores (ex.: IndiceBusca) para que os índices nunca fiquem defasados.
+
+As alterações e as buscas por texto seguram a mesma trava (reentrante),
+então a busca da interface pode rodar em outra thread (ver
+busca_incremental) sem ver índices pela metade.
+"""
+import threading
+
+from busca_aproximada import BuscaAproximada
+from consulta import MotorConsulta
+from estatisticas import EstatisticasPlaylist
+from indice_busca import IndiceBusca
+from track import CAMPOS
+
+
+# Compacta quando as lápides passam desta fração das posições
+FRACAO_MAXIMA_LAPIDES = 0.5
+
+# Abaixo deste número de lápides não vale a pena compactar
+MINIMO_LAPIDES_COMPACTAR = 1024
+
+
+def chave_exata(valor):
+    """Chave usada nos índices exatos (sem diferenciar maiúsculas)"""
+    return str(valor).casefold()
+
+
+class Biblioteca:
+    """Playlist com índices hash por campo e remoção por lápide"""
+
+    def __init__(self, musicas=()):
+        self._posicoes = []          # música ou None (lápide), na ordem da playlist
+        self._posicao_por_id = {}    # id(música) -> posição em _posicoes
+        self._lapides = 0
+        self._indices = {campo: {} for campo in CAMPOS}  # campo -> chave -> {posições}
+        self._chaves = {}            # posição -> chaves indexadas (uma por campo)
+
+        # Índice de substring; outros observadores podem ser registrados depois
+        self.indice_busca = IndiceBusca()
+        self.observadores = [self.indice_busca]
+        self._motor_consulta = None  # Criado na primeira consulta (ver consultar)
+        self._estatisticas = None    # Criadas no primeiro uso (ver estatisticas)
+        self._busca_aproximada = None  # Criada na primeira busca aproximada
+        self.trava = threading.RLock()  # Alterações e buscas (ver docstring do módulo)
+
+        self.carregar(musicas)
+
+    # ===== Interface de LISTA =====
+
+    def __len__(self):
+        return len(self._posicoes) - self._lapides
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        for musica in self._posicoes:
+            if musica is not None:
+                yield musica
+
+    def __contains__(self, musica):
+        return id(musica) in self._posicao_por_id
+
+    def append(self, musica):
+        """Adiciona uma música ao final da playlist"""
+        self.adicionar(musica)
+
+    def extend(self, musicas):
+        """Adiciona várias músicas ao final da playlist"""
+        for musica in musicas:
+            self.adicionar(musica)
+
+    def remove(self, musica):
+        """Remove a música (mesmo objeto); ValueError se não estiver na playlist"""
+        self.remover(musica)
+
+    # ===== Índices =====
+
+    def _indexar(self, posicao, musica):
+        chaves = tuple(chave_exata(musica[campo]) for campo in CAMPOS)
+        self._chaves[posicao] = chaves
+        for campo, chave in zip(CAMPOS, chaves):
+            indice = self._indices[campo]
+            posicoes = indice.get(chave)
+            if posicoes is None:
+                indice[chave] = {posicao}
+            else:
+                posicoes.add(posicao)
+
+    def _desindexar(self, posicao):
+        for campo, chave in zip(CAMPOS, self._chaves.pop(posicao)):
+            indice = self._indices[campo]
+            posicoes = indice[chave]
+            posicoes.discard(posicao)
+            if not posicoes:
+                del indice[chave]
+
+    # ===== Alterações =====
+
+    def _inserir(self, musica):
+        posicao = len(self._posicoes)
+        self._posicoes.append(musica)
+        self._posicao_por_id[id(musica)] = posicao
+        self._indexar(posicao, musica)
+
+    def carregar(self, musicas):
+        """
+        Adiciona músicas que já estão salvas (ex.: lidas do arquivo).
+
+        Observadores com registra_carregamento = False (como o diário)
+        não são avisados, pois não se trata de uma alteração nova.
+
+        Args:
+            musicas (iterable): Músicas a adicionar
+        """
+        with self.trava:
+            observadores = [observador for observador in self.observadores
+                            if getattr(observador, 'registra_carregamento', True)]
+            for musica in musicas:
+                self._inserir(musica)
+                for observador in observadores:
+                    observador.adicionar(musica)
+
+    def adicionar(self, musica):
+        """
+        Adiciona uma música ao final da playlist e aos índices.
+
+        Args:
+            musica (Track): Música a adicionar
+        """
+        with self.trava:
+            self._inserir(musica)
+            for observador in self.observadores:
+                observador.adicionar(musica)
+
+    def atualizar(self, musica, **novos_valores):
+        """
+        Altera campos de uma música mantendo todos os índices consistentes.
+
+        Os valores são conferidos antes de qualquer alteração: em caso de
+        erro, a música e os índices ficam como estavam.
+
+        Args:
+            musica (Track): Música da playlist
+            **novos_valores: Campos a alterar (ex.: titulo='Novo')
+
+        Raises:
+            ValueError: Se a música não estiver na playlist
+            KeyError: Se algum campo não existir
+            TypeError: Se algum valor não for texto
+        """
+        with self.trava:
+            posicao = self._posicao_por_id.get(id(musica))
+            if posicao is None:
+                raise ValueError("Música não está na playlist")
+            for campo, valor in novos_valores.items():
+                if campo not in CAMPOS:
+                    raise KeyError(campo)
+                if not isinstance(valor, str):
+                    raise TypeError(f"Valor de {campo} deve ser texto, não {type(valor).__name__}")
+
+            antes = tuple(musica[campo] for campo in CAMPOS)
+            for campo, valor in novos_valores.items():
+                musica[campo] = valor
+
+            self._desindexar(posicao)
+            self._indexar(posicao, musica)
+            for observador in self.observadores:
+                observador.atualizar(musica, antes)
+
+    def remover(self, musica):
+        """
+        Remove uma música marcando uma lápide na sua posição (O(1)).
+
+        Args:
+            musica (Track): Música da playlist (o mesmo objeto)
+        """
+        with self.trava:
+            posicao = self._posicao_por_id.pop(id(musica), None)
+            if posicao is None:
+                raise ValueError("Música não está na playlist")
+
+            self._desindexar(posicao)
+            self._posicoes[posicao] = None
+            self._lapides += 1
+            for observador in self.observadores:
+                observador.remover(musica)
+
+            if (self._lapides >= MINIMO_LAPIDES_COMPACTAR and
+                    self._lapides > len(self._posicoes) * FRACAO_MAXIMA_LAPIDES):
+                self.compactar()
+
+    def compactar(self):
+        """Descarta as lápides e renumera as posições (O(n), amortizado)"""
+        with self.trava:
+            vivas = [musica for musica in self._posicoes if musica is not None]
+            self._posicoes = []
+            self._posicao_por_id = {}
+            self._lapides = 0
+            self._indices = {campo: {} for campo in CAMPOS}
+            self._chaves = {}
+            for posicao, musica in enumerate(vivas):
+                self._posicoes.append(musica)
+                self._posicao_por_id[id(musica)] = posicao
+                self._indexar(posicao, musica)
+
+    # ===== Consultas =====
+
+    def buscar_exato(self, campo, valor):
+        """
+        Retorna as músicas cujo campo é igual ao valor (sem diferenciar maiúsculas).
+
+        Args:
+            campo (str): Um dos CAMPOS
+            valor (str): Valor procurado
+
+        Returns:
+            list: Músicas encontradas, na ordem da playlist
+        """
+        posicoes = self._indices[campo].get(chave_exata(valor))
+        if not posicoes:
+            return []
+        return [self._posicoes[posicao] for posicao in sorted(posicoes)]
+
+    def primeiro(self, campo, valor):
+        """Retorna a primeira música com campo igual ao valor, ou None"""
+        posicoes = self._indices[campo].get(chave_exata(valor))
+        if not posicoes:
+            return None
+        return self._posicoes[min(posicoes)]
+
+    def contar(self, campo, valor):
+        """Retorna quantas músicas têm campo igual ao valor (O(1))"""
+        return len(self._indices[campo].get(chave_exata(valor), ()))
+
+    def buscar(self, termo, campos=None):
+        """Busca por substring usando o índice de n-gramas (ver IndiceBusca.buscar)"""
+        with self.trava:
+            return self.indice_busca.buscar(termo, campos)
+
+    def refinar(self, musicas, termo, campos=None):
+        """Filtra o resultado de uma busca anterior (ver IndiceBusca.refinar)"""
+        with self.trava:
+            return self.indice_busca.refinar(musicas, termo, campos)
+
+    def busca_aproximada(self):
+        """
+        Índice da busca tolerante a erros de digitação (ver busca_aproximada.py).
+
+        Na primeira chamada a playlist é percorrida uma vez; depois o índice
+        é atualizado a cada alteração.
+
+        Returns:
+            BuscaAproximada: Índice desta playlist
+        """
+        with self.trava:
+            if self._busca_aproximada is None:
+                self._busca_aproximada = BuscaAproximada(self)
+                self.observadores.append(self._busca_aproximada)
+            return self._busca_aproximada
+
+    def buscar_aproximado(self, termo, campos=None, prefixo=False, distancia_maxima=None):
+        """Busca tolerante a erros de digitação (ver BuscaAproximada.buscar)"""
+        with self.trava:
+            return self.busca_aproximada().buscar(termo, campos, prefixo, distancia_maxima)
+
+    def consultar(self, consulta):
+        """
+        Retorna as músicas que satisfazem uma consulta composta (ver consulta.py).
+
+        Args:
+            consulta (str ou Consulta): Ex.: 'genero = rock E ano ENTRE 1980 E 1990'
+
+        Returns:
+            list: Músicas encontradas, na ordem da playlist
+
+        Raises:
+            ErroConsulta: Se a expressão for inválida
+        """
+        with self.trava:
+            if self._motor_consulta is None:
+                self._motor_consulta = MotorConsulta(self)
+                self.observadores.append(self._motor_consulta)
+            return self._motor_consulta.consultar(consulta)
+
+    def estatisticas(self):
+        """
+        Contadores por artista, álbum, gênero, ano e década (ver estatisticas.py).
+
+        Na primeira chamada a playlist é percorrida uma vez; depois os
+        contadores são atualizados a cada alteração.
+
+        Returns:
+            EstatisticasPlaylist: Contadores desta playlist
+        """
+        with self.trava:
+            if self._estatisticas is None:
+                self._estatisticas = EstatisticasPlaylist(self)
+                self.observadores.append(self._estatisticas)
+            return self._estatisticas
+
+    def indice_exato(self, campo):
+        """Índice exato do campo: chave (casefold) -> posições (somente leitura)"""
+        return self._indices[campo]
+
+    def posicoes_vivas(self):
+        """Conjunto das posições ocupadas por músicas (sem as lápides)"""
+        if not self._lapides:
+            return set(range(len(self._posicoes)))
+        return {posicao for posicao, musica in enumerate(self._posicoes) if musica is not None}
+
+    def musicas_em(self, posicoes):
+        """Músicas das posições informadas, na ordem da playlist"""
+        musicas = self._posicoes
+        return [musicas[posicao] for posicao in sorted(posicoes)]
@@ -0,0 +1,343 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Busca aproximada (tolerante a erros de digitação) por título e artista.
+
+O índice guarda o vocabulário das palavras dobradas (sem maiúsculas nem
+acentos) de cada campo e, para cada palavra, as músicas em que ela aparece.
+Cada palavra digitada é comparada com o vocabulário, não com as músicas:
+
+1. Candidatas: palavras do vocabulário que compartilham trigramas com a
+   palavra digitada. Uma edição (inserção, remoção ou troca de letra)
+   altera no máximo 3 trigramas, então uma palavra a até k edições
+   compartilha pelo menos len(trigramas) - 3k deles; as demais nem são
+   comparadas.
+2. Confirmação: a distância de edição (Levenshtein) de cada candidata é
+   calculada pelo algoritmo bit-paralelo de Myers/Hyyrö, que processa uma
+   letra da candidata por passo usando inteiros como vetores de bits.
+
+A música precisa conter uma palavra próxima de cada palavra digitada; o
+resultado vem ordenado pela soma das distâncias (e, no empate, na ordem da
+playlist). No modo prefixo a última palavra é comparada com o começo das
+palavras do vocabulário, para que a busca funcione enquanto se digita.
+"""
+import re
+from collections import Counter
+from operator import itemgetter
+
+from normalizacao import dobrar_texto
+from track import CAMPOS
+
+# Campos indexados
+CAMPOS_APROXIMADOS = ('titulo', 'artista')
+
+# Tamanho mínimo da palavra digitada para tolerar 1 e 2 erros
+# (em palavras curtas um erro já leva a muitas palavras diferentes)
+MINIMO_UM_ERRO = 4
+MINIMO_DOIS_ERROS = 8
+
+_PALAVRA = re.compile(r'\w+')
+
+# Marca de início/fim de palavra nos trigramas (não aparece em \w)
+_BORDA = ' '
+
+
+def orcamento_erros(tamanho):
+    """
+    Distância de edição tolerada para uma palavra digitada.
+
+    Args:
+        tamanho (int): Quantidade de letras da palavra
+
+    Returns:
+        int: 0, 1 ou 2
+    """
+    if tamanho >= MINIMO_DOIS_ERROS:
+        return 2
+    if tamanho >= MINIMO_UM_ERRO:
+        return 1
+    return 0
+
+
+def _trigramas(palavra, prefixo=False):
+    """Trigramas da palavra com as bordas (sem a borda final no modo prefixo)"""
+    texto = _BORDA * 2 + palavra + ('' if prefixo else _BORDA * 2)
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _mascaras(padrao):
+    """Vetor de bits de cada letra do padrão (bit i = letra na posição i)"""
+    mascaras = {}
+    for posicao, letra in enumerate(padrao):
+        mascaras[letra] = mascaras.get(letra, 0) | (1 << posicao)
+    return mascaras
+
+
+def _distancia_bits(mascaras, tamanho, texto, prefixo):
+    """
+    Distância de edição entre o padrão (mascaras/tamanho) e o texto.
+
+    Algoritmo bit-paralelo de Myers na versão global de Hyyrö: pv/mv são
+    as diferenças verticais (+1/-1) da coluna atual da matriz de
+    programação dinâmica e `distancia` é a última linha dessa coluna.
+    No modo prefixo retorna a menor distância entre o padrão e um prefixo
+    do texto.
+    """
+    todos = (1 << tamanho) - 1
+    ultimo = 1 << (tamanho - 1)
+    pv, mv = todos, 0
+    distancia = menor = tamanho
+    for letra in texto:
+        eq = mascaras.get(letra, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & todos)
+        mh = pv & xh
+        if ph & ultimo:
+            distancia += 1
+        elif mh & ultimo:
+            distancia -= 1
+        # Primeira linha da matriz: cada letra do texto custa 1 (| 1)
+        ph = ((ph << 1) | 1) & todos
+        mh = (mh << 1) & todos
+        pv = mh | (~(xv | ph) & todos)
+        mv = ph & xv
+        if distancia < menor:
+            menor = distancia
+    return menor if prefixo else distancia
+
+
+def distancia_edicao(padrao, texto, prefixo=False):
+    """
+    Distância de Levenshtein entre dois textos.
+
+    Args:
+        padrao (str): Texto digitado
+        texto (str): Texto comparado
+        prefixo (bool): Compara o padrão com o melhor prefixo do texto
+
+    Returns:
+        int: Menor número de inserções, remoções e trocas de letra
+    """
+    if not padrao:
+        return 0 if prefixo else len(texto)
+    return _distancia_bits(_mascaras(padrao), len(padrao), texto, prefixo)
+
+
+class BuscaAproximada:
+    """Vocabulário por campo com trigramas, mantido incrementalmente (observador)"""
+
+    def __init__(self, musicas=(), campos=CAMPOS_APROXIMADOS):
+        self.campos = tuple(campos)
+        self._posicoes_campos = tuple(CAMPOS.index(campo) for campo in self.campos)
+        self._musicas = {}       # doc -> música (ordem de inserção = ordem da playlist)
+        self._docs = {}          # id(música) -> doc
+        self._palavras = {}      # doc -> conjunto de palavras de cada campo
+        self._postings = {campo: {} for campo in self.campos}  # campo -> palavra -> {docs}
+        self._vocabulario = {}   # palavra -> em quantos campos ela aparece
+        self._trigramas = {}     # trigrama -> palavras do vocabulário
+        self._proximo_doc = 0
+
+        for musica in musicas:
+            self.adicionar(musica)
+
+    def __len__(self):
+        return len(self._musicas)
+
+    def __contains__(self, musica):
+        return id(musica) in self._docs
+
+    def _novas_palavras(self, palavras):
+        for palavra in palavras:
+            for trigrama in _trigramas(palavra):
+                vocabulario = self._trigramas.get(trigrama)
+                if vocabulario is None:
+                    self._trigramas[trigrama] = {palavra}
+                else:
+                    vocabulario.add(palavra)
+
+    def _palavras_esquecidas(self, palavras):
+        for palavra in palavras:
+            for trigrama in _trigramas(palavra):
+                vocabulario = self._trigramas[trigrama]
+                vocabulario.discard(palavra)
+                if not vocabulario:
+                    del self._trigramas[trigrama]
+
+    def _indexar(self, doc, musica):
+        dobrados = getattr(musica, 'dobrados', None)
+        if dobrados is not None:
+            valores = dobrados()
+            textos = [valores[posicao] for posicao in self._posicoes_campos]
+        else:
+            textos = [dobrar_texto(str(musica[campo])) for campo in self.campos]
+
+        por_campo = tuple([frozenset(_PALAVRA.findall(texto)) for texto in textos])
+        self._palavras[doc] = por_campo
+
+        vocabulario = self._vocabulario
+        novas = []
+        for campo, palavras in zip(self.campos, por_campo):
+            postings = self._postings[campo]
+            for palavra in palavras:
+                docs = postings.get(palavra)
+                if docs is not None:
+                    docs.add(doc)
+                    continue
+                postings[palavra] = {doc}
+                campos = vocabulario.get(palavra)
+                if campos is None:
+                    vocabulario[palavra] = 1
+                    novas.append(palavra)
+                else:
+                    vocabulario[palavra] = campos + 1
+        if novas:
+            self._novas_palavras(novas)
+
+    def _desindexar(self, doc):
+        vocabulario = self._vocabulario
+        esquecidas = []
+        for campo, palavras in zip(self.campos, self._palavras.pop(doc)):
+            postings = self._postings[campo]
+            for palavra in palavras:
+                docs = postings[palavra]
+                docs.discard(doc)
+                if docs:
+                    continue
+                del postings[palavra]
+                if vocabulario[palavra] == 1:
+                    del vocabulario[palavra]
+                    esquecidas.append(palavra)
+                else:
+                    vocabulario[palavra] -= 1
+        if esquecidas:
+            self._palavras_esquecidas(esquecidas)
+
+    # ===== Observador da Biblioteca =====
+
+    def adicionar(self, musica):
+        """Indexa uma música nova (deve ser chamado após o append na playlist)"""
+        if id(musica) in self._docs:
+            self.atualizar(musica)
+            return
+        doc = self._proximo_doc
+        self._proximo_doc += 1
+        self._docs[id(musica)] = doc
+        self._musicas[doc] = musica
+        self._indexar(doc, musica)
+
+    def atualizar(self, musica, antes=None):
+        """Reindexa uma música cujos campos foram editados (antes não é usado)"""
+        doc = self._docs.get(id(musica))
+        if doc is None:
+            self.adicionar(musica)
+            return
+        self._desindexar(doc)
+        self._indexar(doc, musica)
+
+    def remover(self, musica):
+        """Remove uma música do índice (ignora se não estiver indexada)"""
+        doc = self._docs.pop(id(musica), None)
+        if doc is None:
+            return
+        self._desindexar(doc)
+        del self._musicas[doc]
+
+    # ===== Consultas =====
+
+    def semelhantes(self, palavra, distancia_maxima, prefixo=False):
+        """
+        Palavras do vocabulário a até `distancia_maxima` edições da palavra.
+
+        Args:
+            palavra (str): Palavra já dobrada
+            distancia_maxima (int): Edições toleradas
+            prefixo (bool): Compara com o começo das palavras do vocabulário
+
+        Returns:
+            dict: palavra do vocabulário -> distância
+        """
+        tamanho = len(palavra)
+        if distancia_maxima <= 0 and not prefixo:
+            return {palavra: 0} if palavra in self._vocabulario else {}
+
+        # Filtro de trigramas: candidatas com trigramas suficientes em comum
+        trigramas = _trigramas(palavra, prefixo)
+        minimo = len(trigramas) - 3 * distancia_maxima
+        if minimo > 0:
+            contagem = Counter()
+            for trigrama in trigramas:
+                vocabulario = self._trigramas.get(trigrama)
+                if vocabulario:
+                    contagem.update(vocabulario)
+            candidatas = [candidata for candidata, comuns in contagem.items() if comuns >= minimo]
+        else:
+            candidatas = self._vocabulario.keys()
+
+        if distancia_maxima <= 0:
+            return {candidata: 0 for candidata in candidatas if candidata.startswith(palavra)}
+
+        # Filtro de tamanho: cada edição muda o tamanho em no máximo 1
+        mascaras = _mascaras(palavra)
+        encontradas = {}
+        for candidata in candidatas:
+            diferenca = tamanho - len(candidata)
+            if diferenca > distancia_maxima or (not prefixo and -diferenca > distancia_maxima):
+                continue
+            distancia = _distancia_bits(mascaras, tamanho, candidata, prefixo)
+            if distancia <= distancia_maxima:
+                encontradas[candidata] = distancia
+        return encontradas
+
+    def buscar(self, termo, campos=None, prefixo=False, distancia_maxima=None):
+        """
+        Busca músicas com palavras próximas de todas as palavras do termo.
+
+        Args:
+            termo (str): Texto digitado (com possíveis erros)
+            campos (iterable): Campos pesquisados (padrão: todos os indexados)
+            prefixo (bool): A última palavra pode estar incompleta (busca ao digitar)
+            distancia_maxima (int): Edições toleradas por palavra
+                                    (padrão: conforme o tamanho, ver orcamento_erros)
+
+        Returns:
+            list: Músicas encontradas, das mais próximas para as menos próximas
+                  (no empate, na ordem da playlist)
+        """
+        palavras = _PALAVRA.findall(dobrar_texto(termo))
+        if not palavras:
+            return []
+        campos = self.campos if campos is None else tuple(campos)
+
+        total = None  # doc -> soma das distâncias das palavras já processadas
+        for numero, palavra in enumerate(palavras, 1):
+            limite = orcamento_erros(len(palavra)) if distancia_maxima is None else distancia_maxima
+            semelhantes = self.semelhantes(palavra, limite, prefixo and numero == len(palavras))
+
+            # Distância de cada música: a da palavra mais próxima que ela contém
+            # (as mais próximas são gravadas por último e prevalecem)
+            distancias = {}
+            for semelhante, distancia in sorted(semelhantes.items(), key=itemgetter(1), reverse=True):
+                for campo in campos:
+                    docs = self._postings[campo].get(semelhante)
+                    if docs:
+                        distancias.update(dict.fromkeys(docs, distancia))
+
+            if total is None:
+                total = distancias
+            else:
+                # Mantém só as músicas que têm todas as palavras (percorre o menor)
+                menor, maior = sorted((total, distancias), key=len)
+                total = {doc: distancia + maior[doc]
+                         for doc, distancia in menor.items() if doc in maior}
+            if not total:
+                return []
+
+        # Ordem da playlist e depois distância (a ordenação é estável)
+        ordem = sorted(total)
+        if len(set(total.values())) > 1:
+            ordem.sort(key=total.__getitem__)
+        return [self._musicas[doc] for doc in ordem]
@@ -0,0 +1,126 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Busca incremental da interface: as buscas rodam em uma thread de trabalho.
+
+Cada pedido recebe um número de geração. Um pedido mais novo substitui o
+que ainda não começou, e o resultado de uma geração antiga é descartado
+em vez de ser entregue. Quando o termo novo contém o termo da última
+busca concluída (o usuário continuou digitando), o resultado anterior é
+refinado (Biblioteca.refinar) em vez de consultar a playlist inteira.
+Na busca aproximada (tolerante a erros) não há refinamento: um termo mais
+longo pode encontrar músicas que o termo anterior não encontrava.
+
+Durante a busca a thread segura a trava da Biblioteca (biblioteca.trava),
+que as alterações também seguram: a playlist, os índices e os campos
+dobrados das músicas (Track.dobrados) não mudam no meio de uma busca.
+
+A thread da interface recebe os resultados por resultado(), sem bloquear
+(ex.: consultando em um root.after).
+"""
+import queue
+import threading
+import traceback
+
+from normalizacao import dobrar_texto
+
+
+class BuscaIncremental:
+    """Executa buscas em uma thread, descartando as que ficaram desatualizadas"""
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self._geracao = 0
+        self._pedido = None      # (geração, biblioteca, termo, aproximada) ainda não iniciado
+        self._anterior = None    # (biblioteca, termo, resultado) da última busca entregue
+        self._resultados = queue.Queue()
+        self._ocupada = False    # A thread está executando uma busca
+        self._thread = None
+
+    def buscar(self, biblioteca, termo, aproximada=False):
+        """
+        Pede uma busca (substitui o pedido anterior, se ele ainda não começou).
+
+        Args:
+            biblioteca (Biblioteca): Playlist pesquisada
+            termo (str): Texto digitado
+            aproximada (bool): Tolera erros de digitação (Biblioteca.buscar_aproximado)
+
+        Returns:
+            int: Geração do pedido
+        """
+        with self._condicao:
+            self._geracao += 1
+            self._pedido = (self._geracao, biblioteca, dobrar_texto(termo), aproximada)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._trabalhar, daemon=True,
+                                                name='busca-incremental')
+                self._thread.start()
+            self._condicao.notify()
+            return self._geracao
+
+    def invalidar(self):
+        """
+        A playlist mudou: descarta pedidos e resultados em andamento e não
+        usa mais o último resultado para refinar.
+        """
+        with self._condicao:
+            self._geracao += 1
+            self._pedido = None
+            self._anterior = None
+
+    def pendente(self):
+        """True se ainda há uma busca a entregar"""
+        with self._condicao:
+            return self._pedido is not None or self._ocupada or not self._resultados.empty()
+
+    def resultado(self):
+        """
+        Retorna o resultado mais recente já pronto, sem bloquear.
+
+        Returns:
+            tuple: (termo, músicas) ou None se não houver resultado atual
+        """
+        while True:
+            try:
+                geracao, termo, musicas = self._resultados.get_nowait()
+            except queue.Empty:
+                return None
+            if geracao == self._geracao:
+                return termo, musicas
+
+    def _trabalhar(self):
+        while True:
+            with self._condicao:
+                while self._pedido is None:
+                    self._condicao.wait()
+                geracao, biblioteca, termo, aproximada = self._pedido
+                self._pedido = None
+                anterior = self._anterior
+                self._ocupada = True
+
+            musicas = None
+            try:
+                with biblioteca.trava:
+                    if aproximada:
+                        # A última palavra pode estar incompleta: compara com prefixos
+                        musicas = biblioteca.buscar_aproximado(termo, prefixo=True)
+                    elif (anterior is not None and anterior[0] is biblioteca
+                            and anterior[1] and anterior[1] in termo):
+                        musicas = biblioteca.refinar(anterior[2], termo)
+                    else:
+                        musicas = biblioteca.buscar(termo)
+            except Exception:
+                # Um erro não pode parar a thread: esta busca não é entregue
+                traceback.print_exc()
+            finally:
+                with self._condicao:
+                    self._ocupada = False
+                    # Desatualizada: um pedido mais novo já foi feito
+                    if musicas is not None and geracao == self._geracao:
+                        # O resultado aproximado não serve para refinar uma busca por substring
+                        self._anterior = None if aproximada else (biblioteca, termo, musicas)
+                        self._resultados.put((geracao, termo, musicas))
@@ -0,0 +1,167 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Cache persistente (SQLite) das respostas da API de músicas.
+
+Cada entrada guarda um valor JSON sob uma chave de texto, com a hora em que
+foi gravada (para o TTL) e a do último acesso (para a remoção LRU quando o
+número de entradas passa do limite). Resultados vazios também são guardados
+("cache negativo"), com um TTL menor, para não repetir buscas que não
+encontram nada. Os contadores de acertos e falhas valem para o processo.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# Validade das entradas (segundos)
+TTL_PADRAO = 30 * 24 * 3600
+TTL_NEGATIVO = 24 * 3600
+
+# Número máximo de entradas antes da remoção LRU
+MAXIMO_ENTRADAS = 20000
+
+# Cache usado por padrão (data/cache_api.db)
+CAMINHO_PADRAO = Path(__file__).resolve().parent.parent / 'data' / 'cache_api.db'
+
+_cache_padrao = None
+_lock_padrao = threading.Lock()
+
+
+def obter_cache():
+    """Retorna o cache padrão do processo, criando na primeira chamada"""
+    global _cache_padrao
+    with _lock_padrao:
+        if _cache_padrao is None:
+            _cache_padrao = CacheAPI(CAMINHO_PADRAO)
+        return _cache_padrao
+
+
+class CacheAPI:
+    """Cache chave -> JSON com TTL, cache negativo e remoção LRU"""
+
+    def __init__(self, caminho, ttl=TTL_PADRAO, ttl_negativo=TTL_NEGATIVO,
+                 maximo_entradas=MAXIMO_ENTRADAS):
+        self.caminho = str(caminho)
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self.maximo_entradas = maximo_entradas
+
+        self.acertos = 0
+        self.falhas = 0
+        self.expiradas = 0
+        self.removidas_lru = 0
+
+        self._lock = threading.Lock()
+        Path(self.caminho).parent.mkdir(parents=True, exist_ok=True)
+        # Buscas rodam em threads de trabalho; o acesso é protegido por _lock
+        self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                chave TEXT PRIMARY KEY,
+                valor TEXT NOT NULL,
+                negativo INTEGER NOT NULL,
+                gravado REAL NOT NULL,
+                acessado REAL NOT NULL
+            )""")
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acessado "
+                              "ON respostas (acessado)")
+        self._conexao.commit()
+        self._entradas = self._conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+    def obter(self, chave):
+        """
+        Procura uma entrada válida no cache.
+
+        Args:
+            chave (str): Chave da entrada
+
+        Returns:
+            tuple: (encontrado, valor); valor é None em um acerto negativo
+        """
+        agora = time.time()
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT valor, negativo, gravado FROM respostas WHERE chave = ?",
+                (chave,)).fetchone()
+            if linha is None:
+                self.falhas += 1
+                return False, None
+
+            valor, negativo, gravado = linha
+            if agora - gravado > (self.ttl_negativo if negativo else self.ttl):
+                self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+                self._conexao.commit()
+                self._entradas -= 1
+                self.expiradas += 1
+                self.falhas += 1
+                return False, None
+
+            self._conexao.execute("UPDATE respostas SET acessado = ? WHERE chave = ?",
+                                  (agora, chave))
+            self._conexao.commit()
+            self.acertos += 1
+            return True, (None if negativo else json.loads(valor))
+
+    def guardar(self, chave, valor):
+        """
+        Grava uma entrada (valor None ou vazio = resultado negativo).
+
+        Args:
+            chave (str): Chave da entrada
+            valor: Valor serializável em JSON
+        """
+        agora = time.time()
+        negativo = not valor
+        with self._lock:
+            existia = self._conexao.execute(
+                "SELECT 1 FROM respostas WHERE chave = ?", (chave,)).fetchone() is not None
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO respostas (chave, valor, negativo, gravado, acessado) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chave, json.dumps(valor, ensure_ascii=False), int(negativo), agora, agora))
+            if not existia:
+                self._entradas += 1
+            self._remover_excedentes()
+            self._conexao.commit()
+
+    def _remover_excedentes(self):
+        excesso = self._entradas - self.maximo_entradas
+        if excesso <= 0:
+            return
+        self._conexao.execute(
+            "DELETE FROM respostas WHERE chave IN "
+            "(SELECT chave FROM respostas ORDER BY acessado LIMIT ?)", (excesso,))
+        self._entradas -= excesso
+        self.removidas_lru += excesso
+
+    def limpar(self):
+        """Apaga todas as entradas"""
+        with self._lock:
+            self._conexao.execute("DELETE FROM respostas")
+            self._conexao.commit()
+            self._entradas = 0
+
+    def estatisticas(self):
+        """Retorna os contadores do cache (acertos, falhas, entradas...)"""
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'expiradas': self.expiradas,
+            'removidas_lru': self.removidas_lru,
+            'entradas': self._entradas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conexao.close()
@@ -0,0 +1,139 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Cache LRU das imagens exibidas na interface (PhotoImage das capas).
+
+O cache tem dois limites, número de entradas e bytes estimados (largura x
+altura x 4, o que o Tk guarda por pixel); ao passar de qualquer um deles as
+imagens usadas há mais tempo são descartadas. As chaves são tuplas cujo
+primeiro elemento identifica a capa, o que permite invalidar todas as
+versões (tamanhos) de uma capa sem limpar o resto do cache.
+"""
+from collections import OrderedDict
+
+
+# Limites padrão: ~1000 miniaturas de 80x80 cabem com folga em 32 MB
+MAXIMO_ENTRADAS = 1000
+MAXIMO_BYTES = 32 * 1024 * 1024
+
+_BYTES_POR_PIXEL = 4
+
+
+def tamanho_imagem(imagem):
+    """Bytes estimados de uma imagem com width() e height() (PhotoImage)"""
+    return imagem.width() * imagem.height() * _BYTES_POR_PIXEL
+
+
+class CacheImagens:
+    """Cache LRU limitado por entradas e por bytes, com invalidação por capa"""
+
+    def __init__(self, maximo_entradas=MAXIMO_ENTRADAS, maximo_bytes=MAXIMO_BYTES):
+        """
+        Args:
+            maximo_entradas (int): Número máximo de imagens guardadas
+            maximo_bytes (int): Memória máxima estimada das imagens
+        """
+        self.maximo_entradas = maximo_entradas
+        self.maximo_bytes = maximo_bytes
+
+        self.acertos = 0
+        self.falhas = 0
+        self.removidas_lru = 0
+        self.invalidadas = 0
+
+        self._imagens = OrderedDict()  # chave -> (imagem, bytes), da mais antiga à mais recente
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._imagens)
+
+    def __contains__(self, chave):
+        """Consulta sem alterar a ordem LRU nem os contadores"""
+        return chave in self._imagens
+
+    @property
+    def bytes(self):
+        """Memória estimada das imagens guardadas"""
+        return self._bytes
+
+    def obter(self, chave):
+        """
+        Retorna a imagem guardada e a marca como usada recentemente.
+
+        Args:
+            chave (tuple): (capa, ...) da imagem
+
+        Returns:
+            Imagem guardada ou None
+        """
+        item = self._imagens.get(chave)
+        if item is None:
+            self.falhas += 1
+            return None
+        self._imagens.move_to_end(chave)
+        self.acertos += 1
+        return item[0]
+
+    def guardar(self, chave, imagem, tamanho=None):
+        """
+        Guarda uma imagem, descartando as menos usadas se passar dos limites.
+
+        Args:
+            chave (tuple): (capa, ...) da imagem
+            imagem: Imagem (PhotoImage ou objeto com width() e height())
+            tamanho (int): Bytes da imagem (padrão: estimado pelas dimensões)
+
+        Returns:
+            A própria imagem
+        """
+        tamanho = tamanho_imagem(imagem) if tamanho is None else tamanho
+        anterior = self._imagens.pop(chave, None)
+        if anterior is not None:
+            self._bytes -= anterior[1]
+        self._imagens[chave] = (imagem, tamanho)
+        self._bytes += tamanho
+
+        # A imagem recém-guardada fica, mesmo que sozinha passe do limite de bytes
+        while len(self._imagens) > 1 and (len(self._imagens) > self.maximo_entradas
+                                          or self._bytes > self.maximo_bytes):
+            _, (_, liberados) = self._imagens.popitem(last=False)
+            self._bytes -= liberados
+            self.removidas_lru += 1
+        return imagem
+
+    def invalidar(self, capa):
+        """
+        Remove todas as imagens de uma capa (qualquer tamanho).
+
+        Args:
+            capa: Primeiro elemento das chaves a remover
+
+        Returns:
+            int: Quantidade de imagens removidas
+        """
+        chaves = [chave for chave in self._imagens if chave[0] == capa]
+        for chave in chaves:
+            self._bytes -= self._imagens.pop(chave)[1]
+        self.invalidadas += len(chaves)
+        return len(chaves)
+
+    def limpar(self):
+        """Remove todas as imagens (os contadores são mantidos)"""
+        self._imagens.clear()
+        self._bytes = 0
+
+    def estatisticas(self):
+        """Retorna os contadores do cache (acertos, falhas, entradas, bytes...)"""
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'removidas_lru': self.removidas_lru,
+            'invalidadas': self.invalidadas,
+            'entradas': len(self._imagens),
+            'bytes': self._bytes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
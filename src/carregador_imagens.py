@@ -0,0 +1,129 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Carregamento de imagens em segundo plano, por ordem de proximidade da tela.
+
+Cada pedido leva a posição do item na lista. As threads de trabalho sempre
+atendem o pedido mais próximo do foco atual (o primeiro item visível,
+atualizado a cada rolagem), então as capas visíveis são decodificadas
+primeiro e as que saíram da tela (principalmente as acima dela) ficam
+para depois. Pedidos muito longe do foco são descartados: se o item
+voltar à tela, ele pede de novo.
+
+Os resultados ficam em uma lista que a thread da interface esvazia com
+prontos() (ex.: em um root.after), pois só ela pode criar os PhotoImage.
+"""
+import threading
+
+
+# Threads que decodificam imagens
+TRABALHADORES = 2
+
+# Pedidos a mais que esta distância (em itens) do foco são descartados
+DISTANCIA_MAXIMA = 100
+
+
+class CarregadorImagens:
+    """Executa carregar(chave) em threads, priorizando os pedidos perto do foco"""
+
+    def __init__(self, carregar, trabalhadores=TRABALHADORES, distancia_maxima=DISTANCIA_MAXIMA):
+        """
+        Args:
+            carregar (callable): carregar(chave) -> resultado; roda nas threads
+            trabalhadores (int): Threads de trabalho
+            distancia_maxima (int): Distância do foco a partir da qual o pedido é descartado
+        """
+        self._carregar = carregar
+        self.trabalhadores = trabalhadores
+        self.distancia_maxima = distancia_maxima
+        self.foco = 0
+
+        self._condicao = threading.Condition()
+        self._pendentes = {}       # chave -> posição (None = urgente)
+        self._em_andamento = set()
+        self._prontos = []         # (chave, resultado, erro)
+        self._threads = []
+
+    def focar(self, posicao):
+        """Informa a posição do primeiro item visível (chamado a cada rolagem)"""
+        self.foco = posicao
+
+    def pedir(self, chave, posicao=None):
+        """
+        Pede o carregamento de uma chave (ignorado se já estiver em andamento).
+
+        Args:
+            chave: Identifica a imagem (passada para carregar)
+            posicao (int): Posição do item na lista; None passa na frente de todos
+        """
+        with self._condicao:
+            if chave in self._em_andamento:
+                return
+            if posicao is None or self._pendentes.get(chave, posicao) is not None:
+                self._pendentes[chave] = posicao
+            if len(self._threads) < self.trabalhadores:
+                thread = threading.Thread(target=self._trabalhar, daemon=True,
+                                          name='carregador-imagens')
+                self._threads.append(thread)
+                thread.start()
+            self._condicao.notify()
+
+    def pendente(self):
+        """True se ainda há pedidos a atender ou resultados a entregar"""
+        with self._condicao:
+            return bool(self._pendentes or self._em_andamento or self._prontos)
+
+    def prontos(self):
+        """
+        Retira os resultados já carregados (sem bloquear).
+
+        Returns:
+            list: Tuplas (chave, resultado, erro); erro é None em caso de sucesso
+        """
+        with self._condicao:
+            prontos, self._prontos = self._prontos, []
+        return prontos
+
+    def _proximo(self):
+        """Retira o pedido mais próximo do foco (chamado com _condicao adquirida)"""
+        melhor, melhor_distancia = None, None
+        descartados = []
+        foco = self.foco
+        for chave, posicao in self._pendentes.items():
+            if posicao is None:
+                distancia = -1
+            elif posicao >= foco:
+                distancia = posicao - foco
+            else:
+                # Acima do primeiro item visível: já está fora da tela
+                distancia = 2 * (foco - posicao)
+            if distancia > self.distancia_maxima:
+                descartados.append(chave)
+            elif melhor is None or distancia < melhor_distancia:
+                melhor, melhor_distancia = chave, distancia
+        for chave in descartados:
+            del self._pendentes[chave]
+        if melhor is not None:
+            del self._pendentes[melhor]
+        return melhor
+
+    def _trabalhar(self):
+        while True:
+            with self._condicao:
+                chave = self._proximo()
+                while chave is None:
+                    self._condicao.wait()
+                    chave = self._proximo()
+                self._em_andamento.add(chave)
+
+            try:
+                resultado, erro = self._carregar(chave), None
+            except Exception as e:
+                resultado, erro = None, e
+
+            with self._condicao:
+                self._em_andamento.discard(chave)
+                self._prontos.append((chave, resultado, erro))
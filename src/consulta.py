@@ -0,0 +1,416 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Consultas compostas sobre a playlist (relatórios).
+
+Uma consulta combina condições sobre os campos com E/OU/NAO e parênteses:
+
+    genero = rock E ano ENTRE 1980 E 1990
+    (artista ~ beatles OU artista ~ stones) E NAO album ^ live
+    titulo REGEX "^(love|amor)" OU ano >= 2020
+
+Operadores (texto comparado sem maiúsculas nem acentos, ver normalizacao):
+    =  igual          !=  diferente       ~  contém       ^  começa com
+    REGEX  expressão regular (sem diferenciar maiúsculas; acentos contam)
+    < <= > >= e ENTRE a E b  comparação numérica (só para o ano)
+As palavras-chave também são aceitas em inglês (AND, OR, NOT, BETWEEN).
+
+A consulta não percorre as músicas: usa os índices exatos da Biblioteca
+(valor -> posições). Cada condição é testada uma vez por valor distinto do
+campo; artista, álbum, gênero e ano têm poucos valores distintos, e os
+textos de cada campo ficam unidos em uma única string onde um padrão
+literal pré-compilado (re, em C) encontra todos os valores de uma vez. As
+posições dos valores aceitos são combinadas como conjuntos (interseção,
+união, diferença). REGEX é a exceção: testa cada valor distinto em Python.
+"""
+import re
+from bisect import bisect_right
+
+from normalizacao import dobrar_texto
+from track import CAMPOS
+
+
+# Nomes aceitos para os campos (já dobrados: "Título" -> "titulo")
+_CAMPOS = {campo: campo for campo in CAMPOS}
+
+# Palavras-chave (dobradas) -> significado
+_PALAVRAS = {
+    'e': 'E', 'and': 'E',
+    'ou': 'OU', 'or': 'OU',
+    'nao': 'NAO', 'not': 'NAO',
+    'entre': 'ENTRE', 'between': 'ENTRE',
+    'regex': 'REGEX',
+}
+
+_OPERADORES_NUMERICOS = ('<', '<=', '>', '>=')
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<texto>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<operador><=|>=|!=|=|<|>|~|\^)
+  | (?P<parentese>[()])
+  | (?P<palavra>[^\s()=<>!~^"']+)
+)''', re.VERBOSE)
+
+_VAZIO = frozenset()
+
+
+class ErroConsulta(ValueError):
+    """Consulta com sintaxe inválida"""
+
+
+# ===== Análise =====
+
+def _tokens(texto):
+    """Gera (tipo, valor, posição) de cada token da consulta"""
+    posicao = 0
+    texto = texto.rstrip()
+    while posicao < len(texto):
+        encontrado = _TOKEN.match(texto, posicao)
+        if encontrado is None:
+            raise ErroConsulta(f"Caractere inesperado na posição {posicao + 1}: {texto[posicao:]!r}")
+        tipo = encontrado.lastgroup
+        valor = encontrado.group(tipo)
+        if tipo == 'texto':
+            aspas = valor[0]
+            valor = valor[1:-1].replace('\\' + aspas, aspas)
+        yield tipo, valor, encontrado.start(tipo)
+        posicao = encontrado.end()
+
+
+class _Analisador:
+    """Analisador descendente recursivo: ou -> e -> nao -> condição"""
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.tokens = list(_tokens(texto))
+        self.atual = 0
+
+    def _espiar(self):
+        if self.atual < len(self.tokens):
+            return self.tokens[self.atual]
+        return None, None, len(self.texto)
+
+    def _palavra(self, token):
+        tipo, valor, _ = token
+        return _PALAVRAS.get(dobrar_texto(valor)) if tipo == 'palavra' else None
+
+    def _avancar(self):
+        token = self._espiar()
+        self.atual += 1
+        return token
+
+    def _erro(self, mensagem):
+        _, valor, posicao = self._espiar()
+        encontrado = f"'{valor}'" if valor is not None else "o fim da consulta"
+        return ErroConsulta(f"{mensagem} (posição {posicao + 1}, encontrado {encontrado})")
+
+    def analisar(self):
+        if not self.tokens:
+            raise ErroConsulta("Consulta vazia")
+        raiz = self._ou()
+        if self.atual < len(self.tokens):
+            raise self._erro("Esperado E, OU ou fim da consulta")
+        return raiz
+
+    def _ou(self):
+        partes = [self._e()]
+        while self._palavra(self._espiar()) == 'OU':
+            self._avancar()
+            partes.append(self._e())
+        return partes[0] if len(partes) == 1 else _Ou(partes)
+
+    def _e(self):
+        partes = [self._nao()]
+        while self._palavra(self._espiar()) == 'E':
+            self._avancar()
+            partes.append(self._nao())
+        return partes[0] if len(partes) == 1 else _E(partes)
+
+    def _nao(self):
+        if self._palavra(self._espiar()) == 'NAO':
+            self._avancar()
+            return _Nao(self._nao())
+        if self._espiar()[:2] == ('parentese', '('):
+            self._avancar()
+            interno = self._ou()
+            if self._espiar()[:2] != ('parentese', ')'):
+                raise self._erro("Esperado ')'")
+            self._avancar()
+            return interno
+        return self._condicao()
+
+    def _valor(self):
+        tipo, valor, _ = self._espiar()
+        if tipo not in ('texto', 'palavra'):
+            raise self._erro("Esperado um valor")
+        self._avancar()
+        return valor
+
+    def _numero(self):
+        valor = self._valor()
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErroConsulta(f"Esperado um ano numérico, encontrado '{valor}'") from None
+
+    def _condicao(self):
+        tipo, valor, _ = self._espiar()
+        campo = _CAMPOS.get(dobrar_texto(valor)) if tipo == 'palavra' else None
+        if campo is None:
+            raise self._erro(f"Esperado um campo ({', '.join(CAMPOS)})")
+        self._avancar()
+
+        token = self._espiar()
+        palavra = self._palavra(token)
+        if palavra == 'ENTRE':
+            self._avancar()
+            minimo = self._numero()
+            if self._palavra(self._espiar()) != 'E':
+                raise self._erro("Esperado E em ENTRE ... E ...")
+            self._avancar()
+            return _Predicado(campo, 'ENTRE', (minimo, self._numero()))
+        if palavra == 'REGEX':
+            self._avancar()
+            padrao = self._valor()
+            try:
+                return _Predicado(campo, 'REGEX', re.compile(padrao, re.IGNORECASE))
+            except re.error as e:
+                raise ErroConsulta(f"Expressão regular inválida {padrao!r}: {e}") from None
+        if token[0] != 'operador':
+            raise self._erro("Esperado um operador (=, !=, ~, ^, <, <=, >, >=, ENTRE, REGEX)")
+        operador = self._avancar()[1]
+        if operador in _OPERADORES_NUMERICOS:
+            return _Predicado(campo, operador, self._numero())
+        return _Predicado(campo, operador, self._valor())
+
+
+# ===== Avaliação =====
+
+def _unir(conjuntos):
+    """União de conjuntos de posições (o resultado não deve ser alterado)"""
+    if not conjuntos:
+        return _VAZIO
+    if len(conjuntos) == 1:
+        return conjuntos[0]
+    return set().union(*conjuntos)
+
+
+def _numero_ano(chave):
+    """Ano numérico de uma chave do campo ano (None se não for um número)"""
+    return int(chave) if chave.isdigit() else None
+
+
+_COMPARACOES = {
+    '<': lambda ano, limite: ano < limite,
+    '<=': lambda ano, limite: ano <= limite,
+    '>': lambda ano, limite: ano > limite,
+    '>=': lambda ano, limite: ano >= limite,
+    'ENTRE': lambda ano, limites: limites[0] <= ano <= limites[1],
+}
+
+
+class _Predicado:
+    """Condição sobre um campo; testada uma vez por valor distinto"""
+
+    def __init__(self, campo, operador, valor):
+        self.campo = campo
+        self.operador = operador
+        self.valor = valor
+        if operador in _COMPARACOES and campo != 'ano':
+            raise ErroConsulta(f"O operador {operador} só pode ser usado com o campo ano")
+
+        if operador in ('=', '!=', '~', '^'):
+            # No texto unido cada valor fica entre quebras de linha: "começa com"
+            # procura "\ntermo" e "igual" procura "\ntermo" seguido de "\n"
+            # (padrões literais, bem mais rápidos que âncoras ^/$ com MULTILINE)
+            self._termo = dobrar_texto(valor)
+            termo = re.escape(self._termo)
+            if operador in ('=', '!='):
+                self._padrao, self._deslocamento = re.compile(f'\n{termo}(?=\n)'), 1
+            elif operador == '^':
+                self._padrao, self._deslocamento = re.compile(f'\n{termo}'), 1
+            else:
+                self._padrao, self._deslocamento = re.compile(termo), 0
+
+    def posicoes(self, motor):
+        coluna = motor.coluna(self.campo)
+        if self.operador in _COMPARACOES:
+            comparar = _COMPARACOES[self.operador]
+            numeros = coluna.numeros()
+            indices = [i for i, numero in enumerate(numeros)
+                       if numero is not None and comparar(numero, self.valor)]
+        elif self.operador == 'REGEX':
+            procurar = self.valor.search
+            indices = [i for i, chave in enumerate(coluna.chaves) if procurar(chave)]
+        elif not self._termo and self.operador in ('~', '^'):
+            indices = range(len(coluna.chaves))
+        else:
+            # Posição do casamento -> valor (linha) que o contém
+            inicios = coluna.inicios
+            deslocamento = self._deslocamento
+            indices = [bisect_right(inicios, casamento.start() + deslocamento) - 1
+                       for casamento in self._padrao.finditer(coluna.texto)]
+
+        posicoes = _unir([coluna.conjuntos[i] for i in indices])
+        if self.operador == '!=':
+            return motor.universo() - posicoes
+        return posicoes
+
+
+class _E:
+    def __init__(self, partes):
+        self.partes = partes
+
+    def posicoes(self, motor):
+        # NAO dentro de um E vira diferença (não precisa do universo)
+        negadas = [parte.parte for parte in self.partes if isinstance(parte, _Nao)]
+        positivas = [parte for parte in self.partes if not isinstance(parte, _Nao)]
+
+        if positivas:
+            conjuntos = sorted((parte.posicoes(motor) for parte in positivas), key=len)
+            resultado = conjuntos[0].intersection(*conjuntos[1:]) if len(conjuntos) > 1 else conjuntos[0]
+        else:
+            resultado = motor.universo()
+        for parte in negadas:
+            if not resultado:
+                break
+            resultado = resultado - parte.posicoes(motor)
+        return resultado
+
+
+class _Ou:
+    def __init__(self, partes):
+        self.partes = partes
+
+    def posicoes(self, motor):
+        return _unir([parte.posicoes(motor) for parte in self.partes])
+
+
+class _Nao:
+    def __init__(self, parte):
+        self.parte = parte
+
+    def posicoes(self, motor):
+        return motor.universo() - self.parte.posicoes(motor)
+
+
+class Consulta:
+    """Consulta já analisada, pronta para ser avaliada várias vezes"""
+
+    def __init__(self, texto):
+        """
+        Args:
+            texto (str): Expressão da consulta (ver o início do módulo)
+
+        Raises:
+            ErroConsulta: Se a expressão for inválida
+        """
+        self.texto = texto
+        self._raiz = _Analisador(texto).analisar()
+
+    def posicoes(self, motor):
+        """Conjunto de posições (na Biblioteca) das músicas que satisfazem a consulta"""
+        return self._raiz.posicoes(motor)
+
+
+# ===== Colunas e motor =====
+
+class _Coluna:
+    """Valores distintos de um campo, com as posições e o texto unido"""
+
+    def __init__(self, indice, dobrados):
+        """
+        Args:
+            indice (dict): Chave exata (casefold) -> posições (índice da Biblioteca)
+            dobrados (dict): Chave -> texto dobrado (cache reaproveitado entre versões)
+        """
+        self.indice = indice
+        self.chaves = list(indice)
+        self.conjuntos = list(indice.values())
+        self.dobrados = {chave: dobrados.get(chave) or dobrar_texto(chave) for chave in self.chaves}
+        textos = [self.dobrados[chave] for chave in self.chaves]
+
+        # "\nvalor1\nvalor2\n...\n"; inicios[i] é a posição do primeiro caractere do valor i
+        self.texto = '\n' + '\n'.join(textos) + '\n'
+        self.inicios = []
+        inicio = 1
+        for texto in textos:
+            self.inicios.append(inicio)
+            inicio += len(texto) + 1
+        self._numeros = None
+
+    def numeros(self):
+        """Valor numérico de cada chave (None se não for um número)"""
+        if self._numeros is None:
+            self._numeros = [_numero_ano(chave) for chave in self.chaves]
+        return self._numeros
+
+
+class MotorConsulta:
+    """
+    Avalia consultas sobre uma Biblioteca.
+
+    É registrado como observador da Biblioteca: qualquer alteração descarta
+    as colunas montadas, que são refeitas (reaproveitando os textos já
+    dobrados) na próxima consulta.
+    """
+
+    def __init__(self, biblioteca):
+        self.biblioteca = biblioteca
+        self._colunas = {}
+        self._dobrados = {campo: {} for campo in CAMPOS}
+        self._universo = None
+
+    # ===== Observador da Biblioteca =====
+
+    def _invalidar(self):
+        self._colunas.clear()
+        self._universo = None
+
+    def adicionar(self, musica):
+        self._invalidar()
+
+    def atualizar(self, musica, antes=None):
+        self._invalidar()
+
+    def remover(self, musica):
+        self._invalidar()
+
+    # ===== Consultas =====
+
+    def coluna(self, campo):
+        """Coluna do campo, montada a partir do índice exato atual da Biblioteca"""
+        indice = self.biblioteca.indice_exato(campo)
+        coluna = self._colunas.get(campo)
+        # A compactação da Biblioteca troca os índices sem avisar os observadores
+        if coluna is None or coluna.indice is not indice:
+            coluna = self._colunas[campo] = _Coluna(indice, self._dobrados[campo])
+            self._dobrados[campo] = coluna.dobrados
+        return coluna
+
+    def universo(self):
+        """Posições de todas as músicas da playlist"""
+        indice = self.biblioteca.indice_exato(CAMPOS[0])
+        if self._universo is None or self._universo[0] is not indice:
+            self._universo = (indice, self.biblioteca.posicoes_vivas())
+        return self._universo[1]
+
+    def consultar(self, consulta):
+        """
+        Retorna as músicas que satisfazem a consulta, na ordem da playlist.
+
+        Args:
+            consulta (str ou Consulta): Expressão ou consulta já analisada
+
+        Returns:
+            list: Músicas encontradas
+
+        Raises:
+            ErroConsulta: Se a expressão for inválida
+        """
+        if not isinstance(consulta, Consulta):
+            consulta = Consulta(consulta)
+        return self.biblioteca.musicas_em(consulta.posicoes(self))
@@ -0,0 +1,456 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Persistência incremental da playlist: diário de alterações + compactação.
+
+Em vez de reescrever o playlist.txt a cada salvamento, cada alteração
+(add/edit/del) é acrescentada como uma linha JSON em "playlist.txt.diario",
+com um número de sequência crescente. Cada linha vai para o sistema
+operacional na hora (flush); o fsync é feito em lotes, no máximo
+INTERVALO_SINCRONIZACAO segundos depois da operação mais antiga pendente.
+
+De tempos em tempos o diário é compactado: o estado completo é gravado em
+um arquivo temporário, sincronizado e renomeado por cima do playlist.txt
+(os.replace é atômico), em uma thread separada. O playlist.txt contém só
+músicas; até qual operação ele já contém fica no marcador
+"playlist.txt.marcador", ao lado: cada linha "<seq> <tamanho> <mtime_ns>
+<inode>" vale para o arquivo com aquela identidade (o rename a preserva). O marcador
+do arquivo novo é gravado antes do rename, mantendo a linha do arquivo
+atual; assim, se o programa for interrompido em qualquer ponto, a linha
+que corresponde ao playlist.txt existente indica quais operações do
+diário (as de sequência maior) ainda precisam ser reaplicadas.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+from snapshot import salvar_snapshot
+from track import CAMPOS, Track
+
+
+# Prefixo da linha marcadora que versões anteriores gravavam no fim do arquivo
+PREFIXO_MARCADOR = '#diario='
+
+# fsync a cada N operações ou quando a última sincronização for mais antiga que o intervalo
+OPERACOES_POR_SINCRONIZACAO = 32
+INTERVALO_SINCRONIZACAO = 1.0  # segundos
+
+# Compacta em segundo plano depois desta quantidade de operações no diário
+OPERACOES_PARA_COMPACTAR = 5000
+
+
+def caminho_diario(nome_arquivo):
+    """Retorna o caminho do diário associado ao arquivo da playlist"""
+    return str(nome_arquivo) + '.diario'
+
+
+def caminho_marcador(nome_arquivo):
+    """Retorna o caminho do marcador de compactação associado ao arquivo da playlist"""
+    return str(nome_arquivo) + '.marcador'
+
+
+def _identidade(caminho):
+    """Tamanho, data de modificação (ns) e inode do arquivo; o rename preserva os três"""
+    estado = os.stat(caminho)
+    return estado.st_size, estado.st_mtime_ns, estado.st_ino
+
+
+def _linhas_marcador(nome_arquivo):
+    """Linhas (seq, tamanho, mtime_ns, inode) do marcador; None se ele não existir"""
+    try:
+        with open(caminho_marcador(nome_arquivo), 'r', encoding='utf-8') as arquivo:
+            conteudo = arquivo.read()
+    except FileNotFoundError:
+        return None
+    linhas = []
+    for linha in conteudo.splitlines():
+        try:
+            seq, *identidade = map(int, linha.split())
+        except ValueError:
+            continue  # Linha corrompida
+        if len(identidade) == 3:
+            linhas.append((seq, *identidade))
+    return linhas
+
+
+def ler_marcador(nome_arquivo):
+    """
+    Lê até qual operação do diário o arquivo da playlist já contém.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt
+
+    Returns:
+        int: Última operação do diário já contida no arquivo (0 se não houver
+             marcador para o arquivo atual)
+    """
+    try:
+        atual = _identidade(nome_arquivo)
+    except FileNotFoundError:
+        return 0
+    linhas = _linhas_marcador(nome_arquivo)
+    if linhas is None:
+        return _ler_marcador_antigo(nome_arquivo)
+    for seq, *identidade in reversed(linhas):
+        if tuple(identidade) == atual:
+            return seq
+    return 0
+
+
+def _gravar_marcador(nome_arquivo, seq, identidade):
+    """
+    Grava (temporário + rename) o marcador do arquivo que vai substituir o atual.
+
+    A linha do arquivo atual é mantida: se o rename da playlist não chegar a
+    acontecer, ela continua valendo.
+    """
+    linhas = []
+    try:
+        atual = _identidade(nome_arquivo)
+    except FileNotFoundError:
+        atual = None
+    for linha in _linhas_marcador(nome_arquivo) or ():
+        if linha[1:] == atual:
+            linhas = [linha]
+    linhas.append((seq, *identidade))
+
+    caminho = caminho_marcador(nome_arquivo)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        for linha in linhas:
+            arquivo.write(' '.join(map(str, linha)) + '\n')
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def _ler_marcador_antigo(nome_arquivo):
+    """Marcador "#diario=<seq>" no fim do arquivo (gravado por versões anteriores)"""
+    try:
+        with open(nome_arquivo, 'rb') as arquivo:
+            arquivo.seek(0, os.SEEK_END)
+            tamanho = arquivo.tell()
+            arquivo.seek(max(0, tamanho - 4096))
+            final = arquivo.read().decode('utf-8', errors='ignore')
+    except FileNotFoundError:
+        return 0
+
+    for linha in reversed(final.splitlines()):
+        if linha.startswith(PREFIXO_MARCADOR):
+            try:
+                return int(linha[len(PREFIXO_MARCADOR):])
+            except ValueError:
+                return 0
+    return 0
+
+
+def ler_operacoes(nome_arquivo, depois_de=0):
+    """
+    Lê as operações do diário com sequência maior que depois_de.
+
+    Uma linha incompleta no final (gravação interrompida) encerra a leitura.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt
+        depois_de (int): Sequência já aplicada no arquivo da playlist
+
+    Returns:
+        list: Operações (dicts com 'seq', 'op' e os dados da música)
+    """
+    operacoes = []
+    try:
+        with open(caminho_diario(nome_arquivo), 'r', encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                try:
+                    operacao = json.loads(linha)
+                except ValueError:
+                    break
+                if operacao['seq'] > depois_de:
+                    operacoes.append(operacao)
+    except FileNotFoundError:
+        pass
+    return operacoes
+
+
+def aplicar_operacoes(musicas, operacoes):
+    """
+    Reaplica operações do diário sobre uma lista de músicas.
+
+    As músicas são identificadas pelo conteúdo: um 'edit' ou 'del' age sobre
+    a primeira música igual ao estado 'antes' registrado.
+
+    Args:
+        musicas (list): Músicas carregadas do arquivo
+        operacoes (list): Operações retornadas por ler_operacoes
+
+    Returns:
+        list: Nova lista de músicas com as operações aplicadas
+    """
+    if not operacoes:
+        return musicas
+
+    posicoes = list(musicas)
+    por_conteudo = defaultdict(deque)  # tupla -> posições com esse conteúdo
+    for posicao, musica in enumerate(posicoes):
+        por_conteudo[tuple(musica[campo] for campo in CAMPOS)].append(posicao)
+
+    for operacao in operacoes:
+        tipo = operacao['op']
+        if tipo == 'add':
+            depois = tuple(operacao['depois'])
+            por_conteudo[depois].append(len(posicoes))
+            posicoes.append(Track(*depois))
+            continue
+
+        candidatas = por_conteudo.get(tuple(operacao['antes']))
+        if not candidatas:
+            continue  # Operação já refletida no arquivo ou diário inconsistente
+        posicao = candidatas.popleft()
+
+        if tipo == 'edit':
+            depois = tuple(operacao['depois'])
+            posicoes[posicao] = Track(*depois)
+            # Mantém as posições de cada conteúdo em ordem crescente
+            fila = por_conteudo[depois]
+            fila.append(posicao)
+            if len(fila) > 1 and fila[-2] > posicao:
+                por_conteudo[depois] = deque(sorted(fila))
+        elif tipo == 'del':
+            posicoes[posicao] = None
+
+    return [musica for musica in posicoes if musica is not None]
+
+
+def escrever_atomico(nome_arquivo, musicas, seq=0):
+    """
+    Grava a playlist em um temporário e renomeia por cima do arquivo final.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt
+        musicas (iterable): Músicas (ou tuplas) no formato Titulo;Artista;Album;Genero;Ano
+        seq (int): Última operação do diário contida nesta gravação
+
+    Returns:
+        int: Quantidade de músicas gravadas
+    """
+    destino = Path(nome_arquivo)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_name(destino.name + '.tmp')
+
+    total = 0
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        for musica in musicas:
+            if not isinstance(musica, tuple):
+                musica = tuple(musica[campo] for campo in CAMPOS)
+            arquivo.write(';'.join(musica) + '\n')
+            total += 1
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+
+    # Sem marcador para o arquivo novo (seq 0), nenhuma linha antiga vale para ele
+    if seq:
+        _gravar_marcador(destino, seq, _identidade(temporario))
+    os.replace(temporario, destino)
+    _sincronizar_pasta(destino.parent)
+    return total
+
+
+def _sincronizar_pasta(pasta):
+    """Garante que o rename ficou gravado no disco (não suportado no Windows)"""
+    if os.name == 'nt':
+        return
+    descritor = os.open(str(pasta), os.O_RDONLY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+def ultima_sequencia(nome_arquivo):
+    """Retorna a maior sequência registrada no diário ou no marcador do arquivo"""
+    operacoes = ler_operacoes(nome_arquivo)
+    ultima = operacoes[-1]['seq'] if operacoes else 0
+    return max(ultima, ler_marcador(nome_arquivo))
+
+
+def recuperar(nome_arquivo):
+    """
+    Incorpora ao arquivo da playlist as operações pendentes do diário.
+
+    Útil antes de uma leitura em streaming (ler_musicas), que não reaplica o diário.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt
+
+    Returns:
+        bool: True se havia operações pendentes
+    """
+    seq = ler_marcador(nome_arquivo)
+    operacoes = ler_operacoes(nome_arquivo, depois_de=seq)
+    if not operacoes:
+        return False
+
+    # Import local: main importa este módulo
+    from main import ler_musicas
+    try:
+        musicas = list(ler_musicas(nome_arquivo))
+    except FileNotFoundError:
+        musicas = []
+    musicas = aplicar_operacoes(musicas, operacoes)
+    escrever_atomico(nome_arquivo, musicas, operacoes[-1]['seq'])
+    salvar_snapshot(nome_arquivo, musicas)
+    return True
+
+
+class DiarioAlteracoes:
+    """Observador da Biblioteca que registra cada alteração no diário"""
+
+    # Músicas lidas do arquivo (Biblioteca.carregar) não são registradas
+    registra_carregamento = False
+
+    def __init__(self, nome_arquivo, biblioteca,
+                 operacoes_por_sincronizacao=OPERACOES_POR_SINCRONIZACAO,
+                 operacoes_para_compactar=OPERACOES_PARA_COMPACTAR):
+        self.nome_arquivo = str(nome_arquivo)
+        self.caminho = caminho_diario(nome_arquivo)
+        self.biblioteca = biblioteca
+        self.operacoes_por_sincronizacao = operacoes_por_sincronizacao
+        self.operacoes_para_compactar = operacoes_para_compactar
+
+        self._lock = threading.RLock()
+        self._seq = ultima_sequencia(self.nome_arquivo)
+        self._operacoes_no_diario = len(ler_operacoes(self.nome_arquivo))
+        self._pendentes = 0
+        self._ultima_sincronizacao = time.monotonic()
+        self._temporizador = None  # fsync agendado para as operações pendentes
+        self._compactacao = None
+
+        Path(self.caminho).parent.mkdir(parents=True, exist_ok=True)
+        self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+
+    @classmethod
+    def anexar(cls, biblioteca, nome_arquivo, **opcoes):
+        """Cria o diário e o registra como observador da biblioteca"""
+        diario = cls(nome_arquivo, biblioteca, **opcoes)
+        biblioteca.observadores.append(diario)
+        return diario
+
+    # ===== Observador da Biblioteca =====
+
+    def adicionar(self, musica):
+        self._registrar({'op': 'add', 'depois': musica.para_tupla()})
+
+    def atualizar(self, musica, antes):
+        self._registrar({'op': 'edit', 'antes': antes, 'depois': musica.para_tupla()})
+
+    def remover(self, musica):
+        self._registrar({'op': 'del', 'antes': musica.para_tupla()})
+
+    # ===== Diário =====
+
+    def _registrar(self, operacao):
+        with self._lock:
+            self._seq += 1
+            operacao['seq'] = self._seq
+            self._arquivo.write(json.dumps(operacao, ensure_ascii=False) + '\n')
+            # Sem flush a linha ficaria no buffer do processo e se perderia se ele morresse
+            self._arquivo.flush()
+            self._pendentes += 1
+            self._operacoes_no_diario += 1
+
+            decorrido = time.monotonic() - self._ultima_sincronizacao
+            if (self._pendentes >= self.operacoes_por_sincronizacao or
+                    decorrido >= INTERVALO_SINCRONIZACAO):
+                self.sincronizar()
+            elif self._temporizador is None:
+                # Garante o fsync no prazo mesmo que nenhuma outra operação chegue
+                self._temporizador = threading.Timer(INTERVALO_SINCRONIZACAO - decorrido,
+                                                     self.sincronizar)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+        if self._operacoes_no_diario >= self.operacoes_para_compactar:
+            self.compactar()
+
+    def sincronizar(self):
+        """Grava no disco (fsync) as operações ainda em buffer"""
+        with self._lock:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if self._arquivo.closed:
+                return
+            self._arquivo.flush()
+            if self._pendentes:
+                os.fsync(self._arquivo.fileno())
+            self._pendentes = 0
+            self._ultima_sincronizacao = time.monotonic()
+
+    def compactar(self, em_segundo_plano=True):
+        """
+        Grava o estado atual no playlist.txt (temporário + rename) e poda o diário.
+
+        A cópia do estado é feita na thread que chama; só a escrita em disco
+        vai para segundo plano. Não inicia se outra compactação estiver em andamento.
+
+        Args:
+            em_segundo_plano (bool): Se False, espera a gravação terminar
+        """
+        if self._compactacao is not None and self._compactacao.is_alive():
+            if em_segundo_plano:
+                return
+            self._compactacao.join()
+
+        with self._lock:
+            self.sincronizar()
+            seq = self._seq
+            estado = [musica.para_tupla() for musica in self.biblioteca]
+            self._operacoes_no_diario = 0
+
+        def gravar():
+            escrever_atomico(self.nome_arquivo, estado, seq)
+            salvar_snapshot(self.nome_arquivo, estado)
+            self._podar(seq)
+
+        if em_segundo_plano:
+            self._compactacao = threading.Thread(target=gravar, daemon=True)
+            self._compactacao.start()
+        else:
+            gravar()
+
+    def _podar(self, seq):
+        """Reescreve o diário mantendo só as operações posteriores a seq"""
+        with self._lock:
+            self._arquivo.flush()
+            restantes = ler_operacoes(self.nome_arquivo, depois_de=seq)
+            temporario = self.caminho + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                for operacao in restantes:
+                    arquivo.write(json.dumps(operacao, ensure_ascii=False) + '\n')
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+
+            reaberto = not self._arquivo.closed
+            self._arquivo.close()
+            os.replace(temporario, self.caminho)
+            self._operacoes_no_diario = len(restantes)
+            if reaberto:
+                self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+
+    def aguardar_compactacao(self):
+        """Espera a compactação em segundo plano, se houver"""
+        if self._compactacao is not None:
+            self._compactacao.join()
+
+    def fechar(self):
+        """Sincroniza o diário e espera compactações pendentes"""
+        self.aguardar_compactacao()
+        with self._lock:
+            self.sincronizar()
+            self._arquivo.close()
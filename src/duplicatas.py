@@ -0,0 +1,274 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Detecção de músicas duplicadas e propostas de mesclagem.
+
+Importações repetidas deixam linhas quase iguais na playlist: o mesmo
+título e artista com maiúsculas, acentos ou sufixos diferentes ("- Single",
+"(Remastered 2011)", "Ao Vivo"...). Comparar todos os pares seria O(n²);
+em vez disso, cada música recebe chaves normalizadas (normalizar_texto sem
+os sufixos de versão) e só músicas do mesmo bloco são comparadas:
+
+1. Bloco exato: mesmo artista e mesmo título normalizados. São duplicatas
+   sem precisar de comparação.
+2. Blocos aproximados: títulos distintos do mesmo artista que começam ou
+   terminam com as mesmas letras. Dentro de cada bloco (ordenado), cada
+   título é comparado com os próximos JANELA_BLOCO títulos pela distância
+   de edição; títulos a até orcamento_erros edições (ver busca_aproximada)
+   também são duplicatas ("Reminsce" e "Reminisce"). Um erro de digitação
+   mantém o começo ou o fim do título, então uma das duas passagens o
+   encontra.
+
+Cada passo é linear no número de músicas (a janela limita as comparações
+por título). Os grupos ligados viram PropostaMesclagem: a música mais
+completa é mantida, recebe os álbum/gênero/ano que faltam das outras, e as
+outras são removidas, depois de aprovadas em uma FilaRevisao.
+"""
+import re
+
+from busca_aproximada import distancia_edicao, orcamento_erros
+from enriquecimento import CAMPOS_ENRIQUECIDOS, FilaRevisao, valor_vazio
+from normalizacao import dobrar_texto, normalizar_texto
+
+
+# Letras do começo/fim do título usadas nos blocos aproximados
+TAMANHO_BLOCO = 4
+
+# Títulos seguintes comparados com cada título do bloco ordenado
+JANELA_BLOCO = 8
+
+# Músicas analisadas entre duas verificações de cancelamento/progresso
+INTERVALO_PROGRESSO = 10000
+
+# Palavras que marcam uma versão da mesma gravação (texto já dobrado)
+_VERSOES = (r'single|ep|remaster|remastered|remasterizad[ao]|live|ao vivo|radio edit|edit'
+            r'|versao|version|mono|stereo|deluxe|bonus|acustic[ao]|acoustic|feat|ft|featuring')
+
+# "(... live ...)", "[remastered 2011]" ou " - single" no fim do título
+_SUFIXO_VERSAO = re.compile(
+    rf'\s*[(\[][^)\]]*\b(?:{_VERSOES})\b[^)\]]*[)\]]|\s+-\s+[^-]*\b(?:{_VERSOES})\b.*$')
+
+# Participações no nome do artista (texto já normalizado)
+_PARTICIPACAO = re.compile(r'\s+(?:feat|ft|featuring)\b.*$')
+
+
+def chave_titulo(titulo):
+    """
+    Título comparável: sem maiúsculas, acentos, pontuação e sufixos de versão.
+
+    Args:
+        titulo (str): Título original (ex.: "Coração (Ao Vivo) - Remastered")
+
+    Returns:
+        str: Chave (ex.: "coracao")
+    """
+    texto = _SUFIXO_VERSAO.sub('', dobrar_texto(titulo))
+    return normalizar_texto(texto.replace('-', ' '))
+
+
+def chave_artista(artista):
+    """
+    Artista comparável: sem maiúsculas, acentos, pontuação, participações e "The".
+
+    Args:
+        artista (str): Artista original (ex.: "The Beatles feat. Billy Preston")
+
+    Returns:
+        str: Chave (ex.: "beatles")
+    """
+    texto = _PARTICIPACAO.sub('', normalizar_texto(dobrar_texto(artista)))
+    return texto[4:] if texto.startswith('the ') else texto
+
+
+def _preenchidos(musica):
+    """Quantidade de campos enriquecidos com informação"""
+    return sum(not valor_vazio(campo, musica[campo]) for campo in CAMPOS_ENRIQUECIDOS)
+
+
+class PropostaMesclagem:
+    """Grupo de duplicatas: mantém uma música (completada pelas outras) e remove as demais"""
+
+    __slots__ = ('musica', 'duplicatas', 'antes', 'novos_valores', 'semelhanca')
+
+    def __init__(self, musica, duplicatas, novos_valores, semelhanca):
+        """
+        Args:
+            musica (Track): Música mantida
+            duplicatas (list): Músicas removidas
+            novos_valores (dict): Campos da música mantida completados pelas duplicatas
+            semelhanca (float): Menor semelhança (0 a 1) entre títulos ligados no grupo
+        """
+        self.musica = musica
+        self.duplicatas = duplicatas
+        self.antes = tuple(m.para_tupla() for m in (musica, *duplicatas))
+        self.novos_valores = novos_valores
+        self.semelhanca = semelhanca
+
+    def atual(self):
+        """True se nenhuma música do grupo foi alterada desde a detecção"""
+        return tuple(m.para_tupla() for m in (self.musica, *self.duplicatas)) == self.antes
+
+    def aplicar(self, biblioteca):
+        """
+        Completa a música mantida e remove as duplicatas.
+
+        Returns:
+            bool: False (nada é feito) se alguma música do grupo foi removida
+                  ou alterada depois da detecção
+        """
+        grupo = (self.musica, *self.duplicatas)
+        if any(musica not in biblioteca for musica in grupo) or not self.atual():
+            return False
+        if self.novos_valores:
+            biblioteca.atualizar(self.musica, **self.novos_valores)
+        for duplicata in self.duplicatas:
+            biblioteca.remover(duplicata)
+        return True
+
+    def __repr__(self):
+        return f"PropostaMesclagem({self.musica!r}, {len(self.duplicatas)} duplicata(s))"
+
+
+class _Grupos:
+    """Union-find dos blocos exatos (ligados pelas comparações aproximadas)"""
+
+    def __init__(self):
+        self.pai = {}
+        self.semelhanca = {}  # raiz -> menor semelhança das ligações do grupo
+
+    def raiz(self, chave):
+        pai = self.pai
+        while pai[chave] != chave:
+            pai[chave] = pai[pai[chave]]  # Encurta o caminho
+            chave = pai[chave]
+        return chave
+
+    def ligar(self, a, b, semelhanca):
+        a, b = self.raiz(a), self.raiz(b)
+        if a != b:
+            self.pai[b] = a
+            semelhanca = min(semelhanca, self.semelhanca.pop(b, 1.0))
+        self.semelhanca[a] = min(semelhanca, self.semelhanca.get(a, 1.0))
+
+
+def detectar_duplicatas(musicas, fila=None, aproximadas=True, cancelar=None, ao_progredir=None):
+    """
+    Procura duplicatas e coloca uma proposta de mesclagem por grupo na fila.
+
+    Pode rodar fora da thread da interface (só lê as músicas); as propostas
+    conferem na aprovação se as músicas continuam iguais.
+
+    Args:
+        musicas (iterable): Músicas da playlist (na ordem da playlist)
+        fila (FilaRevisao): Fila de destino (padrão: uma nova)
+        aproximadas (bool): Também liga títulos com erros de digitação
+        cancelar (threading.Event): Quando sinalizado, interrompe e retorna a fila vazia
+        ao_progredir (callable): ao_progredir(analisadas, total) a cada INTERVALO_PROGRESSO músicas
+
+    Returns:
+        FilaRevisao: Propostas encontradas, na ordem da playlist
+    """
+    musicas = list(musicas)
+    fila = FilaRevisao() if fila is None else fila
+
+    for proposta in _agrupar(musicas, aproximadas, cancelar, ao_progredir):
+        fila.adicionar(proposta)
+    return fila
+
+
+def _agrupar(musicas, aproximadas, cancelar, ao_progredir):
+    """Blocos exatos, ligações aproximadas e propostas (ver detectar_duplicatas)"""
+    # 1. Blocos exatos: (artista, título) normalizados -> músicas
+    # Artistas e títulos se repetem: as chaves de cada texto são calculadas uma vez
+    chaves_artista, chaves_titulo = {}, {}
+    blocos = {}
+    for analisadas, musica in enumerate(musicas, 1):
+        original = musica['artista']
+        artista = chaves_artista.get(original)
+        if artista is None:
+            artista = chaves_artista[original] = chave_artista(original)
+        original = musica['titulo']
+        titulo = chaves_titulo.get(original)
+        if titulo is None:
+            titulo = chaves_titulo[original] = chave_titulo(original)
+        if titulo:
+            bloco = blocos.get((artista, titulo))
+            if bloco is None:
+                blocos[(artista, titulo)] = [musica]
+            else:
+                bloco.append(musica)
+
+        if analisadas % INTERVALO_PROGRESSO == 0:
+            if cancelar is not None and cancelar.is_set():
+                return []
+            if ao_progredir is not None:
+                ao_progredir(analisadas, len(musicas))
+
+    grupos = _Grupos()
+    grupos.pai = {chave: chave for chave in blocos}
+
+    # 2. Blocos aproximados: mesmo artista e mesmo começo (ou fim) do título
+    if aproximadas:
+        vizinhos = {}
+        for artista, titulo in blocos:
+            if orcamento_erros(len(titulo)):
+                vizinhos.setdefault((artista, True, titulo[:TAMANHO_BLOCO]), []).append(titulo)
+                vizinhos.setdefault((artista, False, titulo[-TAMANHO_BLOCO:]), []).append(titulo)
+
+        for (artista, _, _), titulos in vizinhos.items():
+            if len(titulos) < 2:
+                continue
+            titulos.sort()
+            for i, titulo in enumerate(titulos):
+                for outro in titulos[i + 1:i + 1 + JANELA_BLOCO]:
+                    limite = orcamento_erros(min(len(titulo), len(outro)))
+                    if abs(len(titulo) - len(outro)) > limite:
+                        continue
+                    distancia = distancia_edicao(titulo, outro)
+                    if distancia <= limite:
+                        semelhanca = 1 - distancia / max(len(titulo), len(outro))
+                        grupos.ligar((artista, titulo), (artista, outro), semelhanca)
+
+        if cancelar is not None and cancelar.is_set():
+            return []
+
+    # 3. Uma proposta por grupo com mais de uma música
+    membros = {}
+    for chave, bloco in blocos.items():
+        membros.setdefault(grupos.raiz(chave), []).extend(bloco)
+
+    posicao = {id(musica): i for i, musica in enumerate(musicas)}
+    propostas = []
+    for raiz, grupo in membros.items():
+        if len(grupo) < 2:
+            continue
+        grupo.sort(key=lambda musica: posicao[id(musica)])
+        # Mantém a mais completa (no empate, a primeira da playlist)
+        mantida = max(grupo, key=_preenchidos)
+        duplicatas = [musica for musica in grupo if musica is not mantida]
+        novos_valores = {}
+        for campo in CAMPOS_ENRIQUECIDOS:
+            if valor_vazio(campo, mantida[campo]):
+                valor = next((m[campo] for m in duplicatas if not valor_vazio(campo, m[campo])), None)
+                if valor is not None:
+                    novos_valores[campo] = valor
+        propostas.append(PropostaMesclagem(mantida, duplicatas, novos_valores,
+                                           grupos.semelhanca.get(raiz, 1.0)))
+
+    propostas.sort(key=lambda proposta: posicao[id(proposta.musica)])
+    return propostas
+
+
+def resumo_mesclagem(proposta):
+    """Texto de uma linha com a música mantida, as duplicatas e os campos completados"""
+    musica = proposta.musica
+    texto = (f"{musica['titulo']} - {musica['artista']}: remove {len(proposta.duplicatas)} "
+             f"duplicata(s) ({', '.join(m['titulo'] for m in proposta.duplicatas)})")
+    if proposta.semelhanca < 1.0:
+        texto += f" [semelhança {proposta.semelhanca:.0%}]"
+    if proposta.novos_valores:
+        texto += " + " + ', '.join(f"{campo}: {valor}" for campo, valor in proposta.novos_valores.items())
+    return texto
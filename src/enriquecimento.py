@@ -0,0 +1,324 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Enriquecimento em lote: completa álbum, gênero e ano de várias músicas
+consultando a API com vários trabalhadores ao mesmo tempo.
+
+As buscas não alteram a playlist: cada resultado vira uma proposta em uma
+FilaRevisao, que pode ser aprovada de uma vez (ou uma a uma) na thread que
+controla a Biblioteca. Um limitador de taxa por host evita sobrecarregar
+a API, independentemente do número de trabalhadores.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+
+# Trabalhadores (buscas simultâneas) por padrão
+TRABALHADORES_PADRAO = 4
+
+# Requisições por segundo permitidas por host, e rajada máxima
+TAXA_PADRAO = 5.0
+RAJADA_PADRAO = 5
+
+# Campos completados pela API
+CAMPOS_ENRIQUECIDOS = ('album', 'genero', 'ano')
+
+# Valores considerados "sem informação"
+_VAZIOS = {
+    'album': (None, '', 'Desconhecido', '----'),
+    'genero': (None, '', 'Desconhecido'),
+    'ano': (None, '', '----'),
+}
+
+
+def valor_vazio(campo, valor):
+    """True se o valor do campo enriquecido indica "sem informação" (ex.: '----')"""
+    return valor in _VAZIOS[campo]
+
+
+def musica_incompleta(musica):
+    """
+    Indica se vale buscar dados da música na API.
+
+    Precisa ter título e artista; é incompleta se não tiver álbum, ano ou gênero.
+
+    Args:
+        musica (Track): Música da playlist
+
+    Returns:
+        bool: True se algum dos campos enriquecidos estiver vazio
+    """
+    if not musica.get('titulo') or not musica.get('artista'):
+        return False
+    return any(valor_vazio(campo, musica.get(campo)) for campo in CAMPOS_ENRIQUECIDOS)
+
+
+class LimitadorTaxa:
+    """Balde de fichas: até `rajada` requisições seguidas, depois `taxa` por segundo"""
+
+    def __init__(self, taxa=TAXA_PADRAO, rajada=RAJADA_PADRAO):
+        self.taxa = taxa
+        self.rajada = rajada
+        self._fichas = float(rajada)
+        self._ultima = time.monotonic()
+        self._lock = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até haver uma ficha disponível e a consome"""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._fichas = min(self.rajada, self._fichas + (agora - self._ultima) * self.taxa)
+                self._ultima = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.taxa
+            time.sleep(espera)
+
+
+class LimitadorPorHost:
+    """Um LimitadorTaxa para cada host (a busca e as capas têm hosts diferentes)"""
+
+    def __init__(self, taxa=TAXA_PADRAO, rajada=RAJADA_PADRAO):
+        self.taxa = taxa
+        self.rajada = rajada
+        self._limitadores = {}
+        self._lock = threading.Lock()
+
+    def aguardar(self, url):
+        """Espera a vez de fazer uma requisição para o host da URL"""
+        host = urlparse(url).netloc
+        with self._lock:
+            limitador = self._limitadores.get(host)
+            if limitador is None:
+                limitador = self._limitadores[host] = LimitadorTaxa(self.taxa, self.rajada)
+        limitador.aguardar()
+
+
+class PropostaAtualizacao:
+    """Dados encontrados na API para uma música, aguardando aprovação"""
+
+    __slots__ = ('musica', 'antes', 'novos_valores', 'info')
+
+    def __init__(self, musica, novos_valores, info):
+        self.musica = musica
+        self.antes = musica.para_tupla()
+        self.novos_valores = novos_valores
+        self.info = info
+
+    def atual(self):
+        """True se a música não foi alterada desde a busca"""
+        return self.musica.para_tupla() == self.antes
+
+    def aplicar(self, biblioteca):
+        """
+        Atualiza a música com os valores encontrados.
+
+        Returns:
+            bool: False (nada é feito) se a música foi removida ou alterada depois da busca
+        """
+        if self.musica not in biblioteca or not self.atual():
+            return False
+        biblioteca.atualizar(self.musica, **self.novos_valores)
+        return True
+
+    def __repr__(self):
+        return f"PropostaAtualizacao({self.musica!r}, {self.novos_valores!r})"
+
+
+class FilaRevisao:
+    """
+    Propostas pendentes, aprovadas em lote ou individualmente.
+
+    Cada proposta sabe se aplicar (aplicar(biblioteca) -> bool): além das
+    atualizações da API, a fila também guarda as mesclagens de duplicatas.
+    """
+
+    def __init__(self):
+        self._propostas = []
+        self._lock = threading.Lock()
+
+    def adicionar(self, proposta):
+        with self._lock:
+            self._propostas.append(proposta)
+
+    def pendentes(self):
+        """Retorna uma cópia da lista de propostas pendentes"""
+        with self._lock:
+            return list(self._propostas)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._propostas)
+
+    def _retirar(self, propostas):
+        with self._lock:
+            if propostas is None:
+                retiradas, self._propostas = self._propostas, []
+            else:
+                ids = {id(proposta) for proposta in propostas}
+                retiradas = [p for p in self._propostas if id(p) in ids]
+                self._propostas = [p for p in self._propostas if id(p) not in ids]
+        return retiradas
+
+    def aprovar(self, biblioteca, propostas=None):
+        """
+        Aplica as propostas na biblioteca (todas, se propostas for None).
+
+        Deve ser chamado na thread que controla a biblioteca. Propostas de
+        músicas removidas ou alteradas depois da busca são descartadas.
+
+        Args:
+            biblioteca (Biblioteca): Playlist que contém as músicas
+            propostas (iterable): Propostas a aprovar
+
+        Returns:
+            int: Quantidade de propostas aplicadas
+        """
+        aplicadas = 0
+        for proposta in self._retirar(propostas):
+            if proposta.aplicar(biblioteca):
+                aplicadas += 1
+        return aplicadas
+
+    def rejeitar(self, propostas=None):
+        """Descarta propostas (todas, se propostas for None)"""
+        return len(self._retirar(propostas))
+
+
+class Progresso:
+    """Situação do lote, repassada a cada música concluída"""
+
+    __slots__ = ('concluidas', 'total', 'propostas', 'nao_encontradas', 'erros', 'inicio')
+
+    def __init__(self, total):
+        self.total = total
+        self.concluidas = 0
+        self.propostas = 0
+        self.nao_encontradas = []
+        self.erros = []
+        self.inicio = time.monotonic()
+
+    @property
+    def decorrido(self):
+        return time.monotonic() - self.inicio
+
+    @property
+    def vazao(self):
+        """Músicas processadas por segundo"""
+        decorrido = self.decorrido
+        return self.concluidas / decorrido if decorrido > 0 else 0.0
+
+    @property
+    def restante(self):
+        """Estimativa de segundos até o fim (None se ainda não dá para estimar)"""
+        vazao = self.vazao
+        return (self.total - self.concluidas) / vazao if vazao else None
+
+    def __str__(self):
+        texto = f"{self.concluidas}/{self.total} músicas ({self.vazao:.1f}/s)"
+        if self.restante is not None and self.concluidas < self.total:
+            texto += f", faltam ~{self.restante:.0f}s"
+        return texto
+
+
+class EnriquecedorLote:
+    """Busca dados de várias músicas em paralelo e gera propostas de atualização"""
+
+    def __init__(self, api=None, trabalhadores=TRABALHADORES_PADRAO,
+                 taxa=TAXA_PADRAO, rajada=RAJADA_PADRAO):
+        """
+        Args:
+            api (MusicAPI): API usada nas buscas (padrão: MusicAPI com o limitador)
+            trabalhadores (int): Buscas simultâneas
+            taxa (float): Requisições por segundo por host
+            rajada (int): Requisições seguidas permitidas antes de limitar
+        """
+        self.trabalhadores = max(1, int(trabalhadores))
+        if api is None:
+            # Import local: a API depende de requests/Pillow
+            from api_music import TAMANHO_POOL, MusicAPI
+            # API própria: o limitador não afeta as buscas do resto do programa
+            api = MusicAPI(tamanho_pool=max(TAMANHO_POOL, self.trabalhadores))
+        if api.limitador is None:
+            api.limitador = LimitadorPorHost(taxa, rajada)
+        self.api = api
+
+    def _buscar(self, musica):
+        # Falha de rede sem resultado conta como erro, não como "não encontrada"
+        info = self.api.buscar_informacoes_completas(musica['titulo'], musica['artista'],
+                                                     propagar_erros=True)
+        if not info:
+            return None
+        novos_valores = {campo: info[campo] for campo in CAMPOS_ENRIQUECIDOS
+                         if info.get(campo) and info[campo] != musica[campo]}
+        return novos_valores, info
+
+    def executar(self, musicas, fila=None, ao_progredir=None, cancelar=None):
+        """
+        Busca todas as músicas e coloca os resultados na fila de revisão.
+
+        Args:
+            musicas (iterable): Músicas a completar (ver musica_incompleta)
+            fila (FilaRevisao): Fila de destino (padrão: uma nova)
+            ao_progredir (callable): Chamado com o Progresso após cada música,
+                na thread de quem chamou executar()
+            cancelar (threading.Event): Quando sinalizado, não inicia novas buscas
+
+        Returns:
+            tuple: (FilaRevisao, Progresso final)
+        """
+        musicas = list(musicas)
+        fila = FilaRevisao() if fila is None else fila
+        progresso = Progresso(len(musicas))
+        proximas = iter(musicas)
+
+        with ThreadPoolExecutor(max_workers=self.trabalhadores,
+                                thread_name_prefix='enriquecimento') as executor:
+            # Janela limitada de buscas em andamento (permite cancelar logo)
+            em_andamento = {}
+
+            def submeter():
+                while len(em_andamento) < self.trabalhadores * 2:
+                    if cancelar is not None and cancelar.is_set():
+                        return
+                    musica = next(proximas, None)
+                    if musica is None:
+                        return
+                    em_andamento[executor.submit(self._buscar, musica)] = musica
+
+            submeter()
+            while em_andamento:
+                prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    musica = em_andamento.pop(futuro)
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        progresso.erros.append((musica, e))
+                    else:
+                        if resultado is None:
+                            progresso.nao_encontradas.append(musica)
+                        elif resultado[0]:
+                            fila.adicionar(PropostaAtualizacao(musica, *resultado))
+                            progresso.propostas += 1
+                    progresso.concluidas += 1
+                    if ao_progredir is not None:
+                        ao_progredir(progresso)
+                submeter()
+
+        return fila, progresso
+
+
+def resumo_proposta(proposta):
+    """Texto de uma linha com a música e os valores propostos"""
+    musica = proposta.musica
+    mudancas = ', '.join(f"{campo}: {musica[campo] or '----'} -> {valor}"
+                         for campo, valor in proposta.novos_valores.items())
+    return f"{musica['titulo']} - {musica['artista']} ({mudancas})"
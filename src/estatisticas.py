@@ -0,0 +1,124 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Estatísticas da playlist mantidas incrementalmente.
+
+EstatisticasPlaylist é um observador da Biblioteca (como o IndiceBusca):
+cada adicionar/atualizar/remover ajusta contadores por artista, álbum,
+gênero, ano e década em O(1), então o painel de estatísticas e os
+relatórios agrupados não percorrem a playlist a cada alteração. Valores
+cuja contagem chega a zero saem do contador, e o número de valores
+distintos é o tamanho do contador.
+"""
+from collections import Counter
+
+from track import ANO_DESCONHECIDO, CAMPOS
+
+
+# Agrupamentos disponíveis e o nome exibido de cada um
+GRUPOS = {
+    'artista': 'Artista',
+    'album': 'Álbum',
+    'genero': 'Gênero',
+    'ano': 'Ano',
+    'decada': 'Década',
+}
+
+_POSICAO = {campo: posicao for posicao, campo in enumerate(CAMPOS)}
+
+
+def decada(ano):
+    """
+    Década de um ano no formato do arquivo.
+
+    Args:
+        ano (str): Ano como texto (ex.: '1987')
+
+    Returns:
+        str: Ex.: '1980s', ou ANO_DESCONHECIDO se o ano não for numérico
+    """
+    if ano.isdigit():
+        return f"{int(ano) // 10 * 10}s"
+    return ANO_DESCONHECIDO
+
+
+class EstatisticasPlaylist:
+    """Contadores por artista, álbum, gênero, ano e década, atualizados a cada alteração"""
+
+    def __init__(self, musicas=()):
+        """
+        Args:
+            musicas (iterable): Músicas já existentes (contadas uma vez)
+        """
+        self.total = 0
+        self.contagens = {grupo: Counter() for grupo in GRUPOS}
+        for musica in musicas:
+            self.adicionar(musica)
+
+    def _somar(self, valores, delta):
+        """Soma delta aos contadores dos valores (tupla na ordem de CAMPOS)"""
+        self.total += delta
+        for grupo, contador in self.contagens.items():
+            if grupo == 'decada':
+                chave = decada(valores[_POSICAO['ano']])
+            else:
+                chave = valores[_POSICAO[grupo]]
+            contagem = contador[chave] + delta
+            if contagem:
+                contador[chave] = contagem
+            else:
+                del contador[chave]
+
+    # ===== Observador da Biblioteca =====
+
+    def adicionar(self, musica):
+        self._somar(tuple(musica[campo] for campo in CAMPOS), 1)
+
+    def atualizar(self, musica, antes):
+        """antes: valores da música antes da edição (tupla na ordem de CAMPOS)"""
+        self._somar(antes, -1)
+        self._somar(tuple(musica[campo] for campo in CAMPOS), 1)
+
+    def remover(self, musica):
+        self._somar(tuple(musica[campo] for campo in CAMPOS), -1)
+
+    # ===== Consultas =====
+
+    def distintos(self, grupo):
+        """Quantidade de valores distintos do agrupamento (O(1))"""
+        return len(self.contagens[grupo])
+
+    def contagem(self, grupo, valor):
+        """Quantidade de músicas com o valor no agrupamento (O(1))"""
+        return self.contagens[grupo][valor]
+
+    def mais_frequentes(self, grupo, n=10):
+        """
+        Valores com mais músicas.
+
+        Args:
+            grupo (str): Um dos GRUPOS
+            n (int): Quantidade de valores (None = todos)
+
+        Returns:
+            list: Pares (valor, contagem), da maior contagem para a menor
+        """
+        return self.contagens[grupo].most_common(n)
+
+    def agrupar(self, grupo, por_valor=False):
+        """
+        Relatório agrupado: todas as contagens do agrupamento.
+
+        Args:
+            grupo (str): Um dos GRUPOS
+            por_valor (bool): Ordena pelo valor (ex.: anos em ordem) em vez da contagem
+
+        Returns:
+            list: Pares (valor, contagem)
+        """
+        if por_valor:
+            return sorted(self.contagens[grupo].items())
+        return self.mais_frequentes(grupo, None)
@@ -0,0 +1,216 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Índice invertido de n-gramas para busca por substring.
+
+Cada música é indexada pelos trigramas do texto dobrado (sem maiúsculas
+nem acentos, ver normalizacao.dobrar_texto) de titulo/artista/album/genero.
+Uma busca intersecta as listas de trigramas do termo dobrado e confere só
+os candidatos com "termo in campo dobrado", então o resultado é exatamente
+o mesmo da varredura linear, na ordem da playlist.
+"""
+from operator import itemgetter
+
+from normalizacao import dobrar_texto
+from track import CAMPOS
+
+# Campos pesquisados por padrão (os mesmos da busca da GUI)
+CAMPOS_BUSCA = ('titulo', 'artista', 'album', 'genero')
+
+# Tamanho dos n-gramas indexados
+TAMANHO_NGRAMA = 3
+
+# Custo relativo de conferir uma música do resultado anterior (refinar)
+# em vez de um candidato do índice
+_CUSTO_REFINAR = 3
+
+# Separador entre campos no texto unido (não aparece em termos digitados)
+_SEPARADOR = '\x00'
+
+
+def _selecionar(*posicoes):
+    """Função que extrai as posições informadas de uma tupla (sempre retorna tupla)"""
+    if len(posicoes) == 1:
+        posicao = posicoes[0]
+        return lambda valores: (valores[posicao],)
+    return itemgetter(*posicoes)
+
+
+def _ngramas(texto, n=TAMANHO_NGRAMA):
+    """Retorna o conjunto de n-gramas (substrings de tamanho n) do texto"""
+    return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+
+class IndiceBusca:
+    """Índice invertido mantido incrementalmente (adicionar/atualizar/remover)"""
+
+    def __init__(self, musicas=(), campos=CAMPOS_BUSCA):
+        self.campos = tuple(campos)
+        # Seleciona os campos indexados na tupla de Track.dobrados()
+        self._campos_track = _selecionar(*(CAMPOS.index(campo) for campo in self.campos))
+        self._musicas = {}      # doc -> música (ordem de inserção = ordem da playlist)
+        self._docs = {}         # id(música) -> doc
+        self._textos = {}       # doc -> tupla com cada campo dobrado
+        self._unidos = {}       # doc -> campos dobrados unidos por _SEPARADOR
+        self._postings = {}     # n-grama -> conjunto de docs
+        self._proximo_doc = 0
+
+        for musica in musicas:
+            self.adicionar(musica)
+
+    def __len__(self):
+        return len(self._musicas)
+
+    def __contains__(self, musica):
+        return id(musica) in self._docs
+
+    def _indexar(self, doc, musica):
+        dobrados = getattr(musica, 'dobrados', None)
+        if dobrados is not None:
+            # Track: usa os campos já dobrados (os mesmos textos, sem cópias)
+            textos = self._campos_track(dobrados())
+        else:
+            textos = tuple(dobrar_texto(str(musica[campo])) for campo in self.campos)
+        self._textos[doc] = textos
+        self._unidos[doc] = _SEPARADOR.join(textos)
+
+        ngramas = set()
+        for texto in textos:
+            ngramas |= _ngramas(texto)
+        for ngrama in ngramas:
+            docs = self._postings.get(ngrama)
+            if docs is None:
+                self._postings[ngrama] = {doc}
+            else:
+                docs.add(doc)
+
+    def _desindexar(self, doc):
+        ngramas = set()
+        for texto in self._textos.pop(doc):
+            ngramas |= _ngramas(texto)
+        for ngrama in ngramas:
+            docs = self._postings[ngrama]
+            docs.discard(doc)
+            if not docs:
+                del self._postings[ngrama]
+        del self._unidos[doc]
+
+    def adicionar(self, musica):
+        """Indexa uma música nova (deve ser chamado após o append na playlist)"""
+        if id(musica) in self._docs:
+            self.atualizar(musica)
+            return
+        doc = self._proximo_doc
+        self._proximo_doc += 1
+        self._docs[id(musica)] = doc
+        self._musicas[doc] = musica
+        self._indexar(doc, musica)
+
+    def atualizar(self, musica, antes=None):
+        """Reindexa uma música cujos campos foram editados (antes não é usado)"""
+        doc = self._docs.get(id(musica))
+        if doc is None:
+            self.adicionar(musica)
+            return
+        self._desindexar(doc)
+        self._indexar(doc, musica)
+
+    def remover(self, musica):
+        """Remove uma música do índice (ignora se não estiver indexada)"""
+        doc = self._docs.pop(id(musica), None)
+        if doc is None:
+            return
+        self._desindexar(doc)
+        del self._musicas[doc]
+
+    def buscar(self, termo, campos=None):
+        """
+        Busca músicas cujo campo contém o termo (sem diferenciar maiúsculas nem acentos).
+
+        Args:
+            termo (str): Substring procurada
+            campos (iterable): Campos pesquisados (padrão: todos os indexados)
+
+        Returns:
+            list: Músicas encontradas, na ordem da playlist
+        """
+        termo = dobrar_texto(termo)
+        campos = self.campos if campos is None else tuple(campos)
+        posicoes = [self.campos.index(campo) for campo in campos]
+
+        if not termo:
+            return list(self._musicas.values())
+
+        ordenado = len(termo) < TAMANHO_NGRAMA
+        if ordenado:
+            # Termo curto: não há n-grama para usar, varre os textos já dobrados
+            candidatos = self._musicas.keys()
+        else:
+            # Intersecta as listas de docs de cada n-grama, da menor para a maior
+            listas = []
+            for ngrama in _ngramas(termo):
+                docs = self._postings.get(ngrama)
+                if not docs:
+                    return []
+                listas.append(docs)
+            listas.sort(key=len)
+            candidatos = listas[0].intersection(*listas[1:])
+
+        # Confirma a substring (os n-gramas podem vir de campos diferentes)
+        if len(posicoes) == len(self.campos):
+            unidos = self._unidos
+            encontrados = [doc for doc in candidatos if termo in unidos[doc]]
+        else:
+            textos = self._textos
+            encontrados = [doc for doc in candidatos
+                           if any(termo in textos[doc][p] for p in posicoes)]
+
+        if not ordenado:
+            encontrados.sort()
+        return [self._musicas[doc] for doc in encontrados]
+
+    def refinar(self, musicas, termo, campos=None):
+        """
+        Filtra o resultado de uma busca anterior por um termo mais específico.
+
+        Se o termo novo contém o termo da busca que gerou `musicas`, todo
+        resultado novo já está em `musicas`: basta conferir esses candidatos
+        em vez de consultar o índice inteiro.
+
+        Args:
+            musicas (list): Resultado da busca anterior (na ordem da playlist)
+            termo (str): Substring procurada
+            campos (iterable): Campos pesquisados (padrão: todos os indexados)
+
+        Returns:
+            list: Músicas de `musicas` que contêm o termo, na mesma ordem
+        """
+        termo = dobrar_texto(termo)
+        # Candidatos que a busca pelo índice conferiria: o menor conjunto de docs
+        # dos n-gramas do termo, ou todas as músicas se o termo for curto
+        if len(termo) >= TAMANHO_NGRAMA:
+            candidatos = min(len(self._postings.get(ngrama, ())) for ngrama in _ngramas(termo))
+        else:
+            candidatos = len(self._musicas)
+        # Conferir um resultado anterior custa ~3x por música (precisa achar o doc);
+        # quando não compensa, a busca pelo índice dá o mesmo resultado
+        if len(musicas) * _CUSTO_REFINAR >= candidatos:
+            return self.buscar(termo, campos)
+
+        campos = self.campos if campos is None else tuple(campos)
+        posicoes = [self.campos.index(campo) for campo in campos]
+        docs = self._docs
+
+        # Músicas removidas depois da busca anterior não têm doc (-1) e são descartadas
+        if len(posicoes) == len(self.campos):
+            unidos = self._unidos
+            return [musica for musica in musicas
+                    if termo in unidos.get(docs.get(id(musica), -1), '')]
+
+        textos = self._textos
+        vazio = ('',) * len(self.campos)
+        return [musica for musica in musicas
+                if any(termo in textos.get(docs.get(id(musica), -1), vazio)[p] for p in posicoes)]
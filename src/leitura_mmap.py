@@ -0,0 +1,254 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Leitura somente-leitura do playlist.txt via mmap.
+
+O arquivo é mapeado na memória e um índice com o deslocamento (em bytes)
+de cada linha válida é construído uma vez e salvo em "playlist.txt.idx".
+O índice é invalidado quando o tamanho ou a data de modificação do arquivo
+mudam. Só as linhas efetivamente exibidas ou encontradas são decodificadas.
+
+Nada é gravado no playlist.txt: se o diário tiver alterações ainda não
+incorporadas (o programa foi interrompido), elas são reaplicadas em
+memória sobre todas as linhas, e o acesso passa a ser por essa lista.
+
+As buscas procuram o termo nos bytes (em blocos, com lower() ASCII) e só
+decodificam as linhas candidatas. Em uma linha só com ASCII, dobrar o
+texto (normalizacao.dobrar_texto) equivale a lower(), então o termo
+precisa aparecer nos bytes. Linhas com bytes não-ASCII são sempre
+decodificadas e conferidas, pois acentos mudam com a dobra ("Beyoncé"
+contém "beyonce"). A busca por substring segue a regra da Biblioteca
+(IndiceBusca: sem maiúsculas nem acentos) e a exata a de
+Biblioteca.buscar_exato (casefold).
+"""
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_right
+
+from diario import aplicar_operacoes, ler_marcador, ler_operacoes
+from normalizacao import dobrar_texto
+from track import CAMPOS, Track
+
+
+# Cabeçalho do índice: assinatura, tamanho e mtime do arquivo, quantidade de linhas
+_ASSINATURA_INDICE = b'PLIDX1\0\0'
+_CABECALHO_INDICE = struct.Struct('<8sQQQ')
+
+# Tamanho aproximado dos blocos varridos nas buscas
+TAMANHO_BLOCO = 8 * 1024 * 1024
+
+_NAO_ASCII = re.compile(rb'[\x80-\xff]')
+
+
+def caminho_indice(nome_arquivo):
+    """Retorna o caminho do índice de linhas associado ao arquivo"""
+    return str(nome_arquivo) + '.idx'
+
+
+class PlaylistSomenteLeitura:
+    """Playlist mapeada em memória, com acesso às linhas sob demanda"""
+
+    def __init__(self, nome_arquivo):
+        self.nome_arquivo = str(nome_arquivo)
+        self._arquivo = open(self.nome_arquivo, 'rb')
+        info = os.fstat(self._arquivo.fileno())
+        self._assinatura = (info.st_size, info.st_mtime_ns)
+        if info.st_size:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mapa = b''  # mmap não aceita arquivos vazios
+
+        self._offsets = self._carregar_indice()
+        if self._offsets is None:
+            self._offsets = self._construir_indice()
+            self._salvar_indice()
+
+        # Alterações do diário ainda fora do arquivo: reaplicadas só em memória
+        self._musicas = None
+        operacoes = ler_operacoes(self.nome_arquivo, depois_de=ler_marcador(self.nome_arquivo))
+        if operacoes:
+            print(f">> Aviso: {len(operacoes)} alteração(ões) do diário ainda não estão no "
+                  f"arquivo; abra a playlist no modo normal para incorporá-las")
+            linhas = [self._decodificar(linha) for linha in range(len(self._offsets))]
+            self._musicas = aplicar_operacoes(linhas, operacoes)
+
+    # ===== Índice de linhas =====
+
+    def _construir_indice(self):
+        """Percorre o arquivo uma vez registrando o início de cada linha válida"""
+        offsets = array('Q')
+        posicao = 0
+        self._arquivo.seek(0)
+        for linha in self._arquivo:
+            if linha.count(b';') == len(CAMPOS) - 1:
+                offsets.append(posicao)
+            posicao += len(linha)
+        return offsets
+
+    def _carregar_indice(self):
+        try:
+            with open(caminho_indice(self.nome_arquivo), 'rb') as arquivo:
+                assinatura, tamanho, mtime, total = _CABECALHO_INDICE.unpack(
+                    arquivo.read(_CABECALHO_INDICE.size))
+                if assinatura != _ASSINATURA_INDICE or (tamanho, mtime) != self._assinatura:
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(arquivo, total)
+                return offsets
+        except (FileNotFoundError, struct.error, EOFError):
+            return None
+
+    def _salvar_indice(self):
+        destino = caminho_indice(self.nome_arquivo)
+        temporario = destino + '.tmp'
+        try:
+            with open(temporario, 'wb') as arquivo:
+                arquivo.write(_CABECALHO_INDICE.pack(_ASSINATURA_INDICE, *self._assinatura,
+                                                     len(self._offsets)))
+                self._offsets.tofile(arquivo)
+            os.replace(temporario, destino)
+        except OSError as e:
+            # Sem permissão de escrita o índice só não é reaproveitado
+            print(f">> Aviso: não foi possível salvar o índice de linhas: {e}")
+
+    # ===== Acesso às linhas =====
+
+    def __len__(self):
+        if self._musicas is not None:
+            return len(self._musicas)
+        return len(self._offsets)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def _decodificar(self, linha):
+        inicio = self._offsets[linha]
+        fim = self._mapa.find(b'\n', inicio)
+        if fim < 0:
+            fim = len(self._mapa)
+        dados = self._mapa[inicio:fim].decode('utf-8').strip().split(';')
+        return Track(*dados)
+
+    def __getitem__(self, linha):
+        if linha < 0:
+            linha += len(self)
+        if not 0 <= linha < len(self):
+            raise IndexError("linha fora da playlist")
+        if self._musicas is not None:
+            return self._musicas[linha]
+        return self._decodificar(linha)
+
+    def __iter__(self):
+        if self._musicas is not None:
+            yield from self._musicas
+            return
+        for linha in range(len(self)):
+            yield self._decodificar(linha)
+
+    def pagina(self, inicio, quantidade):
+        """
+        Decodifica apenas as linhas de uma página.
+
+        Args:
+            inicio (int): Primeira linha (0-based)
+            quantidade (int): Número máximo de linhas
+
+        Returns:
+            list: Músicas da página
+        """
+        fim = min(len(self), inicio + quantidade)
+        if self._musicas is not None:
+            return self._musicas[inicio:fim]
+        return [self._decodificar(linha) for linha in range(inicio, fim)]
+
+    # ===== Buscas =====
+
+    def _linhas_candidatas(self, termo):
+        """Linhas que podem conter o termo (já dobrado ou em casefold), em ordem crescente"""
+        agulha = termo.encode('utf-8') if termo.isascii() else None
+        candidatas = set()
+        total = len(self._mapa)
+        inicio = 0
+
+        while inicio < total:
+            fim = self._mapa.rfind(b'\n', inicio, inicio + TAMANHO_BLOCO) + 1
+            if fim <= inicio:
+                # Linha maior que o bloco: vai até o próximo \n
+                fim = self._mapa.find(b'\n', inicio + TAMANHO_BLOCO) + 1 or total
+            bloco = self._mapa[inicio:fim]
+
+            posicoes = [m.start() for m in _NAO_ASCII.finditer(bloco)]
+            if agulha is not None:
+                minusculo = bloco.lower()
+                posicao = minusculo.find(agulha)
+                while posicao >= 0:
+                    posicoes.append(posicao)
+                    posicao = minusculo.find(agulha, posicao + 1)
+
+            for posicao in posicoes:
+                linha = bisect_right(self._offsets, inicio + posicao) - 1
+                if linha >= 0:
+                    candidatas.add(linha)
+            inicio = fim
+
+        return sorted(candidatas)
+
+    def _musicas_candidatas(self, termo):
+        """Músicas que podem conter o termo (todas, se o diário foi reaplicado em memória)"""
+        if self._musicas is not None:
+            return self._musicas
+        return map(self._decodificar, self._linhas_candidatas(termo))
+
+    def buscar(self, termo, campos=None):
+        """
+        Busca por substring sem diferenciar maiúsculas nem acentos (como Biblioteca.buscar).
+
+        Args:
+            termo (str): Substring procurada
+            campos (iterable): Campos pesquisados (padrão: titulo, artista, album, genero)
+
+        Returns:
+            list: Músicas encontradas, na ordem do arquivo
+        """
+        campos = tuple(campos or ('titulo', 'artista', 'album', 'genero'))
+        termo = dobrar_texto(termo)
+        if not termo:
+            return list(self)
+
+        encontradas = []
+        for musica in self._musicas_candidatas(termo):
+            if any(termo in musica.dobrado(campo) for campo in campos):
+                encontradas.append(musica)
+        return encontradas
+
+    def buscar_exato(self, campo, valor):
+        """Músicas com campo igual ao valor (casefold, como Biblioteca.buscar_exato), na ordem do arquivo"""
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        chave = str(valor).casefold()
+        if not chave:
+            return [musica for musica in self if not musica[campo]]
+
+        encontradas = []
+        for musica in self._musicas_candidatas(chave):
+            if musica[campo].casefold() == chave:
+                encontradas.append(musica)
+        return encontradas
+
+    def fechar(self):
+        """Desfaz o mapeamento e fecha o arquivo"""
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
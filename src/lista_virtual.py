@@ -0,0 +1,175 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Lista virtualizada para tkinter.
+
+Em vez de criar um conjunto de widgets por item (o que trava a janela com
+dezenas de milhares de músicas), a lista mantém um pequeno conjunto de
+widgets reaproveitáveis: só os itens da área visível, mais alguns acima e
+abaixo (overscan), têm widgets. O canvas rola sobre uma região com a altura
+de todos os itens e, a cada rolagem, os widgets que saíram da tela são
+reposicionados e preenchidos com os itens que entraram.
+"""
+import tkinter as tk
+
+
+# Itens extras (acima e abaixo da área visível) mantidos prontos para a rolagem
+OVERSCAN = 3
+
+# Pixels rolados por "unidade" (roda do mouse, setas da barra)
+INCREMENTO_ROLAGEM = 20
+
+
+class ListaVirtual:
+    """Lista rolável que só cria widgets para os itens visíveis e os recicla"""
+
+    def __init__(self, canvas, scrollbar, altura_item, criar_item, preencher_item,
+                 overscan=OVERSCAN, espaco=6, ao_rolar=None):
+        """
+        Args:
+            canvas (tk.Canvas): Canvas onde os itens são desenhados
+            scrollbar (ttk.Scrollbar): Barra de rolagem vertical do canvas
+            altura_item (int): Altura fixa (px) de cada item, incluindo o espaço
+            criar_item (callable): criar_item(canvas) -> widget novo (vazio)
+            preencher_item (callable): preencher_item(widget, item, indice)
+            overscan (int): Itens extras acima e abaixo da área visível
+            espaco (int): Espaço vertical (px) entre os itens
+            ao_rolar (callable): ao_rolar(topo), chamado a cada renderização com o
+                índice do primeiro item visível
+        """
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.altura_item = altura_item
+        self.overscan = overscan
+        self.espaco = espaco
+        self._criar_item = criar_item
+        self._preencher_item = preencher_item
+        self._ao_rolar_callback = ao_rolar
+
+        self.itens = []
+        self._janelas = []   # ids das janelas do canvas, um por widget reaproveitável
+        self._widgets = []
+        self._exibidos = []  # (índice, item) exibido em cada widget (None = escondido)
+
+        self._mensagem = canvas.create_text(0, 0, anchor='n', state='hidden',
+                                            fill='#ffffff', font=('Arial', 12),
+                                            justify='center')
+
+        canvas.configure(yscrollcommand=self._ao_rolar, yscrollincrement=INCREMENTO_ROLAGEM)
+        scrollbar.configure(command=canvas.yview)
+        canvas.bind('<Configure>', self._ao_redimensionar)
+
+    def definir_itens(self, itens, mensagem_vazia='', manter_posicao=False, recarregar=False):
+        """
+        Troca os itens exibidos.
+
+        Só os widgets cujo item mudou (outro objeto na mesma posição) são
+        preenchidos de novo, então trocar por uma lista parecida (ex.: uma
+        busca refinada) atualiza apenas a diferença.
+
+        Args:
+            itens (sequence): Itens (com len e acesso por índice); não é copiado
+            mensagem_vazia (str): Texto exibido quando não houver itens
+            manter_posicao (bool): Mantém a rolagem atual (ex.: mais itens carregados)
+            recarregar (bool): Preenche de novo todos os widgets (os itens foram editados)
+        """
+        self.itens = itens
+        if recarregar:
+            self._exibidos = [None] * len(self._widgets)
+        self._atualizar_regiao()
+        if not manter_posicao:
+            self.canvas.yview_moveto(0)
+
+        largura = self.canvas.winfo_width()
+        self.canvas.coords(self._mensagem, largura // 2, 50)
+        self.canvas.itemconfigure(self._mensagem, text=mensagem_vazia,
+                                  state='hidden' if itens else 'normal')
+        self.renderizar()
+
+    def atualizar(self):
+        """Preenche de novo os itens visíveis (os dados mudaram, a lista não)"""
+        self.definir_itens(self.itens, self.canvas.itemcget(self._mensagem, 'text'),
+                           manter_posicao=True, recarregar=True)
+
+    def _atualizar_regiao(self):
+        altura = max(len(self.itens) * self.altura_item, 1)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), altura))
+
+    def _ao_rolar(self, primeiro, ultimo):
+        self.scrollbar.set(primeiro, ultimo)
+        self.renderizar()
+
+    def _ao_redimensionar(self, event):
+        for janela in self._janelas:
+            self.canvas.itemconfigure(janela, width=event.width)
+        self.canvas.coords(self._mensagem, event.width // 2, 50)
+        self._atualizar_regiao()
+        self.renderizar()
+
+    def _garantir_widgets(self):
+        """Cria widgets até cobrir a altura visível mais o overscan"""
+        visiveis = self.canvas.winfo_height() // self.altura_item + 2
+        necessarios = visiveis + 2 * self.overscan
+        if len(self._widgets) >= necessarios:
+            return
+        largura = self.canvas.winfo_width()
+        while len(self._widgets) < necessarios:
+            widget = self._criar_item(self.canvas)
+            janela = self.canvas.create_window(0, -self.altura_item, window=widget, anchor='nw',
+                                               width=largura,
+                                               height=self.altura_item - self.espaco)
+            self._widgets.append(widget)
+            self._janelas.append(janela)
+        # Com outro número de widgets a distribuição muda: preenche tudo de novo
+        self._exibidos = [None] * len(self._widgets)
+
+    def renderizar(self):
+        """Posiciona e preenche os widgets dos itens da área visível"""
+        self._garantir_widgets()
+        total = len(self._widgets)
+        if not total:
+            return
+
+        topo = int(self.canvas.canvasy(0)) // self.altura_item
+        if self._ao_rolar_callback is not None:
+            self._ao_rolar_callback(topo)
+        primeiro = max(0, topo - self.overscan)
+        ultimo = min(len(self.itens), primeiro + total)
+
+        # Cada item usa sempre o widget indice % total: ao rolar uma linha,
+        # só o widget que saiu da tela é preenchido de novo
+        usados = set()
+        for indice in range(primeiro, ultimo):
+            posicao = indice % total
+            usados.add(posicao)
+            item = self.itens[indice]
+            exibido = self._exibidos[posicao]
+            if exibido is None or exibido[0] != indice or exibido[1] is not item:
+                self._preencher_item(self._widgets[posicao], item, indice)
+                self.canvas.coords(self._janelas[posicao], 0, indice * self.altura_item)
+                self._exibidos[posicao] = (indice, item)
+
+        for posicao in range(total):
+            if posicao not in usados and self._exibidos[posicao] is not None:
+                # Fora da região rolável: nunca aparece
+                self.canvas.coords(self._janelas[posicao], 0, -self.altura_item)
+                self._exibidos[posicao] = None
+
+    def contem(self, widget):
+        """True se o widget está dentro do canvas da lista (ex.: para a roda do mouse)"""
+        while widget is not None:
+            if widget is self.canvas:
+                return True
+            widget = widget.master
+        return False
+
+
+def widget_sob_ponteiro(widget, x_root, y_root):
+    """Widget sob a posição da tela (None se fora da aplicação)"""
+    try:
+        return widget.winfo_containing(x_root, y_root)
+    except (KeyError, tk.TclError):
+        return None
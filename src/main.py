@@ -4,60 +4,109 @@ Leonardo Ferreira
 Heloi Vecchi Sgarbi
 Kaua Schiavolin Monteiro
 """
+import sys
 from pathlib import Path
 
+from track import Track
+from biblioteca import Biblioteca
+from consulta import ErroConsulta
+from estatisticas import GRUPOS
+from diario import (aplicar_operacoes, escrever_atomico, ler_marcador,
+                    ler_operacoes, ultima_sequencia)
+from leitura_mmap import PlaylistSomenteLeitura
+from snapshot import carregar_tabela, salvar_snapshot
+from enriquecimento import EnriquecedorLote, musica_incompleta, resumo_proposta
+from duplicatas import detectar_duplicatas, resumo_mesclagem
+
+# Linhas exibidas no relatório agrupado (os valores mais frequentes)
+LIMITE_RELATORIO_AGRUPADO = 50
+
+# Títulos sugeridos quando o título digitado não é encontrado
+MAXIMO_SUGESTOES = 5
+
+def _linha_para_musica(linha):
+    # Converte uma linha no formato Titulo;Artista;Album;Genero;Ano em Track.
+    # Track usa __slots__ e aceita acesso por chave como um dicionário.
+    # Retorna None se a linha não tiver exatamente os 5 campos.
+    dados = linha.strip().split(';')
+    if len(dados) != 5:  # Valida que tem os 5 campos
+        return None
+    return Track(*dados)
+
+
+def ler_musicas(nome_arquivo="playlist.txt"):
+    # Lê a playlist de forma incremental (gerador).
+    # Cada música é criada apenas quando o consumidor pede a próxima,
+    # então a listagem, os filtros e a GUI podem começar a trabalhar
+    # nas primeiras linhas antes de o arquivo inteiro ser lido.
+    # Se o arquivo não existir, levanta FileNotFoundError na primeira iteração.
+    with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            musica = _linha_para_musica(linha)
+            if musica is not None:
+                yield musica
+
+
+def ler_musicas_em_lotes(nome_arquivo="playlist.txt", tamanho_lote=1000):
+    # Lê a playlist em lotes de tamanho fixo (listas de até tamanho_lote músicas).
+    # Útil para processar arquivos grandes em blocos sem carregar tudo na memória.
+    if tamanho_lote < 1:
+        raise ValueError("tamanho_lote deve ser maior que zero")
+
+    lote = []
+    for musica in ler_musicas(nome_arquivo):
+        lote.append(musica)
+        if len(lote) == tamanho_lote:
+            yield lote
+            lote = []
+
+    # Entrega o último lote incompleto, se houver
+    if lote:
+        yield lote
+
+
 def carregar_dados(nome_arquivo="playlist.txt"):
     # Carrega os dados da playlist a partir de um arquivo de texto.
-    # Retorna uma lista de dicionários com as músicas.
+    # Retorna uma lista de músicas (Track, com acesso por chave como dicionário).
     # Se o arquivo não existir, retorna uma lista vazia.
-    try:
-        # Tenta abrir o arquivo em modo de leitura
-        with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
-            # LISTA vazia para armazenar as músicas
+    # Alterações registradas no diário após a última compactação são reaplicadas.
+    # Se houver um snapshot binário do mesmo playlist.txt, o texto não é relido.
+    tabela = carregar_tabela(nome_arquivo)
+    if tabela is not None:
+        playlist = list(tabela)
+    else:
+        try:
+            # Materializa o gerador em uma LISTA
+            playlist = list(ler_musicas(nome_arquivo))
+        except FileNotFoundError:
+            # Se o arquivo não existir, inicia com LISTA vazia
+            print(">> Arquivo não encontrado. Iniciando com lista vazia.")
             playlist = []
+        else:
+            # Próximas aberturas partem do snapshot
+            salvar_snapshot(nome_arquivo, playlist)
 
-            # Lê cada linha do arquivo e adiciona à LISTA
-            for linha in arquivo:
-                # Remove espaços em branco e divide pelos separadores
-                dados = linha.strip().split(';')
-
-                # Cria um dicionário com os dados da música e adiciona à LISTA
-                if len(dados) == 5:  # Valida que tem os 5 campos
-                    musica = {
-                        'titulo': dados[0],
-                        'artista': dados[1],
-                        'album': dados[2],
-                        'genero': dados[3],
-                        'ano': dados[4]
-                    }
-                    # Usa append() para adicionar à LISTA
-                    playlist.append(musica)
-
-            print(f">> {len(playlist)} música(s) carregada(s) na lista")
-            return playlist
+    # Reaplica o diário de alterações (add/edit/del) ainda não compactado
+    operacoes = ler_operacoes(nome_arquivo, depois_de=ler_marcador(nome_arquivo))
+    if operacoes:
+        playlist = aplicar_operacoes(playlist, operacoes)
+        print(f">> {len(operacoes)} alteração(ões) recuperada(s) do diário")
 
-    except FileNotFoundError:
-        # Se o arquivo não existir, inicia com LISTA vazia
-        print(">> Arquivo não encontrado. Iniciando com lista vazia.")
-        return []  # Retorna LISTA vazia
+    print(f">> {len(playlist)} música(s) carregada(s) na lista")
+    return playlist
 
 
 def salvar_dados(playlist, nome_arquivo="playlist.txt"):
     # Salva a playlist em um arquivo de texto.
     # Formato: Titulo;Artista;Album;Genero;Ano
-    # Garante pasta de destino
-    Path(nome_arquivo).parent.mkdir(parents=True, exist_ok=True)
-
-    # Abre o arquivo em modo de escrita
-    with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
-        # Itera sobre cada elemento da LISTA (cada música)
-        for musica in playlist:
-            # Formata a linha no formato especificado
-            linha = f"{musica['titulo']};{musica['artista']};{musica['album']};{musica['genero']};{musica['ano']}\n"
-            arquivo.write(linha)
+    # Grava em um arquivo temporário e renomeia por cima do original,
+    # então uma interrupção no meio da gravação nunca trunca a playlist.
+    # O marcador do diário é atualizado: a LISTA salva passa a ser o estado oficial.
+    total = escrever_atomico(nome_arquivo, playlist, ultima_sequencia(nome_arquivo))
+    salvar_snapshot(nome_arquivo, playlist)
 
     # Usa len() para obter tamanho da LISTA
-    print(f">> Playlist salva com sucesso! ({len(playlist)} música(s) na lista)")
+    print(f">> Playlist salva com sucesso! ({total} música(s) na lista)")
 
 
 def exibir_menu():
@@ -71,12 +120,14 @@ def exibir_menu():
     print("4. Editar Música")
     print("5. Remover Música")
     print("6. Gerar Relatório")
-    print("7. Salvar e Sair")
+    print("7. Completar Dados (API)")
+    print("8. Encontrar Duplicatas")
+    print("9. Salvar e Sair")
     print("="*50)
 
 
 def adicionar_musica(playlist):
-    # Adiciona uma nova música à playlist.
+    # Adiciona uma nova música à playlist (Biblioteca).
     # Título e Artista são campos obrigatórios.
     print("\n" + "="*50)
     print("         ADICIONAR NOVA MÚSICA")
@@ -95,16 +146,10 @@ def adicionar_musica(playlist):
     genero = input("Gênero (opcional): ").strip() or "Desconhecido"
     ano = input("Ano (opcional): ").strip() or "----"
 
-    # Cria o dicionário da nova música
-    nova_musica = {
-        'titulo': titulo,
-        'artista': artista,
-        'album': album,
-        'genero': genero,
-        'ano': ano
-    }
+    # Cria a nova música (Track: campos fixos, acesso por chave)
+    nova_musica = Track(titulo, artista, album, genero, ano)
 
-    # OPERAÇÃO: append() - adiciona ao final da lista
+    # OPERAÇÃO: append() - adiciona ao final da lista (e aos índices)
     playlist.append(nova_musica)
 
     print(f"\n>> Música adicionada com sucesso!")
@@ -117,14 +162,20 @@ def listar_musicas(playlist):
     print("         LISTA DE MÚSICAS")
     print("="*50)
 
+    # Aceita também um gerador (ex.: ler_musicas), que não tem len():
+    # nesse caso a listagem começa imediatamente e o total é exibido no final
+    tem_tamanho = hasattr(playlist, '__len__')
+
     # OPERAÇÃO: len() - verifica tamanho da LISTA
-    if len(playlist) == 0:
-        print(">> Nenhuma música na lista.")
-        return
+    if tem_tamanho:
+        if len(playlist) == 0:
+            print(">> Nenhuma música na lista.")
+            return
 
-    print(f"Total: {len(playlist)} música(s) na lista\n")
+        print(f"Total: {len(playlist)} música(s) na lista\n")
 
     # OPERAÇÃO: enumerate() - itera com índice automaticamente
+    i = 0
     for i, musica in enumerate(playlist, 1):
         print(f"{i}. {musica['titulo']}")
         print(f"   Artista: {musica['artista']}")
@@ -133,9 +184,45 @@ def listar_musicas(playlist):
         print(f"   Ano: {musica['ano']}")
         print("-" * 50)
 
+    if not tem_tamanho:
+        if i == 0:
+            print(">> Nenhuma música na lista.")
+        else:
+            print(f"Total: {i} música(s) listada(s)")
+
+
+def listar_paginado(playlist, tamanho_pagina=20):
+    # Lista a playlist página por página.
+    # Com PlaylistSomenteLeitura, só as linhas da página são decodificadas.
+    print("\n" + "="*50)
+    print("         LISTA DE MÚSICAS (PAGINADA)")
+    print("="*50)
+
+    total = len(playlist)
+    if total == 0:
+        print(">> Nenhuma música na lista.")
+        return
+
+    print(f"Total: {total} música(s) na lista\n")
+
+    inicio = 0
+    while inicio < total:
+        for i, musica in enumerate(playlist.pagina(inicio, tamanho_pagina), inicio + 1):
+            print(f"{i}. {musica['titulo']}")
+            print(f"   {musica['artista']} | {musica['album']}")
+            print(f"   {musica['genero']} | {musica['ano']}")
+            print("-" * 50)
+
+        inicio += tamanho_pagina
+        if inicio < total:
+            resposta = input(f">> {inicio} de {total}. Enter para continuar, S para sair: ").strip()
+            if resposta.upper() == 'S':
+                break
+
 
 def buscar_musica(playlist):
     # Busca músicas por título
+    # Usa o índice de n-gramas da Biblioteca em vez de varrer a lista.
     print("\n" + "="*50)
     print("         BUSCAR MÚSICA")
     print("="*50)
@@ -143,15 +230,20 @@ def buscar_musica(playlist):
     termo_busca = input("Digite o título da música: ").strip()
 
     # Filtra músicas que contêm o termo no título
-    musicas_encontradas = [
-        musica for musica in playlist
-        if termo_busca.lower() in musica['titulo'].lower()
-    ]
+    musicas_encontradas = playlist.buscar(termo_busca, campos=('titulo',))
+
+    # Sem resultado: tenta a busca tolerante a erros de digitação (não disponível no modo mmap)
+    aproximadas = False
+    if not musicas_encontradas and hasattr(playlist, 'buscar_aproximado'):
+        musicas_encontradas = playlist.buscar_aproximado(termo_busca, campos=('titulo',))
+        aproximadas = True
 
     # Exibe os resultados
     if not musicas_encontradas:
         print(f">> Nenhuma música encontrada com '{termo_busca}'")
     else:
+        if aproximadas:
+            print(f">> Nenhuma música contém '{termo_busca}'. Títulos parecidos (do mais próximo):")
         print(f"\n>> {len(musicas_encontradas)} música(s) encontrada(s) na lista:\n")
         for i, musica in enumerate(musicas_encontradas, 1):
             print(f"{i}. {musica['titulo']}")
@@ -160,6 +252,23 @@ def buscar_musica(playlist):
             print("-" * 50)
 
 
+def _escolher_parecida(playlist, titulo_busca):
+    # Sugere os títulos mais parecidos com o digitado (busca tolerante a erros
+    # de digitação, ex.: "Reminsce" -> "Reminisce") e deixa o usuário escolher.
+    # Retorna a música escolhida ou None (sem sugestões ou escolha cancelada).
+    sugestoes = playlist.buscar_aproximado(titulo_busca, campos=('titulo',))[:MAXIMO_SUGESTOES]
+    if not sugestoes:
+        return None
+
+    print(">> Você quis dizer:")
+    for i, musica in enumerate(sugestoes, 1):
+        print(f"{i}. {musica['titulo']} - {musica['artista']}")
+    escolha = input(f"\nEscolha uma música (1-{len(sugestoes)}) ou Enter para cancelar: ").strip()
+    if escolha.isdigit() and 1 <= int(escolha) <= len(sugestoes):
+        return sugestoes[int(escolha) - 1]
+    return None
+
+
 def editar_musica(playlist):
     # Edita os dados de uma música existente.
     # Busca pela música pelo título e permite editar todos os campos.
@@ -168,22 +277,18 @@ def editar_musica(playlist):
     print("="*50)
 
     titulo_busca = input("Digite o título da música a ser editada: ").strip()
-    musica_encontrada = None
-    indice = -1
 
-    # enumerate para obter índice e elemento
-    for i, musica in enumerate(playlist):
-        if titulo_busca.lower() == musica['titulo'].lower():
-            musica_encontrada = musica
-            indice = i
-            break
+    # Busca no índice exato de títulos (sem diferenciar maiúsculas), O(1)
+    musica_encontrada = playlist.primeiro('titulo', titulo_busca)
 
     if not musica_encontrada:
         print(f">> Música '{titulo_busca}' não encontrada na lista.")
-        return
+        musica_encontrada = _escolher_parecida(playlist, titulo_busca)
+        if not musica_encontrada:
+            return
 
     # Exibe os dados atuais
-    print(f"\n>> Dados atuais (posição {indice} na lista):")
+    print(f"\n>> Dados atuais:")
     print(f"   Título: {musica_encontrada['titulo']}")
     print(f"   Artista: {musica_encontrada['artista']}")
     print(f"   Álbum: {musica_encontrada['album']}")
@@ -197,14 +302,17 @@ def editar_musica(playlist):
     novo_genero = input(f"Novo Gênero [{musica_encontrada['genero']}]: ").strip()
     novo_ano = input(f"Novo Ano [{musica_encontrada['ano']}]: ").strip()
 
-    # Atualiza elemento na lista
-    playlist[indice]['titulo'] = novo_titulo if novo_titulo else musica_encontrada['titulo']
-    playlist[indice]['artista'] = novo_artista if novo_artista else musica_encontrada['artista']
-    playlist[indice]['album'] = novo_album if novo_album else musica_encontrada['album']
-    playlist[indice]['genero'] = novo_genero if novo_genero else musica_encontrada['genero']
-    playlist[indice]['ano'] = novo_ano if novo_ano else musica_encontrada['ano']
+    # Atualiza elemento na lista (a Biblioteca mantém os índices consistentes)
+    playlist.atualizar(
+        musica_encontrada,
+        titulo=novo_titulo if novo_titulo else musica_encontrada['titulo'],
+        artista=novo_artista if novo_artista else musica_encontrada['artista'],
+        album=novo_album if novo_album else musica_encontrada['album'],
+        genero=novo_genero if novo_genero else musica_encontrada['genero'],
+        ano=novo_ano if novo_ano else musica_encontrada['ano']
+    )
 
-    print(f"\n>> Música na posição {indice} atualizada com sucesso na lista!")
+    print(f"\n>> Música atualizada com sucesso na lista!")
 
 
 def remover_musica(playlist):
@@ -214,22 +322,18 @@ def remover_musica(playlist):
     print("="*50)
 
     titulo_busca = input("Digite o título da música a ser removida: ").strip()
-    musica_encontrada = None
-    indice = -1
 
-    # Procura pela música (correspondência exata)
-    for i, musica in enumerate(playlist):
-        if titulo_busca.lower() == musica['titulo'].lower():
-            musica_encontrada = musica
-            indice = i
-            break
+    # Procura pela música (correspondência exata, via índice de títulos)
+    musica_encontrada = playlist.primeiro('titulo', titulo_busca)
 
     if not musica_encontrada:
         print(f">> Música '{titulo_busca}' não encontrada na lista.")
-        return
+        musica_encontrada = _escolher_parecida(playlist, titulo_busca)
+        if not musica_encontrada:
+            return
 
     # Exibe os dados da música
-    print(f"\n>> Música encontrada (posição {indice} na lista):")
+    print(f"\n>> Música encontrada:")
     print(f"   Título: {musica_encontrada['titulo']}")
     print(f"   Artista: {musica_encontrada['artista']}")
     print(f"   Álbum: {musica_encontrada['album']}")
@@ -240,7 +344,7 @@ def remover_musica(playlist):
     confirmacao = input("\n>> Tem certeza que deseja remover esta música? (S/N): ").strip()
 
     if confirmacao.upper() == 'S':
-        # OPERAÇÃO: remove() - remove elemento da lista
+        # OPERAÇÃO: remove() - marca uma lápide, sem deslocar a lista
         playlist.remove(musica_encontrada)
         print(f"\n>> Música removida com sucesso da lista!")
         print(f">> Total de músicas restantes: {len(playlist)}")
@@ -260,9 +364,16 @@ def gerar_relatorio(playlist):
     print("3. Álbum")
     print("4. Gênero")
     print("5. Ano")
+    # Consultas compostas e agrupamentos usam os índices e contadores da
+    # Biblioteca (não disponíveis no modo mmap)
+    consulta_disponivel = hasattr(playlist, 'consultar')
+    ultima_opcao = 7 if consulta_disponivel else 5
+    if consulta_disponivel:
+        print("6. Consulta avançada (ex.: genero = rock E ano ENTRE 1980 E 1990)")
+        print("7. Relatório agrupado (músicas por artista, gênero, ano...)")
 
     try:
-        opcao_filtro = int(input("\nEscolha uma opção (1-5): ").strip())
+        opcao_filtro = int(input(f"\nEscolha uma opção (1-{ultima_opcao}): ").strip())
 
         # Define qual campo será usado para o filtro
         if opcao_filtro == 1:
@@ -280,48 +391,216 @@ def gerar_relatorio(playlist):
         elif opcao_filtro == 5:
             campo = 'ano'
             nome_campo = 'Ano'
+        elif opcao_filtro == 6 and consulta_disponivel:
+            relatorio_consulta(playlist)
+            return
+        elif opcao_filtro == 7 and consulta_disponivel:
+            relatorio_agrupado(playlist)
+            return
         else:
-            print(">> Opção inválida. Escolha de 1 a 5.")
+            print(f">> Opção inválida. Escolha de 1 a {ultima_opcao}.")
             return
 
         # Solicita o valor para filtrar
         valor_busca = input(f"Digite o {nome_campo} para filtrar: ").strip()
 
-        # LIST COMPREHENSION: Filtra músicas pelo campo escolhido
-        musicas_encontradas = [
-            musica for musica in playlist
-            if valor_busca.lower() == musica[campo].lower()
-        ]
+        # Filtra músicas pelo campo escolhido usando o índice hash do campo
+        musicas_encontradas = playlist.buscar_exato(campo, valor_busca)
 
         # Exibe o relatório
         if not musicas_encontradas:
             print(f"\n>> Nenhuma música encontrada para {nome_campo}: {valor_busca}")
         else:
-            print(f"\n" + "="*50)
-            print(f"         RELATÓRIO: {nome_campo} = {valor_busca}")
-            print("="*50)
-            print(f"Total: {len(musicas_encontradas)} música(s) na lista filtrada\n")
-
-            for i, musica in enumerate(musicas_encontradas, 1):
-                print(f"{i}. {musica['titulo']}")
-                print(f"   {musica['artista']} | {musica['album']}")
-                print(f"   {musica['genero']} | {musica['ano']}")
-                print("-" * 50)
+            _exibir_relatorio(f"{nome_campo} = {valor_busca}", musicas_encontradas)
 
     except ValueError:
         print(">> Opção inválida. Digite um número.")
 
 
+def _exibir_relatorio(descricao, musicas):
+    # Imprime as músicas filtradas de um relatório
+    print(f"\n" + "="*50)
+    print(f"         RELATÓRIO: {descricao}")
+    print("="*50)
+    print(f"Total: {len(musicas)} música(s) na lista filtrada\n")
+
+    for i, musica in enumerate(musicas, 1):
+        print(f"{i}. {musica['titulo']}")
+        print(f"   {musica['artista']} | {musica['album']}")
+        print(f"   {musica['genero']} | {musica['ano']}")
+        print("-" * 50)
+
+
+def relatorio_agrupado(playlist):
+    # Relatório agrupado: quantas músicas há por artista, álbum, gênero,
+    # ano ou década. Os contadores são mantidos pela Biblioteca a cada
+    # alteração, então o relatório não percorre a playlist.
+    grupos = list(GRUPOS.items())
+    print()
+    for numero, (_, nome) in enumerate(grupos, 1):
+        print(f"{numero}. Por {nome}")
+    opcao = int(input(f"\nAgrupar por (1-{len(grupos)}): ").strip())
+    if not 1 <= opcao <= len(grupos):
+        print(f">> Opção inválida. Escolha de 1 a {len(grupos)}.")
+        return
+    grupo, nome = grupos[opcao - 1]
+
+    estatisticas = playlist.estatisticas()
+    # Anos e décadas em ordem cronológica; os demais do mais frequente ao menos
+    linhas = estatisticas.agrupar(grupo, por_valor=grupo in ('ano', 'decada'))
+
+    print(f"\n" + "="*50)
+    print(f"         RELATÓRIO: músicas por {nome}")
+    print("="*50)
+    print(f"Total: {len(playlist)} música(s), {estatisticas.distintos(grupo)} valor(es) distinto(s)\n")
+    for valor, contagem in linhas[:LIMITE_RELATORIO_AGRUPADO]:
+        print(f"{valor or '(sem valor)':<40} {contagem:>6} música(s)")
+    if len(linhas) > LIMITE_RELATORIO_AGRUPADO:
+        print(f"... e mais {len(linhas) - LIMITE_RELATORIO_AGRUPADO} valor(es)")
+
+
+def relatorio_consulta(playlist):
+    # Relatório por consulta composta (ver consulta.py): condições sobre
+    # os campos combinadas com E / OU / NAO e parênteses.
+    print("\nOperadores: = (igual)  != (diferente)  ~ (contém)  ^ (começa com)")
+    print("            REGEX  < <= > >=  ENTRE a E b (ano)")
+    print("Exemplo: (artista ~ beatles OU artista ~ stones) E ano ENTRE 1965 E 1970")
+    texto = input("Consulta: ").strip()
+
+    try:
+        musicas_encontradas = playlist.consultar(texto)
+    except ErroConsulta as e:
+        print(f">> Consulta inválida: {e}")
+        return
+
+    if not musicas_encontradas:
+        print(f"\n>> Nenhuma música encontrada para: {texto}")
+    else:
+        _exibir_relatorio(texto, musicas_encontradas)
+
+
+def completar_dados(playlist, armazenamento):
+    # Completa álbum, gênero e ano das músicas incompletas via API, em lote.
+    # As buscas rodam em paralelo; os resultados só são aplicados após aprovação.
+    print("\n" + "="*50)
+    print("         COMPLETAR DADOS (API)")
+    print("="*50)
+
+    incompletas = [musica for musica in playlist if musica_incompleta(musica)]
+    if not incompletas:
+        print(">> Todas as músicas já possuem dados completos!")
+        return
+
+    print(f">> {len(incompletas)} música(s) com dados incompletos.")
+    if input("Buscar informações na internet? (s/n): ").strip().lower() != 's':
+        return
+
+    texto = input("Buscas simultâneas (Enter = 4): ").strip()
+    trabalhadores = int(texto) if texto.isdigit() and int(texto) > 0 else 4
+
+    def mostrar_progresso(progresso):
+        # Uma linha a cada 10 músicas (e na última)
+        if progresso.concluidas % 10 == 0 or progresso.concluidas == progresso.total:
+            print(f">> Progresso: {progresso}")
+
+    try:
+        enriquecedor = EnriquecedorLote(trabalhadores=trabalhadores)
+    except ImportError as e:
+        # A API depende de requests/Pillow
+        print(f">> Busca na API indisponível: {e}")
+        return
+    fila, progresso = enriquecedor.executar(incompletas, ao_progredir=mostrar_progresso)
+
+    print(f"\n>> Concluído em {progresso.decorrido:.1f}s ({progresso.vazao:.1f} música(s)/s)")
+    print(f">> Propostas: {len(fila)} | Não encontradas: {len(progresso.nao_encontradas)}"
+          f" | Erros: {len(progresso.erros)}")
+    if not len(fila):
+        return
+
+    propostas = fila.pendentes()
+    for i, proposta in enumerate(propostas[:20], 1):
+        print(f"{i}. {resumo_proposta(proposta)}")
+    if len(propostas) > 20:
+        print(f"... e mais {len(propostas) - 20} proposta(s)")
+
+    # Aprovação em lote ou uma a uma
+    resposta = input("\nAprovar todas (t), revisar uma a uma (r) ou descartar (n)? ").strip().lower()
+    if resposta == 't':
+        atualizadas = fila.aprovar(playlist)
+    elif resposta == 'r':
+        aprovadas = [proposta for proposta in propostas
+                     if input(f"{resumo_proposta(proposta)}\n   Aplicar? (s/n): ").strip().lower() == 's']
+        atualizadas = fila.aprovar(playlist, aprovadas)
+        fila.rejeitar()
+    else:
+        fila.rejeitar()
+        print(">> Nenhuma alteração aplicada.")
+        return
+
+    armazenamento.sincronizar()
+    print(f">> {atualizadas} música(s) atualizada(s)!")
+
+
+def encontrar_duplicatas(playlist, armazenamento):
+    # Procura músicas repetidas (mesmo título e artista com maiúsculas, acentos,
+    # sufixos como "- Single" ou erros de digitação diferentes) e propõe mesclá-las.
+    # Cada grupo mantém a música mais completa; as outras só são removidas após aprovação.
+    print("\n" + "="*50)
+    print("         ENCONTRAR DUPLICATAS")
+    print("="*50)
+
+    def mostrar_progresso(analisadas, total):
+        print(f">> Progresso: {analisadas}/{total} música(s) analisada(s)")
+
+    fila = detectar_duplicatas(playlist, ao_progredir=mostrar_progresso)
+    if not len(fila):
+        print(">> Nenhuma duplicata encontrada!")
+        return
+
+    propostas = fila.pendentes()
+    duplicatas = sum(len(proposta.duplicatas) for proposta in propostas)
+    print(f">> {len(propostas)} grupo(s) com {duplicatas} duplicata(s):\n")
+    for i, proposta in enumerate(propostas[:20], 1):
+        print(f"{i}. {resumo_mesclagem(proposta)}")
+    if len(propostas) > 20:
+        print(f"... e mais {len(propostas) - 20} grupo(s)")
+
+    # Aprovação em lote ou uma a uma
+    resposta = input("\nMesclar todos (t), revisar um a um (r) ou descartar (n)? ").strip().lower()
+    if resposta == 't':
+        mescladas = fila.aprovar(playlist)
+    elif resposta == 'r':
+        aprovadas = [proposta for proposta in propostas
+                     if input(f"{resumo_mesclagem(proposta)}\n   Mesclar? (s/n): ").strip().lower() == 's']
+        mescladas = fila.aprovar(playlist, aprovadas)
+        fila.rejeitar()
+    else:
+        fila.rejeitar()
+        print(">> Nenhuma alteração aplicada.")
+        return
+
+    armazenamento.sincronizar()
+    print(f">> {mescladas} grupo(s) mesclado(s)! ({len(playlist)} música(s) na lista)")
+
 
 def main():
     # Função principal do programa.
     # Gerencia o loop do menu e as interações com o usuário.
-    # Resolve caminho da playlist dentro de data/ independentemente do diretório atual
+    # Import local: armazenamento usa carregar_dados/salvar_dados deste módulo
+    from armazenamento import criar_armazenamento
+
+    # Resolve a pasta data/ independentemente do diretório atual
     project_root = Path(__file__).resolve().parent.parent
-    nome_arquivo = str(project_root / 'data' / 'playlist.txt')
 
-    # Carrega os dados do arquivo
-    playlist = carregar_dados(nome_arquivo)
+    # Backend (texto ou SQLite) escolhido por configuração
+    armazenamento = criar_armazenamento(project_root / 'data')
+
+    # Carrega os dados
+    # A Biblioteca mantém os índices de busca junto com a LISTA
+    playlist = Biblioteca(armazenamento.carregar())
+
+    # Cada alteração é gravada na hora (diário do texto ou linha do SQLite)
+    armazenamento.anexar(playlist)
 
     # Loop principal do programa
     while True:
@@ -345,19 +624,83 @@ def main():
             elif opcao == 6:
                 gerar_relatorio(playlist)
             elif opcao == 7:
-                # Salva os dados e sai do programa
-                salvar_dados(playlist, nome_arquivo)
+                completar_dados(playlist, armazenamento)
+            elif opcao == 8:
+                encontrar_duplicatas(playlist, armazenamento)
+            elif opcao == 9:
+                # Consolida o armazenamento e sai do programa
+                armazenamento.compactar(em_segundo_plano=False)
+                armazenamento.fechar()
+                print(f">> Playlist salva com sucesso! ({len(playlist)} música(s) na lista)")
                 print("\n>> Saindo do sistema...")
                 print(">> Dados salvos com sucesso!")
                 break
             else:
-                print(">> Opção inválida. Escolha de 1 a 7.")
+                print(">> Opção inválida. Escolha de 1 a 9.")
 
         except ValueError:
             # Tratamento de erro para entrada inválida
             print(">> Opção inválida. Digite um número.")
 
 
+def main_somente_leitura():
+    # Modo somente leitura para playlists muito grandes.
+    # Com o armazenamento em texto, o arquivo é mapeado (mmap) em vez de
+    # carregado: listagem, busca e relatório decodificam apenas as linhas
+    # exibidas ou encontradas. Com o SQLite, as consultas vão direto ao banco
+    # (FTS5 e índices por campo).
+    # Import local: armazenamento usa carregar_dados/salvar_dados deste módulo
+    from armazenamento import (ARQUIVOS, SQLITE, PlaylistSQLiteSomenteLeitura,
+                               tipo_configurado)
+
+    pasta_dados = Path(__file__).resolve().parent.parent / 'data'
+    tipo = tipo_configurado(pasta_dados)
+
+    try:
+        if tipo == SQLITE:
+            leitor = PlaylistSQLiteSomenteLeitura(pasta_dados / ARQUIVOS[SQLITE])
+        else:
+            leitor = PlaylistSomenteLeitura(str(pasta_dados / 'playlist.txt'))
+    except FileNotFoundError:
+        print(">> Arquivo não encontrado.")
+        return
+
+    with leitor:
+        print(f">> {len(leitor)} música(s) no arquivo (somente leitura)")
+
+        while True:
+            print("\n" + "="*50)
+            print(f"     MENU PLAYLIST - Somente Leitura ({'SQLite' if tipo == SQLITE else 'mmap'})")
+            print("="*50)
+            print("1. Listar Músicas")
+            print("2. Buscar Música")
+            print("3. Gerar Relatório")
+            print("4. Sair")
+            print("="*50)
+
+            try:
+                opcao = int(input("\nEscolha uma opção: "))
+
+                if opcao == 1:
+                    listar_paginado(leitor)
+                elif opcao == 2:
+                    buscar_musica(leitor)
+                elif opcao == 3:
+                    gerar_relatorio(leitor)
+                elif opcao == 4:
+                    print("\n>> Saindo do sistema...")
+                    break
+                else:
+                    print(">> Opção inválida. Escolha de 1 a 4.")
+
+            except ValueError:
+                print(">> Opção inválida. Digite um número.")
+
+
 # Ponto de entrada do programa
+# Use "python main.py --somente-leitura" para abrir playlists grandes sem carregá-las
 if __name__ == "__main__":
-    main()
+    if '--somente-leitura' in sys.argv[1:]:
+        main_somente_leitura()
+    else:
+        main()
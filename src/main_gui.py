@@ -9,12 +9,44 @@ from tkinter import ttk, messagebox, filedialog, scrolledtext
 from PIL import Image, ImageTk
 import os
 from pathlib import Path
-import unicodedata
-import threading
 
 # Importa as funções do programa original
-from main import carregar_dados, salvar_dados
-from api_music import buscar_informacoes_musica
+from armazenamento import criar_armazenamento
+from api_music import arquivo_capa, buscar_informacoes_musica, caminho_capa, capa_antiga
+from busca_incremental import BuscaIncremental
+from cache_imagens import CacheImagens
+from carregador_imagens import CarregadorImagens
+from consulta import ErroConsulta
+from estatisticas import GRUPOS
+from indice_busca import CAMPOS_BUSCA
+from lista_virtual import ListaVirtual, widget_sob_ponteiro
+from miniaturas import obter_miniaturas
+from normalizacao import dobrar_texto
+from tarefas import ExecutorTarefas
+from enriquecimento import EnriquecedorLote, musica_incompleta, resumo_proposta
+from duplicatas import detectar_duplicatas, resumo_mesclagem
+from track import Track
+from biblioteca import Biblioteca
+
+
+# Altura (px) de cada card da lista, incluindo o espaço entre os cards
+ALTURA_CARD = 124
+
+MENSAGEM_LISTA_VAZIA = "Nenhuma música na playlist.\nClique em 'Adicionar Música' para começar!"
+MENSAGEM_SEM_RESULTADOS = "Nenhuma música encontrada com este termo."
+
+# Espera (ms) depois da última tecla antes de buscar, e intervalo de consulta do resultado
+ATRASO_BUSCA = 150
+INTERVALO_RESULTADO_BUSCA = 20
+
+# Intervalo (ms) entre as entregas das capas decodificadas em segundo plano
+INTERVALO_CAPAS = 30
+
+# Intervalo (ms) entre as consultas à fila de eventos das tarefas em segundo plano
+INTERVALO_TAREFAS = 100
+
+# Músicas exibidas no relatório (o total é sempre informado)
+MAXIMO_LINHAS_RELATORIO = 2000
 
 
 class PlaylistGUI:
@@ -32,10 +64,30 @@ class PlaylistGUI:
         self._images_dir = self._data_dir / 'album_covers'
 
         # Variáveis
-        self.nome_arquivo = str(self._data_dir / "playlist.txt")
+        # Backend (texto ou SQLite) escolhido por configuração (data/config.json)
+        self.armazenamento = criar_armazenamento(self._data_dir)
+        self.nome_arquivo = self.armazenamento.caminho
         self.pasta_imagens = str(self._images_dir)  # Pasta para armazenar capas de álbuns
-        self.playlist = carregar_dados(self.nome_arquivo)
-        self.imagens_cache = {}  # Cache de imagens carregadas
+        self.playlist = Biblioteca()  # Preenchida em lotes por _carregar_em_lotes
+        # Buscas digitadas rodam em outra thread (ver _agendar_busca)
+        self.busca = BuscaIncremental()
+        self._busca_agendada = None
+        self._acompanhando_busca = False
+        # Cada alteração é gravada na hora pelo backend
+        self.armazenamento.anexar(self.playlist)
+        # Cache LRU das imagens carregadas: (capa, lado) -> PhotoImage
+        self.imagens_cache = CacheImagens()
+        # Miniaturas das capas, geradas em processos auxiliares
+        self.miniaturas = obter_miniaturas()
+        # Capas decodificadas em threads, as mais próximas da área visível primeiro
+        self.carregador_capas = CarregadorImagens(self._decodificar_capa)
+        self._capas_aguardando = {}  # (capa, lado) -> labels que esperam a imagem
+        self._recebendo_capas = False
+        self._sem_capa = set()       # capas sem arquivo (refeito a cada atualizar_lista)
+        # Operações demoradas rodam no pool de tarefas (ver executar_tarefa)
+        self.tarefas = ExecutorTarefas()
+        self.tarefas.ao_mudar = self._atualizar_barra_status
+        self._despachando_tarefas = False
 
         # Cria pasta para imagens se não existir
         Path(self.pasta_imagens).mkdir(parents=True, exist_ok=True)
@@ -46,18 +98,64 @@ class PlaylistGUI:
         # Cria interface
         self.criar_interface()
 
-        # Carrega músicas
+        # Carrega músicas (as primeiras aparecem antes do arquivo terminar de ser lido)
         self.atualizar_lista()
+        self._carregar_em_lotes()
+
+        # Garante que o diário seja sincronizado ao fechar a janela
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
+
+    def fechar(self):
+        """Grava as alterações pendentes e fecha a janela"""
+        self.tarefas.encerrar()
+        self.armazenamento.fechar()
+        self.miniaturas.fechar()
+        self.root.destroy()
+
+    def _carregar_em_lotes(self, tamanho_lote=500):
+        """Lê a playlist em lotes, exibindo cada lote assim que é lido"""
+        lotes = self.armazenamento.ler_em_lotes(tamanho_lote)
+
+        def proximo_lote():
+            try:
+                lote = next(lotes)
+            except StopIteration:
+                print(f">> {len(self.playlist)} música(s) carregada(s) na lista")
+                # Aplica a busca digitada durante o carregamento
+                if self.search_var.get():
+                    self.filtrar_musicas()
+                self.atualizar_estatisticas()
+                return
+            except FileNotFoundError:
+                print(">> Arquivo não encontrado. Iniciando com lista vazia.")
+                return
+
+            self.playlist.carregar(lote)
+            # Resultados de busca anteriores não incluem este lote
+            self.busca.invalidar()
+
+            # Enquanto há busca ativa, a lista é filtrada só no final
+            if not self.search_var.get():
+                self.musicas_exibidas.extend(lote)
+                self.lista.definir_itens(self.musicas_exibidas, MENSAGEM_LISTA_VAZIA,
+                                         manter_posicao=True)
+
+            self.atualizar_estatisticas()
+
+            # Devolve o controle ao Tk antes do próximo lote
+            self.root.after(1, proximo_lote)
+
+        proximo_lote()
 
     def _configurar_trace_busca(self):
         """Configura o trace da busca de forma compatível com diferentes versões do tkinter"""
         try:
             # Tcl 9+ (Python 3.14+) - usa trace_add
-            self.search_var.trace_add('write', lambda var, index, mode: self.filtrar_musicas())
+            self.search_var.trace_add('write', lambda var, index, mode: self._agendar_busca())
         except (AttributeError, Exception):
             try:
                 # Tcl 8.x (versões antigas) - usa trace
-                self.search_var.trace('w', lambda var, index, mode: self.filtrar_musicas())
+                self.search_var.trace('w', lambda var, index, mode: self._agendar_busca())
             except Exception as e:
                 print(f"⚠️ Aviso: Não foi possível configurar busca em tempo real: {e}")
                 # Busca funcionará apenas com Enter se houver erro
@@ -107,6 +205,29 @@ class PlaylistGUI:
                          fg=self.cores['texto'])
         titulo.pack(pady=20)
 
+        # ===== BARRA DE STATUS (tarefas em segundo plano) =====
+        status_frame = tk.Frame(self.root, bg=self.cores['bg_secundario'])
+        status_frame.pack(fill='x', side='bottom')
+
+        self.status_label = tk.Label(status_frame,
+                                     text="Pronto",
+                                     font=('Arial', 9),
+                                     anchor='w',
+                                     bg=self.cores['bg_secundario'],
+                                     fg=self.cores['texto_claro'])
+        self.status_label.pack(side='left', fill='x', expand=True, padx=8, pady=3)
+
+        self.status_cancelar = tk.Button(status_frame,
+                                         text="Cancelar",
+                                         command=self.tarefas.cancelar_todas,
+                                         font=('Arial', 9),
+                                         bg=self.cores['bg_card'],
+                                         fg='#000000',
+                                         relief='flat',
+                                         cursor='hand2',
+                                         state='disabled')
+        self.status_cancelar.pack(side='right', padx=8, pady=3)
+
         # ===== CONTAINER PRINCIPAL =====
         main_container = tk.Frame(self.root, bg=self.cores['bg_principal'])
         main_container.pack(fill='both', expand=True, padx=5, pady=5)
@@ -144,6 +265,18 @@ class PlaylistGUI:
                                insertbackground=self.cores['texto_claro'])
         search_entry.pack(side='left', fill='x', expand=True, padx=5)
 
+        # Busca tolerante a erros de digitação (ex.: "reminsce" encontra "Reminisce")
+        self.busca_aproximada_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame,
+                      text="≈ Aproximada",
+                      variable=self.busca_aproximada_var,
+                      command=self._alternar_busca_aproximada,
+                      bg=self.cores['bg_secundario'],
+                      fg=self.cores['texto_claro'],
+                      selectcolor=self.cores['bg_card'],
+                      activebackground=self.cores['bg_secundario'],
+                      font=('Arial', 9)).pack(side='left', padx=5)
+
         # Canvas com scrollbar para lista de músicas
         canvas_frame = tk.Frame(left_panel, bg=self.cores['bg_secundario'])
         canvas_frame.pack(fill='both', expand=True, padx=5, pady=5)
@@ -153,14 +286,11 @@ class PlaylistGUI:
                                highlightthickness=0)
         scrollbar = ttk.Scrollbar(canvas_frame, orient='vertical', command=self.canvas.yview)
 
-        self.scrollable_frame = tk.Frame(self.canvas, bg=self.cores['bg_secundario'])
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor='nw')
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Só os cards visíveis existem; são reaproveitados durante a rolagem
+        self.musicas_exibidas = []
+        self.lista = ListaVirtual(self.canvas, scrollbar, ALTURA_CARD,
+                                  self.criar_card_musica, self.preencher_card_musica,
+                                  ao_rolar=lambda topo: self.carregador_capas.focar(topo))
 
         self.canvas.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
@@ -186,6 +316,7 @@ class PlaylistGUI:
             ("📊 Gerar Relatório", self.gerar_relatorio),
             ("💾 Salvar Playlist", self.salvar_playlist),
             ("🔄 Recarregar Dados", self.recarregar_dados),
+            ("🧹 Encontrar Duplicatas", self.encontrar_duplicatas),
         ]
 
         for texto, comando in botoes:
@@ -233,8 +364,6 @@ class PlaylistGUI:
         # Bind para entrar/sair da área do canvas
         self.canvas.bind('<Enter>', self._on_enter)
         self.canvas.bind('<Leave>', self._on_leave)
-        self.scrollable_frame.bind('<Enter>', self._on_enter)
-        self.scrollable_frame.bind('<Leave>', self._on_leave)
 
     def _on_enter(self, event):
         """Ativa scroll quando mouse entra na área"""
@@ -246,6 +375,9 @@ class PlaylistGUI:
 
     def _on_leave(self, event):
         """Desativa scroll quando mouse sai da área"""
+        # Passar do canvas para um card também gera <Leave> no canvas
+        if self.lista.contem(widget_sob_ponteiro(self.canvas, event.x_root, event.y_root)):
+            return
         # macOS
         self.canvas.unbind_all("<MouseWheel>")
         # Linux
@@ -278,39 +410,88 @@ class PlaylistGUI:
                 # No Windows, delta é geralmente 120 ou -120
                 self.canvas.yview_scroll(-1 * int(event.delta / 120), "units")
 
-    def carregar_imagem_album(self, musica):
-        """Carrega a imagem do álbum ou retorna imagem padrão"""
-        # Nome do arquivo de imagem baseado no álbum
-        nome_limpo = "".join(c for c in musica['album'] if c.isalnum() or c in (' ', '-', '_')).strip()
-        nome_imagem = f"{nome_limpo.replace(' ', '_').lower()}.png"
-        caminho_imagem = os.path.join(self.pasta_imagens, nome_imagem)
+    def carregar_imagem_album(self, musica, label=None, posicao=None):
+        """
+        Retorna a miniatura (80x80) da capa do álbum se já estiver carregada;
+        senão retorna a imagem padrão do gênero na hora e, se houver label,
+        pede a capa em segundo plano (ela entra no label quando ficar pronta).
+
+        Args:
+            musica (Track): Música do card
+            label (tk.Label): Label que deve receber a capa
+            posicao (int): Posição do card na lista (prioridade do carregamento)
+        """
+        # Só monta o caminho: nenhum acesso ao disco na thread da interface
+        caminho_imagem = str(arquivo_capa(musica['album'], musica['artista']))
+        if label is not None:
+            # Cards são reaproveitados: a capa só é aplicada se o label ainda mostrar este álbum
+            label.capa = caminho_imagem
 
         # Verifica se já está no cache
-        if caminho_imagem in self.imagens_cache:
-            return self.imagens_cache[caminho_imagem]
-
-        try:
-            # Tenta carregar a imagem do álbum
-            if os.path.exists(caminho_imagem):
-                img = Image.open(caminho_imagem)
-            else:
-                # Cria imagem padrão se não existir
-                img = self.criar_imagem_padrao(musica)
-
-            # Redimensiona para 80x80
-            img = img.resize((80, 80), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-
-            # Adiciona ao cache
-            self.imagens_cache[caminho_imagem] = photo
-            return photo
-
-        except Exception as e:
-            print(f"Erro ao carregar imagem: {e}")
-            return self.criar_imagem_padrao_tk(musica)
+        foto = self.imagens_cache.obter((caminho_imagem, 80))
+        if foto is not None:
+            return foto
+
+        if label is not None and caminho_imagem not in self._sem_capa:
+            self._pedir_capa(label, caminho_imagem, 80, posicao)
+        return self.criar_imagem_padrao_tk(musica)
+
+    def _pedir_capa(self, label, capa, lado, posicao=None):
+        """Pede a miniatura em segundo plano; posicao None passa na frente das demais"""
+        label.capa = capa
+        chave = (capa, lado)
+        self._capas_aguardando.setdefault(chave, set()).add(label)
+        self.carregador_capas.pedir(chave, posicao)
+        if not self._recebendo_capas:
+            self._recebendo_capas = True
+            self.root.after(INTERVALO_CAPAS, self._receber_capas)
+
+    def _decodificar_capa(self, chave):
+        """
+        Lê a miniatura do disco (gerando-a antes, se preciso). Roda nas threads
+        do carregador; o PhotoImage é criado depois, na thread da interface.
+
+        Returns:
+            PIL.Image: Miniatura decodificada, ou None se o álbum não tiver capa
+        """
+        capa, lado = chave
+        if not os.path.exists(capa):
+            # Capa gravada antes das pastas por artista (até ser baixada de novo)
+            capa = str(capa_antiga(capa))
+            if not os.path.exists(capa):
+                return None
+        miniatura = self.miniaturas.caminho(capa, lado)
+        if miniatura is None:
+            self.miniaturas.agendar(capa).result()
+            miniatura = self.miniaturas.caminho(capa, lado)
+        with Image.open(miniatura) as img:
+            img.load()
+            return img
+
+    def _receber_capas(self):
+        """Coloca nos labels as capas que ficaram prontas (thread da interface)"""
+        for chave, img, erro in self.carregador_capas.prontos():
+            labels = self._capas_aguardando.pop(chave, ())
+            if erro is not None:
+                print(f"Erro ao carregar imagem: {erro}")
+                continue
+            if img is None:
+                self._sem_capa.add(chave[0])
+                continue
+
+            foto = self.imagens_cache.guardar(chave, ImageTk.PhotoImage(img))
+            for label in labels:
+                if label.winfo_exists() and label.capa == chave[0]:
+                    label.config(image=foto, text='')
+                    label.image = foto
+
+        if self.carregador_capas.pendente():
+            self.root.after(INTERVALO_CAPAS, self._receber_capas)
+        else:
+            self._recebendo_capas = False
 
-    def criar_imagem_padrao(self, musica):
-        """Cria uma imagem padrão com cor baseada no gênero"""
+    def _cor_genero(self, musica):
+        """Cor da imagem padrão, baseada no gênero"""
         cores_genero = {
             'rock': '#E74C3C',
             'pop': '#3498DB',
@@ -321,35 +502,37 @@ class PlaylistGUI:
         }
 
         genero = musica.get('genero', '').lower()
-        cor = cores_genero.get(genero, '#34495E')
+        return cores_genero.get(genero, '#34495E')
 
-        img = Image.new('RGB', (80, 80), color=cor)
+    def criar_imagem_padrao(self, musica):
+        """Cria uma imagem padrão com cor baseada no gênero"""
+        img = Image.new('RGB', (80, 80), color=self._cor_genero(musica))
         return img
 
     def criar_imagem_padrao_tk(self, musica):
-        """Cria uma imagem padrão TK"""
-        img = self.criar_imagem_padrao(musica)
-        photo = ImageTk.PhotoImage(img)
+        """Imagem padrão TK (uma por cor, compartilhada pelos cards)"""
+        chave = ('padrao', self._cor_genero(musica))
+        photo = self.imagens_cache.obter(chave)
+        if photo is None:
+            photo = self.imagens_cache.guardar(chave, ImageTk.PhotoImage(self.criar_imagem_padrao(musica)))
         return photo
 
-    def criar_card_musica(self, musica, index):
-        """Cria um card visual para cada música"""
+    def criar_card_musica(self, master):
+        """Cria um card vazio (reaproveitado pela lista para várias músicas)"""
         # Frame do card
-        card = tk.Frame(self.scrollable_frame,
+        card = tk.Frame(master,
                        bg=self.cores['bg_card'],
                        relief='raised',
                        bd=2)
-        card.pack(fill='x', padx=3, pady=3)
+        card.musica = None
 
         # Frame para imagem
         img_frame = tk.Frame(card, bg=self.cores['bg_card'])
         img_frame.pack(side='left', padx=5, pady=5)
 
-        # Carrega e exibe imagem do álbum
-        foto = self.carregar_imagem_album(musica)
-        img_label = tk.Label(img_frame, image=foto, bg=self.cores['bg_card'])
-        img_label.image = foto  # Mantém referência
-        img_label.pack()
+        # Imagem do álbum
+        card.img_label = tk.Label(img_frame, bg=self.cores['bg_card'])
+        card.img_label.pack()
 
         # Frame para informações
         info_frame = tk.Frame(card, bg=self.cores['bg_card'], width=240)
@@ -357,129 +540,217 @@ class PlaylistGUI:
         info_frame.pack_propagate(False)
 
         # Título
-        tk.Label(info_frame,
-                text=f"♪ {musica['titulo']}",
-                font=('Arial', 12, 'bold'),
-                bg=self.cores['bg_card'],
-                fg=self.cores['texto'],
-                anchor='w').pack(fill='x')
+        card.titulo_label = tk.Label(info_frame,
+                                     font=('Arial', 12, 'bold'),
+                                     bg=self.cores['bg_card'],
+                                     fg=self.cores['texto'],
+                                     anchor='w')
+        card.titulo_label.pack(fill='x')
 
         # Artista
-        tk.Label(info_frame,
-                text=f"👤 {musica['artista']}",
-                font=('Arial', 10),
-                bg=self.cores['bg_card'],
-                fg=self.cores['texto_claro'],
-                anchor='w').pack(fill='x')
+        card.artista_label = tk.Label(info_frame,
+                                      font=('Arial', 10),
+                                      bg=self.cores['bg_card'],
+                                      fg=self.cores['texto_claro'],
+                                      anchor='w')
+        card.artista_label.pack(fill='x')
 
         # Álbum e Ano
-        tk.Label(info_frame,
-                text=f"💿 {musica['album']} • {musica['ano']}",
-                font=('Arial', 9),
-                bg=self.cores['bg_card'],
-                fg='#aaaaaa',
-                anchor='w').pack(fill='x')
+        card.album_label = tk.Label(info_frame,
+                                    font=('Arial', 9),
+                                    bg=self.cores['bg_card'],
+                                    fg='#aaaaaa',
+                                    anchor='w')
+        card.album_label.pack(fill='x')
 
         # Gênero
-        tk.Label(info_frame,
-                text=f"🎸 {musica['genero']}",
-                font=('Arial', 9),
-                bg=self.cores['bg_card'],
-                fg='#aaaaaa',
-                anchor='w').pack(fill='x')
+        card.genero_label = tk.Label(info_frame,
+                                     font=('Arial', 9),
+                                     bg=self.cores['bg_card'],
+                                     fg='#aaaaaa',
+                                     anchor='w')
+        card.genero_label.pack(fill='x')
 
         # Frame para botões de ação
         btn_frame = tk.Frame(card, bg=self.cores['bg_card'])
         btn_frame.pack(side='right', padx=5, pady=5)
 
-        # Botão Editar
-        btn_editar = tk.Button(btn_frame,
-                              text="✏️ Editar",
-                              command=lambda m=musica: self.editar_musica(m),
-                              bg='#4CAF50',
-                              fg=self.cores['texto_botoes'],
-                              font=('Arial', 9, 'bold'),
-                              relief='flat',
-                              cursor='hand2',
-                              padx=10,
-                              pady=5,
-                              activeforeground=self.cores['texto_botoes'])
-        btn_editar.pack(pady=2, fill='x')
-
-        # Botão Remover
-        btn_remover = tk.Button(btn_frame,
-                               text="🗑️ Remover",
-                               command=lambda m=musica: self.remover_musica(m),
-                               bg='#f44336',
-                               fg=self.cores['texto_botoes'],
-                               font=('Arial', 9, 'bold'),
-                               relief='flat',
-                               cursor='hand2',
-                               padx=10,
-                               pady=5,
-                               activeforeground=self.cores['texto_botoes'])
-        btn_remover.pack(pady=2, fill='x')
-
-        # Botão Trocar Imagem
-        btn_imagem = tk.Button(btn_frame,
-                              text="🖼️ Imagem",
-                              command=lambda m=musica: self.trocar_imagem(m),
-                              bg='#2196F3',
-                              fg=self.cores['texto_botoes'],
-                              font=('Arial', 9, 'bold'),
-                              relief='flat',
-                              cursor='hand2',
-                              padx=10,
-                              pady=5,
-                              activeforeground=self.cores['texto_botoes'])
-        btn_imagem.pack(pady=2, fill='x')
+        # Botões (agem sobre a música exibida no momento do clique)
+        botoes = [
+            ("✏️ Editar", self.editar_musica, '#4CAF50'),
+            ("🗑️ Remover", self.remover_musica, '#f44336'),
+            ("🖼️ Imagem", self.trocar_imagem, '#2196F3'),
+        ]
+        for texto, acao, cor in botoes:
+            tk.Button(btn_frame,
+                      text=texto,
+                      command=lambda a=acao: a(card.musica),
+                      bg=cor,
+                      fg=self.cores['texto_botoes'],
+                      font=('Arial', 9, 'bold'),
+                      relief='flat',
+                      cursor='hand2',
+                      padx=10,
+                      pady=5,
+                      activeforeground=self.cores['texto_botoes']).pack(pady=2, fill='x')
+
+        return card
+
+    def preencher_card_musica(self, card, musica, index):
+        """Mostra uma música em um card já criado"""
+        card.musica = musica
+        card.titulo_label.config(text=f"♪ {musica['titulo']}")
+        card.artista_label.config(text=f"👤 {musica['artista']}")
+        card.album_label.config(text=f"💿 {musica['album']} • {musica['ano']}")
+        card.genero_label.config(text=f"🎸 {musica['genero']}")
+
+        # Imagem padrão na hora; a capa chega depois (ver _receber_capas)
+        foto = self.carregar_imagem_album(musica, card.img_label, index)
+        card.img_label.config(image=foto)
+        card.img_label.image = foto  # Mantém referência
 
     def atualizar_lista(self):
-        """Atualiza a lista de músicas na interface"""
-        # Limpa frame
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        # Cria cards para cada música
-        if not self.playlist:
-            tk.Label(self.scrollable_frame,
-                    text="Nenhuma música na playlist.\nClique em 'Adicionar Música' para começar!",
-                    font=('Arial', 12),
-                    bg=self.cores['bg_secundario'],
-                    fg=self.cores['texto_claro']).pack(pady=50)
-        else:
-            for i, musica in enumerate(self.playlist):
-                self.criar_card_musica(musica, i)
-
+        """Atualiza a lista de músicas na interface (mantendo a busca digitada)"""
+        # A playlist mudou: buscas em andamento e resultados anteriores não valem mais
+        self.busca.invalidar()
+        # Capas podem ter sido baixadas ou trocadas
+        self._sem_capa.clear()
+        self.filtrar_musicas(manter_posicao=True, recarregar=True)
         self.atualizar_estatisticas()
 
-    def filtrar_musicas(self):
-        """Filtra músicas baseado no termo de busca"""
+    def filtrar_musicas(self, manter_posicao=False, recarregar=False):
+        """Filtra músicas baseado no termo de busca (na thread da interface)"""
         termo = self.search_var.get().lower()
 
-        # Limpa frame
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        # Filtra e exibe
-        musicas_filtradas = [m for m in self.playlist
-                            if termo in m['titulo'].lower()
-                            or termo in m['artista'].lower()
-                            or termo in m['album'].lower()
-                            or termo in m['genero'].lower()]
-
-        if not musicas_filtradas:
-            tk.Label(self.scrollable_frame,
-                    text="Nenhuma música encontrada com este termo.",
-                    font=('Arial', 12),
-                    bg=self.cores['bg_secundario'],
-                    fg=self.cores['texto_claro']).pack(pady=50)
+        # Filtra (via índice, mesma semântica de substring); só os cards visíveis são criados
+        if termo and self.busca_aproximada_var.get():
+            musicas = self.playlist.buscar_aproximado(termo, prefixo=True)
+        elif termo:
+            musicas = self.playlist.buscar(termo)
         else:
-            for i, musica in enumerate(musicas_filtradas):
-                self.criar_card_musica(musica, i)
+            musicas = list(self.playlist)
+        self._exibir_resultado(termo, musicas, manter_posicao, recarregar)
+
+    def _exibir_resultado(self, termo, musicas, manter_posicao=False, recarregar=False):
+        self.musicas_exibidas = musicas
+        self.lista.definir_itens(musicas,
+                                 MENSAGEM_SEM_RESULTADOS if termo else MENSAGEM_LISTA_VAZIA,
+                                 manter_posicao=manter_posicao, recarregar=recarregar)
+
+    def _agendar_busca(self):
+        """Chamado a cada tecla: a busca só começa após ATRASO_BUSCA ms sem digitação"""
+        if self._busca_agendada is not None:
+            self.root.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.root.after(ATRASO_BUSCA, self._iniciar_busca)
+
+    def _iniciar_busca(self):
+        self._busca_agendada = None
+        termo = self.search_var.get()
+        if not termo:
+            # Sem termo não há o que buscar: mostra a playlist inteira
+            self.busca.invalidar()
+            self._exibir_resultado('', list(self.playlist))
+            return
+
+        self.busca.buscar(self.playlist, termo, aproximada=self.busca_aproximada_var.get())
+        if not self._acompanhando_busca:
+            self._acompanhando_busca = True
+            self.root.after(INTERVALO_RESULTADO_BUSCA, self._receber_busca)
+
+    def _receber_busca(self):
+        """Mostra o resultado da busca mais recente (pedidos antigos são descartados)"""
+        resultado = self.busca.resultado()
+        if resultado is not None:
+            # Só os cards cujo item mudou são preenchidos de novo
+            self._exibir_resultado(*resultado)
+
+        if self.busca.pendente():
+            self.root.after(INTERVALO_RESULTADO_BUSCA, self._receber_busca)
+        else:
+            self._acompanhando_busca = False
+
+    def _alternar_busca_aproximada(self):
+        """Liga/desliga a busca aproximada e refaz a busca digitada"""
+        if not self.busca_aproximada_var.get():
+            self.busca.invalidar()
+            self._iniciar_busca()
+            return
+        if self._playlist_ocupada():
+            self.busca_aproximada_var.set(False)
+            return
+
+        def preparar(tarefa):
+            # Na primeira vez o vocabulário da playlist é indexado (depois é mantido)
+            self.playlist.busca_aproximada()
+
+        def concluir(resultado):
+            self.busca.invalidar()
+            self._iniciar_busca()
+
+        # Exclusiva: edições durante a indexação não chegariam ao índice
+        self.executar_tarefa("Preparando busca aproximada", preparar, exclusiva=True,
+                             ao_concluir=concluir)
+
+    def executar_tarefa(self, nome, funcao, *args, ao_falhar=None, **opcoes):
+        """
+        Executa funcao(tarefa, *args) no pool de tarefas.
+
+        Os callbacks (ao_concluir, ao_falhar, ao_cancelar, ao_progredir) rodam
+        na thread da interface; sem ao_falhar, o erro é mostrado em uma caixa
+        de mensagem.
+
+        Returns:
+            Tarefa: A tarefa submetida
+        """
+        if ao_falhar is None:
+            def ao_falhar(erro):
+                messagebox.showerror("Erro", f"Erro em '{nome}':\n{erro}")
+
+        tarefa = self.tarefas.submeter(nome, funcao, *args, ao_falhar=ao_falhar, **opcoes)
+        if not self._despachando_tarefas:
+            self._despachando_tarefas = True
+            self.root.after(INTERVALO_TAREFAS, self._despachar_tarefas)
+        return tarefa
+
+    def _despachar_tarefas(self):
+        """Entrega progresso e resultados das tarefas (thread da interface)"""
+        if self.tarefas.despachar():
+            self.root.after(INTERVALO_TAREFAS, self._despachar_tarefas)
+        else:
+            self._despachando_tarefas = False
+
+    def _atualizar_barra_status(self, ativas):
+        """Mostra na barra de status a tarefa mais antiga e quantas outras estão ativas"""
+        if not ativas:
+            self.status_label.config(text="Pronto")
+            self.status_cancelar.config(state='disabled')
+            return
+
+        tarefa = ativas[0]
+        texto = f"⏳ {tarefa.nome}"
+        if tarefa.fracao is not None:
+            texto += f" ({tarefa.fracao:.0%})"
+        if tarefa.progresso:
+            texto += f": {tarefa.progresso}"
+        if tarefa.cancelada:
+            texto += " (cancelando...)"
+        if len(ativas) > 1:
+            texto += f"  (+{len(ativas) - 1} tarefa(s))"
+        self.status_label.config(text=texto)
+        self.status_cancelar.config(state='normal')
+
+    def _playlist_ocupada(self):
+        """True (e avisa o usuário) se uma tarefa exclusiva está usando a playlist"""
+        tarefa = self.tarefas.exclusiva()
+        if tarefa is None:
+            return False
+        messagebox.showinfo("Aguarde", f"Aguarde a conclusão de '{tarefa.nome}'.")
+        return True
 
     def adicionar_musica(self):
         """Abre janela para adicionar nova música com busca automática de informações"""
+        if self._playlist_ocupada():
+            return
         janela = tk.Toplevel(self.root)
         janela.title("➕ Adicionar Nova Música")
         janela.geometry("600x550")
@@ -537,32 +808,42 @@ class PlaylistGUI:
 
             # Mostra loading
             btn_buscar.config(text="🔍 Buscando...", state='disabled')
-            janela.update()
-
-            # Busca informações
-            info = buscar_informacoes_musica(titulo, artista)
-
-            if info:
-                # Preenche os campos automaticamente
-                album_entry.delete(0, tk.END)
-                album_entry.insert(0, info['album'])
 
-                genero_entry.delete(0, tk.END)
-                genero_entry.insert(0, info['genero'])
+            def preencher(info):
+                if not janela.winfo_exists():
+                    return  # A janela foi fechada durante a busca
+                btn_buscar.config(text="🔍 Buscar Informações Automáticas", state='normal')
 
-                ano_entry.delete(0, tk.END)
-                ano_entry.insert(0, info['ano'])
+                if info:
+                    # Preenche os campos automaticamente
+                    album_entry.delete(0, tk.END)
+                    album_entry.insert(0, info['album'])
+
+                    genero_entry.delete(0, tk.END)
+                    genero_entry.insert(0, info['genero'])
+
+                    ano_entry.delete(0, tk.END)
+                    ano_entry.insert(0, info['ano'])
+
+                    messagebox.showinfo("Sucesso", "Informações encontradas e preenchidas automaticamente!\n\n"
+                                      f"📀 Álbum: {info['album']}\n"
+                                      f"🎸 Gênero: {info['genero']}\n"
+                                      f"📅 Ano: {info['ano']}\n"
+                                      f"🖼️ Capa: {'✅ Baixada' if info.get('capa_path') else '❌ Não encontrada'}",
+                                      parent=janela)
+                else:
+                    messagebox.showinfo("Aviso", "Não foi possível encontrar informações automáticas.\n"
+                                      "Preencha os campos manualmente.", parent=janela)
 
-                messagebox.showinfo("Sucesso", "Informações encontradas e preenchidas automaticamente!\n\n"
-                                  f"📀 Álbum: {info['album']}\n"
-                                  f"🎸 Gênero: {info['genero']}\n"
-                                  f"📅 Ano: {info['ano']}\n"
-                                  f"🖼️ Capa: {'✅ Baixada' if info.get('capa_path') else '❌ Não encontrada'}")
-            else:
-                messagebox.showinfo("Aviso", "Não foi possível encontrar informações automáticas.\n"
-                                  "Preencha os campos manualmente.")
+            def falhar(erro):
+                if janela.winfo_exists():
+                    btn_buscar.config(text="🔍 Buscar Informações Automáticas", state='normal')
+                messagebox.showerror("Erro", f"Erro ao buscar informações: {erro}")
 
-            btn_buscar.config(text="🔍 Buscar Informações Automáticas", state='normal')
+            # Busca informações (estratégias em paralelo: o usuário está esperando)
+            self.executar_tarefa(f"Buscando '{titulo}'",
+                                 lambda tarefa: buscar_informacoes_musica(titulo, artista, paralelo=True),
+                                 ao_concluir=preencher, ao_falhar=falhar)
 
         btn_buscar = tk.Button(busca_frame,
                               text="🔍 Buscar Informações Automáticas",
@@ -634,19 +915,14 @@ class PlaylistGUI:
                                       "Título e Artista são obrigatórios!")
                 return
 
-            nova_musica = {
-                'titulo': titulo,
-                'artista': artista,
-                'album': album_entry.get().strip() or "Desconhecido",
-                'genero': genero_entry.get().strip() or "Desconhecido",
-                'ano': ano_entry.get().strip() or "----"
-            }
+            nova_musica = Track(titulo,
+                                artista,
+                                album_entry.get().strip() or "Desconhecido",
+                                genero_entry.get().strip() or "Desconhecido",
+                                ano_entry.get().strip() or "----")
 
             self.playlist.append(nova_musica)
 
-            # Limpa cache de imagens para forçar recarregamento
-            self.imagens_cache.clear()
-
             self.atualizar_lista()
             messagebox.showinfo("Sucesso", "Música adicionada com sucesso!")
             janela.destroy()
@@ -680,6 +956,8 @@ class PlaylistGUI:
 
     def editar_musica(self, musica):
         """Abre janela para editar música existente"""
+        if self._playlist_ocupada():
+            return
         janela = tk.Toplevel(self.root)
         janela.title("✏️ Editar Música")
         janela.geometry("500x400")
@@ -732,14 +1010,13 @@ class PlaylistGUI:
                                       "Título e Artista são obrigatórios!")
                 return
 
-            musica['titulo'] = titulo
-            musica['artista'] = artista
-            musica['album'] = entries['album'].get().strip() or "Desconhecido"
-            musica['genero'] = entries['genero'].get().strip() or "Desconhecido"
-            musica['ano'] = entries['ano'].get().strip() or "----"
-
-            # Limpa cache de imagens
-            self.imagens_cache.clear()
+            # A Biblioteca atualiza a música e todos os índices
+            self.playlist.atualizar(musica,
+                                    titulo=titulo,
+                                    artista=artista,
+                                    album=entries['album'].get().strip() or "Desconhecido",
+                                    genero=entries['genero'].get().strip() or "Desconhecido",
+                                    ano=entries['ano'].get().strip() or "----")
 
             self.atualizar_lista()
             messagebox.showinfo("Sucesso", "Música atualizada com sucesso!")
@@ -774,6 +1051,8 @@ class PlaylistGUI:
 
     def remover_musica(self, musica):
         """Remove música após confirmação"""
+        if self._playlist_ocupada():
+            return
         resposta = messagebox.askyesno(
             "Confirmar Remoção",
             f"Tem certeza que deseja remover:\n\n{musica['titulo']} - {musica['artista']}?"
@@ -792,33 +1071,29 @@ class PlaylistGUI:
         )
 
         if arquivo:
-            try:
-                # Copia imagem para pasta de capas
-                nome_limpo = "".join(c for c in musica['album'] if c.isalnum() or c in (' ', '-', '_')).strip()
-                nome_destino = f"{nome_limpo.replace(' ', '_').lower()}.png"
-                caminho_destino = os.path.join(self.pasta_imagens, nome_destino)
+            # Copia imagem para pasta de capas e gera as miniaturas em outro processo
+            caminho_destino = str(caminho_capa(musica['album'], musica['artista']))
 
-                # Abre, redimensiona e salva
-                img = Image.open(arquivo)
-                img = img.resize((200, 200), Image.Resampling.LANCZOS)
-                img.save(caminho_destino, 'PNG')
+            def importar(tarefa):
+                tarefa.informar(Path(arquivo).name)
+                return self.miniaturas.importar(arquivo, caminho_destino).result()
 
-                # Limpa cache e atualiza
-                if caminho_destino in self.imagens_cache:
-                    del self.imagens_cache[caminho_destino]
-
-                self.imagens_cache.clear()
+            def concluir(_):
+                # Só a capa trocada sai do cache
+                self.imagens_cache.invalidar(caminho_destino)
                 self.atualizar_lista()
                 messagebox.showinfo("Sucesso", "Imagem do álbum atualizada!")
 
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao processar imagem:\n{str(e)}")
+            self.executar_tarefa(f"Importando capa de {musica['album']}", importar,
+                                 ao_concluir=concluir,
+                                 ao_falhar=lambda erro: messagebox.showerror(
+                                     "Erro", f"Erro ao processar imagem:\n{erro}"))
 
     def gerar_relatorio(self):
         """Abre janela com opções de relatório"""
         janela = tk.Toplevel(self.root)
         janela.title("📊 Gerar Relatório")
-        janela.geometry("600x500")
+        janela.geometry("600x580")
         janela.configure(bg=self.cores['bg_principal'])
         janela.transient(self.root)
         janela.grab_set()
@@ -847,7 +1122,8 @@ class PlaylistGUI:
             ('Artista', 'artista'),
             ('Álbum', 'album'),
             ('Gênero', 'genero'),
-            ('Ano', 'ano')
+            ('Ano', 'ano'),
+            ('Consulta avançada (ex.: genero = rock E ano ENTRE 1980 E 1990)', 'consulta')
         ]
 
         for texto, valor in opcoes:
@@ -888,12 +1164,6 @@ class PlaylistGUI:
                                                    height=15)
         resultado_text.pack(fill='both', expand=True)
 
-        def _norm(s: str) -> str:
-            s = s or ""
-            s = unicodedata.normalize('NFKD', s)
-            s = s.encode('ASCII', 'ignore').decode('ASCII')
-            return s.casefold().strip()
-
         # Função para gerar
         def gerar(event=None):
             campo = campo_var.get()
@@ -903,11 +1173,20 @@ class PlaylistGUI:
                 messagebox.showwarning("Atenção", "Digite um valor para filtrar!")
                 return
 
-            val_n = _norm(valor)
-
             # Filtra músicas (correspondência parcial, case/acento-insensitive)
-            musicas_filtradas = [m for m in self.playlist
-                                 if val_n in _norm(m.get(campo, ''))]
+            if campo == 'consulta':
+                # E/OU/NAO, ENTRE, ^, REGEX... avaliados sobre os índices da playlist
+                try:
+                    musicas_filtradas = self.playlist.consultar(valor)
+                except ErroConsulta as e:
+                    messagebox.showerror("Consulta inválida", str(e), parent=janela)
+                    return
+            elif campo in CAMPOS_BUSCA:
+                # Campos do índice de n-gramas: mesma comparação, sem varrer a playlist
+                musicas_filtradas = self.playlist.buscar(valor, [campo])
+            else:
+                val_n = dobrar_texto(valor)
+                musicas_filtradas = [m for m in self.playlist if val_n in m.dobrado(campo)]
 
             # Exibe resultado
             resultado_text.delete(1.0, tk.END)
@@ -922,20 +1201,49 @@ class PlaylistGUI:
                     'genero': 'GÊNERO',
                     'ano': 'ANO'
                 }
-                resultado_text.insert(tk.END, f"=== Relatório: {nomes_campos.get(campo, campo.upper())} = {valor} ===\n\n")
+                if campo == 'consulta':
+                    resultado_text.insert(tk.END, f"=== Relatório: {valor} ===\n\n")
+                else:
+                    resultado_text.insert(tk.END, f"=== Relatório: {nomes_campos.get(campo, campo.upper())} = {valor} ===\n\n")
                 resultado_text.insert(tk.END, f"Total: {len(musicas_filtradas)} música(s)\n\n")
 
-                for i, musica in enumerate(musicas_filtradas, 1):
+                # Inserir milhares de linhas no Text trava a janela: mostra só as primeiras
+                for i, musica in enumerate(musicas_filtradas[:MAXIMO_LINHAS_RELATORIO], 1):
                     resultado_text.insert(tk.END, f"{i}. {musica['titulo']}\n")
                     resultado_text.insert(tk.END, f"   Artista: {musica['artista']}\n")
                     resultado_text.insert(tk.END, f"   Álbum: {musica['album']} ({musica['ano']})\n")
                     resultado_text.insert(tk.END, f"   Gênero: {musica['genero']}\n\n")
+                if len(musicas_filtradas) > MAXIMO_LINHAS_RELATORIO:
+                    resultado_text.insert(tk.END, f"... e mais {len(musicas_filtradas) - MAXIMO_LINHAS_RELATORIO} "
+                                                  "música(s). Refine o filtro para ver todas.\n")
+
+        # Relatório agrupado: contagens mantidas pela playlist a cada alteração
+        nomes_grupos = {nome: grupo for grupo, nome in GRUPOS.items()}
+        grupo_var = tk.StringVar(value=GRUPOS['genero'])
+
+        def gerar_agrupado():
+            grupo = nomes_grupos[grupo_var.get()]
+            estatisticas = self.playlist.estatisticas()
+            # Anos e décadas em ordem cronológica; os demais do mais frequente ao menos
+            linhas = estatisticas.agrupar(grupo, por_valor=grupo in ('ano', 'decada'))
+
+            resultado_text.delete(1.0, tk.END)
+            resultado_text.insert(tk.END, f"=== Músicas por {grupo_var.get()} ===\n\n")
+            resultado_text.insert(tk.END, f"Total: {len(self.playlist)} música(s), "
+                                          f"{estatisticas.distintos(grupo)} valor(es) distinto(s)\n\n")
+            for valor, contagem in linhas[:MAXIMO_LINHAS_RELATORIO]:
+                resultado_text.insert(tk.END, f"{(valor or '(sem valor)')[:40]:<40} {contagem:>6}\n")
+            if len(linhas) > MAXIMO_LINHAS_RELATORIO:
+                resultado_text.insert(tk.END, f"... e mais {len(linhas) - MAXIMO_LINHAS_RELATORIO} valor(es)\n")
 
         # Bind Enter para gerar rapidamente
         valor_entry.bind('<Return>', gerar)
 
+        botoes_frame = tk.Frame(janela, bg=self.cores['bg_principal'])
+        botoes_frame.pack(pady=10)
+
         # Botão gerar
-        tk.Button(janela,
+        tk.Button(botoes_frame,
                  text="📊 Gerar Relatório",
                  command=gerar,
                  bg=self.cores['botao'],
@@ -944,31 +1252,79 @@ class PlaylistGUI:
                  relief='flat',
                  cursor='hand2',
                  activebackground=self.cores['botao_hover'],
-                 activeforeground=self.cores['texto_botoes']).pack(pady=10)
+                 activeforeground=self.cores['texto_botoes']).pack(side='left', padx=5)
+
+        # Botão e seletor do relatório agrupado
+        tk.Button(botoes_frame,
+                 text="📈 Agrupar por",
+                 command=gerar_agrupado,
+                 bg=self.cores['botao'],
+                 fg=self.cores['texto_botoes'],
+                 font=('Arial', 12, 'bold'),
+                 relief='flat',
+                 cursor='hand2',
+                 activebackground=self.cores['botao_hover'],
+                 activeforeground=self.cores['texto_botoes']).pack(side='left', padx=(15, 5))
+
+        grupo_menu = tk.OptionMenu(botoes_frame, grupo_var, *GRUPOS.values())
+        grupo_menu.configure(bg=self.cores['bg_card'],
+                             fg=self.cores['texto_claro'],
+                             font=('Arial', 10),
+                             relief='flat',
+                             highlightthickness=0)
+        grupo_menu.pack(side='left')
 
     def salvar_playlist(self):
-        """Salva a playlist no arquivo"""
-        salvar_dados(self.playlist, self.nome_arquivo)
-        messagebox.showinfo("Sucesso", "Playlist salva com sucesso!")
+        """Salva a playlist (consolida o armazenamento em segundo plano)"""
+        # Um recarregamento em andamento já fechou o armazenamento
+        if self._playlist_ocupada():
+            return
+        # A cópia do estado é feita aqui; a tarefa só espera a gravação em disco
+        self.armazenamento.compactar()
 
-    def recarregar_dados(self):
-        """Recarrega os dados do arquivo e busca informações faltantes via API"""
-        # Recarrega dados do arquivo
-        self.playlist = carregar_dados(self.nome_arquivo)
+        def aguardar(tarefa):
+            self.armazenamento.aguardar_compactacao()
+            self.armazenamento.sincronizar()
 
-        # Verifica músicas com dados incompletos (apenas baseado em título e artista)
-        musicas_incompletas = []
-        for musica in self.playlist:
-            # Verifica se tem título e artista (requisitos mínimos)
-            if not musica.get('titulo') or not musica.get('artista'):
-                continue  # Pula músicas sem título ou artista
+        self.executar_tarefa("Salvando playlist", aguardar,
+                             ao_concluir=lambda _: messagebox.showinfo(
+                                 "Sucesso", "Playlist salva com sucesso!"))
 
+    def recarregar_dados(self):
+        """Recarrega os dados do arquivo e busca informações faltantes via API"""
+        if self._playlist_ocupada():
+            return
+        # Grava o diário pendente; a leitura o reaplica
+        self.armazenamento.fechar()
+        aproximada = self.busca_aproximada_var.get()
+
+        def carregar(tarefa):
+            tarefa.informar("lendo o arquivo")
+            musicas = self.armazenamento.carregar()
+            tarefa.informar(f"indexando {len(musicas)} música(s)")
+            playlist = Biblioteca(musicas)
+            if aproximada:
+                # Evita montar o índice da busca aproximada na thread da interface
+                playlist.busca_aproximada()
+            # Verifica músicas com dados incompletos (apenas baseado em título e artista)
             # Considera incompleta se não tiver álbum, ano ou gênero definido
-            # Busca SEMPRE para esses campos, mesmo que estejam preenchidos incorretamente
-            if (musica.get('album') in [None, '', 'Desconhecido', '----'] or
-                musica.get('ano') in [None, '', '----'] or
-                musica.get('genero') in [None, '', 'Desconhecido']):
-                musicas_incompletas.append(musica)
+            return playlist, [musica for musica in playlist if musica_incompleta(musica)]
+
+        def falhar(erro):
+            # Volta a registrar as alterações da playlist atual
+            self.armazenamento.anexar(self.playlist)
+            messagebox.showerror("Erro", f"Erro ao recarregar os dados:\n{erro}")
+
+        # Exclusiva: a playlist é substituída no final, edições nesse meio-tempo se perderiam
+        self.executar_tarefa("Recarregando dados", carregar, exclusiva=True,
+                             ao_concluir=self._concluir_recarga, ao_falhar=falhar)
+
+    def _concluir_recarga(self, resultado):
+        """Troca a playlist pela recarregada e oferece completar os dados incompletos"""
+        self.playlist, musicas_incompletas = resultado
+        self.armazenamento.anexar(self.playlist)
+        # As capas não mudam ao recarregar: o cache de imagens continua válido
+        self.atualizar_lista()
 
         if musicas_incompletas:
             # Pergunta se deseja buscar dados
@@ -983,9 +1339,6 @@ class PlaylistGUI:
 
             if resposta:
                 self.buscar_dados_faltantes(musicas_incompletas)
-                self.imagens_cache.clear()
-                self.atualizar_lista()
-                return  # Não mostra a mensagem "Dados recarregados" pois já foi mostrada
         else:
             # Nenhuma música incompleta
             messagebox.showinfo(
@@ -996,100 +1349,241 @@ class PlaylistGUI:
                 "2. Clicar em 'Recarregar Dados' novamente"
             )
 
-        self.imagens_cache.clear()
-        self.atualizar_lista()
-
     def buscar_dados_faltantes(self, musicas_incompletas):
-        """Busca dados faltantes via API e confirma com o usuário"""
-        import threading
+        """Busca dados faltantes via API em lote e abre a revisão das propostas"""
+        def buscar(tarefa):
+            def ao_progredir(progresso):
+                tarefa.informar(f"{progresso}, {progresso.propostas} proposta(s)",
+                                progresso.concluidas / progresso.total)
+
+            # O token da tarefa (botão Cancelar da barra de status) interrompe o lote;
+            # as propostas já encontradas ainda são revisadas
+            return EnriquecedorLote().executar(musicas_incompletas,
+                                               ao_progredir=ao_progredir,
+                                               cancelar=tarefa.cancelamento)
+
+        self.executar_tarefa("Buscando informações na API", buscar,
+                             ao_concluir=lambda resultado: self.revisar_propostas(*resultado),
+                             ao_falhar=lambda erro: messagebox.showerror(
+                                 "Erro", f"Erro ao buscar informações: {erro}"))
+
+    def revisar_propostas(self, fila, progresso):
+        """Mostra as propostas da busca em lote para aprovação (todas ou selecionadas)"""
+        propostas = fila.pendentes()
+
+        # Monta mensagem de resultado
+        mensagem = (f"{progresso.concluidas} música(s) consultada(s) em {progresso.decorrido:.1f}s "
+                    f"({progresso.vazao:.1f}/s)")
+        if progresso.nao_encontradas:
+            mensagem += f"\n⚠️ {len(progresso.nao_encontradas)} música(s) não encontrada(s) na API"
+        if progresso.erros:
+            mensagem += f"\n❌ {len(progresso.erros)} erro(s) de conexão"
+
+        if not propostas:
+            messagebox.showinfo("Busca Concluída", mensagem + "\n\nNenhuma música foi atualizada.")
+            return
 
-        # Cria janela de progresso
-        janela_progresso = tk.Toplevel(self.root)
-        janela_progresso.title("Buscando Informações")
-        janela_progresso.geometry("400x150")
-        janela_progresso.configure(bg=self.cores['bg_secundario'])
-        janela_progresso.transient(self.root)
-        janela_progresso.grab_set()
+        janela = tk.Toplevel(self.root)
+        janela.title("Revisar Atualizações")
+        janela.geometry("700x500")
+        janela.configure(bg=self.cores['bg_secundario'])
+        janela.transient(self.root)
 
-        # Centraliza janela
-        janela_progresso.update_idletasks()
-        x = (janela_progresso.winfo_screenwidth() // 2) - (400 // 2)
-        y = (janela_progresso.winfo_screenheight() // 2) - (150 // 2)
-        janela_progresso.geometry(f"400x150+{x}+{y}")
+        tk.Label(janela,
+                text=f"📊 {len(propostas)} atualização(ões) encontrada(s)",
+                font=('Arial', 16, 'bold'),
+                bg=self.cores['bg_secundario'],
+                fg=self.cores['texto']).pack(pady=(15, 5))
 
-        tk.Label(janela_progresso,
-                text="🔍 Buscando informações na API...",
-                font=('Arial', 12, 'bold'),
+        tk.Label(janela,
+                text=mensagem,
+                font=('Arial', 10),
                 bg=self.cores['bg_secundario'],
-                fg=self.cores['texto_claro']).pack(pady=20)
-
-        label_progresso = tk.Label(janela_progresso,
-                                   text="Aguarde...",
-                                   font=('Arial', 10),
-                                   bg=self.cores['bg_secundario'],
-                                   fg=self.cores['texto_claro'])
-        label_progresso.pack(pady=10)
-
-        def buscar_async():
-            atualizadas = 0
-            nao_encontradas = []
-
-            for i, musica in enumerate(musicas_incompletas):
-                # Atualiza label de progresso
-                label_progresso.config(
-                    text=f"Buscando {i+1} de {len(musicas_incompletas)}...\n{musica['titulo']} - {musica['artista']}"
-                )
-                janela_progresso.update()
-
-                # Busca informações usando APENAS título e artista
-                # Isso garante que mesmo com álbum/ano/gênero errados, encontrará dados corretos
-                info = buscar_informacoes_musica(musica['titulo'], musica['artista'])
+                fg=self.cores['texto_claro']).pack(pady=(0, 10))
 
-                if info:
-                    # Mostra janela de confirmação
-                    janela_progresso.withdraw()
+        frame_lista = tk.Frame(janela, bg=self.cores['bg_secundario'])
+        frame_lista.pack(fill='both', expand=True, padx=10)
 
-                    if self.confirmar_atualizacao_dados(musica, info):
-                        # Atualiza dados da música
-                        musica['album'] = info['album']
-                        musica['genero'] = info['genero']
-                        musica['ano'] = info['ano']
-                        atualizadas += 1
+        lista = tk.Listbox(frame_lista, selectmode='extended', font=('Arial', 10),
+                           bg=self.cores['bg_card'], fg=self.cores['texto'])
+        scrollbar = ttk.Scrollbar(frame_lista, orient='vertical', command=lista.yview)
+        lista.configure(yscrollcommand=scrollbar.set)
+        lista.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
 
-                    janela_progresso.deiconify()
-                else:
-                    # Música não encontrada
-                    nao_encontradas.append(f"• {musica['titulo']} - {musica['artista']}")
+        def preencher():
+            lista.delete(0, tk.END)
+            for proposta in propostas:
+                lista.insert(tk.END, resumo_proposta(proposta))
 
-            janela_progresso.destroy()
+        preencher()
+        total_atualizadas = [0]
 
-            # Salva alterações
+        def concluir(atualizadas):
             if atualizadas > 0:
-                salvar_dados(self.playlist, self.nome_arquivo)
+                total_atualizadas[0] += atualizadas
+                # As alterações já estão no diário; garante que foram para o disco
+                self.armazenamento.sincronizar()
+                self.atualizar_lista()
+            if propostas:
+                preencher()
+                return
+            janela.destroy()
+            messagebox.showinfo("Atualização Concluída",
+                                f"✅ {total_atualizadas[0]} música(s) atualizada(s) com sucesso!")
 
-            # Monta mensagem de resultado
-            mensagem = ""
-            if atualizadas > 0:
-                mensagem += f"✅ {atualizadas} música(s) atualizada(s) com sucesso!\n"
+        def aprovar(selecionadas):
+            if self._playlist_ocupada():
+                return
+            atualizadas = fila.aprovar(self.playlist, selecionadas)
+            for proposta in (list(propostas) if selecionadas is None else selecionadas):
+                propostas.remove(proposta)
+            concluir(atualizadas)
+
+        def aprovar_selecionadas():
+            aprovar([propostas[i] for i in lista.curselection()])
+
+        def rejeitar_selecionadas():
+            selecionadas = [propostas[i] for i in lista.curselection()]
+            fila.rejeitar(selecionadas)
+            for proposta in selecionadas:
+                propostas.remove(proposta)
+            concluir(0)
+
+        def ver_detalhes(event=None):
+            selecao = lista.curselection()
+            if not selecao:
+                return
+            proposta = propostas[selecao[0]]
+            if self.confirmar_atualizacao_dados(proposta.musica, proposta.info):
+                aprovar([proposta])
 
-            if nao_encontradas:
-                mensagem += f"\n⚠️ {len(nao_encontradas)} música(s) não encontrada(s) na API:\n\n"
-                # Limita a 10 músicas para não ficar muito grande
-                mensagem += "\n".join(nao_encontradas[:10])
-                if len(nao_encontradas) > 10:
-                    mensagem += f"\n... e mais {len(nao_encontradas) - 10} música(s)"
-                mensagem += "\n\n💡 Dica: Verifique se o nome e artista estão corretos."
+        lista.bind('<Double-Button-1>', ver_detalhes)
 
-            if not mensagem:
-                mensagem = "Nenhuma música foi atualizada."
+        frame_botoes = tk.Frame(janela, bg=self.cores['bg_secundario'])
+        frame_botoes.pack(pady=15)
+
+        for texto, comando, cor in (("✅ Aprovar Todas", lambda: aprovar(None), '#4CAF50'),
+                                    ("☑️ Aprovar Selecionadas", aprovar_selecionadas, '#8BC34A'),
+                                    ("❌ Rejeitar Selecionadas", rejeitar_selecionadas, '#f44336'),
+                                    ("🔎 Detalhes", ver_detalhes, self.cores['bg_card'])):
+            tk.Button(frame_botoes,
+                     text=texto,
+                     command=comando,
+                     bg=cor,
+                     fg='#000000',
+                     font=('Arial', 10, 'bold'),
+                     relief='flat',
+                     cursor='hand2').pack(side='left', padx=5)
+
+    def encontrar_duplicatas(self):
+        """Procura músicas duplicadas em segundo plano e abre a revisão das mesclagens"""
+        if self._playlist_ocupada():
+            return
+        # A detecção só lê as músicas; as propostas conferem na aprovação se continuam iguais
+        musicas = list(self.playlist)
+
+        def detectar(tarefa):
+            def ao_progredir(analisadas, total):
+                tarefa.informar(f"{analisadas}/{total} música(s) analisada(s)", analisadas / total)
+
+            fila = detectar_duplicatas(musicas, cancelar=tarefa.cancelamento,
+                                       ao_progredir=ao_progredir)
+            tarefa.verificar()
+            return fila
+
+        self.executar_tarefa("Procurando duplicatas", detectar,
+                             ao_concluir=self.revisar_mesclagens)
+
+    def revisar_mesclagens(self, fila):
+        """Mostra os grupos de duplicatas para mesclar (todos ou selecionados)"""
+        propostas = fila.pendentes()
+        if not propostas:
+            messagebox.showinfo("Duplicatas", "Nenhuma duplicata encontrada!")
+            return
 
-            titulo_janela = "Atualização Concluída" if atualizadas > 0 else "Busca Concluída"
-            messagebox.showinfo(titulo_janela, mensagem)
+        janela = tk.Toplevel(self.root)
+        janela.title("Revisar Duplicatas")
+        janela.geometry("760x500")
+        janela.configure(bg=self.cores['bg_secundario'])
+        janela.transient(self.root)
 
-        # Executa busca em thread separada para não travar a interface
-        thread = threading.Thread(target=buscar_async)
-        thread.daemon = True
-        thread.start()
+        titulo_label = tk.Label(janela,
+                                font=('Arial', 16, 'bold'),
+                                bg=self.cores['bg_secundario'],
+                                fg=self.cores['texto'])
+        titulo_label.pack(pady=(15, 5))
+
+        tk.Label(janela,
+                text="Cada grupo mantém a música mais completa e remove as demais.",
+                font=('Arial', 10),
+                bg=self.cores['bg_secundario'],
+                fg=self.cores['texto_claro']).pack(pady=(0, 10))
+
+        frame_lista = tk.Frame(janela, bg=self.cores['bg_secundario'])
+        frame_lista.pack(fill='both', expand=True, padx=10)
+
+        lista = tk.Listbox(frame_lista, selectmode='extended', font=('Arial', 10),
+                           bg=self.cores['bg_card'], fg=self.cores['texto'])
+        scrollbar = ttk.Scrollbar(frame_lista, orient='vertical', command=lista.yview)
+        lista.configure(yscrollcommand=scrollbar.set)
+        lista.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        def preencher():
+            duplicatas = sum(len(proposta.duplicatas) for proposta in propostas)
+            titulo_label.config(text=f"🧹 {len(propostas)} grupo(s) com {duplicatas} duplicata(s)")
+            lista.delete(0, tk.END)
+            for proposta in propostas:
+                lista.insert(tk.END, resumo_mesclagem(proposta))
+
+        preencher()
+        total_mescladas = [0]
+
+        def concluir(mescladas):
+            if mescladas > 0:
+                total_mescladas[0] += mescladas
+                # As remoções já estão no diário; garante que foram para o disco
+                self.armazenamento.sincronizar()
+                self.atualizar_lista()
+            if propostas:
+                preencher()
+                return
+            janela.destroy()
+            messagebox.showinfo("Mesclagem Concluída",
+                                f"✅ {total_mescladas[0]} grupo(s) mesclado(s) com sucesso!")
+
+        def mesclar(selecionadas):
+            if self._playlist_ocupada():
+                return
+            mescladas = fila.aprovar(self.playlist, selecionadas)
+            for proposta in (list(propostas) if selecionadas is None else selecionadas):
+                propostas.remove(proposta)
+            concluir(mescladas)
+
+        def descartar_selecionadas():
+            selecionadas = [propostas[i] for i in lista.curselection()]
+            fila.rejeitar(selecionadas)
+            for proposta in selecionadas:
+                propostas.remove(proposta)
+            concluir(0)
+
+        frame_botoes = tk.Frame(janela, bg=self.cores['bg_secundario'])
+        frame_botoes.pack(pady=15)
+
+        for texto, comando, cor in (("✅ Mesclar Todos", lambda: mesclar(None), '#4CAF50'),
+                                    ("☑️ Mesclar Selecionados",
+                                     lambda: mesclar([propostas[i] for i in lista.curselection()]),
+                                     '#8BC34A'),
+                                    ("❌ Descartar Selecionados", descartar_selecionadas, '#f44336')):
+            tk.Button(frame_botoes,
+                     text=texto,
+                     command=comando,
+                     bg=cor,
+                     fg='#000000',
+                     font=('Arial', 10, 'bold'),
+                     relief='flat',
+                     cursor='hand2').pack(side='left', padx=5)
 
     def confirmar_atualizacao_dados(self, musica_antiga, info_nova):
         """Mostra janela de confirmação comparando dados antigos e novos"""
@@ -1192,18 +1686,23 @@ class PlaylistGUI:
         # Mostra prévia da capa se disponível
         if info_nova.get('capa_path'):
             try:
-                img = Image.open(info_nova['capa_path'])
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-
                 tk.Label(frame_info,
                         text="🖼️ Capa do Álbum:",
                         font=('Arial', 11, 'bold'),
                         bg=self.cores['bg_card'],
                         fg=self.cores['texto_claro']).pack(pady=10)
 
-                img_label = tk.Label(frame_info, image=photo, bg=self.cores['bg_card'])
-                img_label.image = photo  # Mantém referência
+                # A miniatura de 150x150 é gerada logo após o download
+                chave = (info_nova['capa_path'], 150)
+                photo = self.imagens_cache.obter(chave)
+                img_label = tk.Label(frame_info, bg=self.cores['bg_card'],
+                                     fg=self.cores['texto_claro'])
+                if photo is not None:
+                    img_label.config(image=photo)
+                    img_label.image = photo  # Mantém referência
+                else:
+                    img_label.config(text="Carregando prévia...")
+                    self._pedir_capa(img_label, *chave)
                 img_label.pack(pady=10)
             except Exception as e:
                 print(f"Erro ao carregar prévia da imagem: {e}")
@@ -1251,13 +1750,19 @@ class PlaylistGUI:
 
     def atualizar_estatisticas(self):
         """Atualiza as estatísticas exibidas"""
+        # Contadores mantidos a cada alteração: não percorre a playlist
+        estatisticas = self.playlist.estatisticas()
         total = len(self.playlist)
-        generos = len(set(m['genero'] for m in self.playlist)) if self.playlist else 0
-        artistas = len(set(m['artista'] for m in self.playlist)) if self.playlist else 0
+        generos = estatisticas.distintos('genero')
+        artistas = estatisticas.distintos('artista')
 
         texto = f"Total de Músicas: {total}\n"
         texto += f"Artistas Únicos: {artistas}\n"
-        texto += f"Gêneros Únicos: {generos}"
+        texto += f"Gêneros Únicos: {generos}\n"
+
+        cache = self.imagens_cache.estatisticas()
+        texto += (f"Cache de Imagens: {cache['entradas']} ({cache['bytes'] / 1024 ** 2:.1f} MB)\n"
+                  f"  Acertos: {cache['taxa_acerto']:.0%} • Descartes: {cache['removidas_lru']}")
 
         self.stats_label.config(text=texto)
 
@@ -0,0 +1,302 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Miniaturas das capas dos álbuns em tamanhos fixos (80, 150 e 200 px).
+
+As capas em data/album_covers ficam no tamanho original. As miniaturas são
+geradas uma única vez, em processos separados (ProcessPoolExecutor), logo
+depois do download ou da importação da capa, e gravadas em data/miniaturas
+como "<hash do conteúdo>_<lado>.png". O manifesto (manifesto.json) associa
+cada capa ao hash, tamanho e data de modificação do arquivo: para saber se a
+miniatura está em dia basta um stat da capa, e a interface nunca precisa
+redimensionar imagens na sua thread.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+
+# Lados (px) das miniaturas: lista de músicas, prévia da busca e importação
+TAMANHOS = (80, 150, 200)
+
+# Pasta padrão das miniaturas (data/miniaturas)
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / 'data' / 'miniaturas'
+
+# Quantas conclusões acumular antes de regravar o manifesto
+_GRAVAR_A_CADA = 50
+
+_miniaturas_padrao = None
+_lock_padrao = threading.Lock()
+
+
+def obter_miniaturas():
+    """Retorna o cache de miniaturas padrão do processo, criando na primeira chamada"""
+    global _miniaturas_padrao
+    with _lock_padrao:
+        if _miniaturas_padrao is None:
+            _miniaturas_padrao = CacheMiniaturas(PASTA_PADRAO)
+        return _miniaturas_padrao
+
+
+def hash_arquivo(caminho):
+    """Resumo SHA-1 do conteúdo do arquivo (lido em blocos)"""
+    resumo = hashlib.sha1()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 16), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _salvar_png(img, destino):
+    """Grava a imagem como PNG em um temporário e troca pelo destino (atômico)"""
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix=destino.name + '.',
+                                             suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            img.save(arquivo, 'PNG')
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+# ===== Funções executadas nos processos auxiliares =====
+
+def gerar_miniaturas(origem, pasta, tamanhos=TAMANHOS):
+    """
+    Gera as miniaturas que ainda não existem para o conteúdo atual da capa.
+
+    Args:
+        origem (str): Caminho da capa
+        pasta (str): Pasta das miniaturas
+        tamanhos (tuple): Lados das miniaturas
+
+    Returns:
+        dict: Entrada do manifesto (hash, tamanho e mtime_ns da capa)
+    """
+    pasta = Path(pasta)
+    # O stat vem antes da leitura: se a capa mudar no meio, a entrada fica
+    # desatualizada e as miniaturas são geradas de novo no próximo acesso
+    info = os.stat(origem)
+    resumo = hash_arquivo(origem)
+
+    # Capas com o mesmo conteúdo compartilham as miniaturas
+    faltando = [lado for lado in tamanhos if not (pasta / f"{resumo}_{lado}.png").exists()]
+    if faltando:
+        with Image.open(origem) as img:
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA')
+            for lado in faltando:
+                _salvar_png(img.resize((lado, lado), Image.Resampling.LANCZOS),
+                            pasta / f"{resumo}_{lado}.png")
+
+    return {'hash': resumo, 'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+
+def importar_capa(arquivo, destino, pasta, tamanhos=TAMANHOS):
+    """
+    Copia uma imagem escolhida pelo usuário como capa (em PNG) e gera as miniaturas.
+
+    Args:
+        arquivo (str): Imagem escolhida
+        destino (str): Caminho da capa do álbum
+        pasta (str): Pasta das miniaturas
+        tamanhos (tuple): Lados das miniaturas
+
+    Returns:
+        dict: Entrada do manifesto da nova capa
+    """
+    destino = Path(destino)
+    with Image.open(arquivo) as img:
+        formato = img.format
+        if formato != 'PNG':
+            _salvar_png(img, destino)
+
+    if formato == 'PNG':
+        # Já está no formato certo: copia sem decodificar
+        descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix=destino.name + '.',
+                                                 suffix='.tmp')
+        os.close(descritor)
+        try:
+            shutil.copyfile(arquivo, temporario)
+            os.replace(temporario, destino)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+    return gerar_miniaturas(str(destino), pasta, tamanhos)
+
+
+# ===== Cache (processo principal) =====
+
+class CacheMiniaturas:
+    """Miniaturas das capas, geradas em segundo plano e registradas em um manifesto"""
+
+    def __init__(self, pasta=PASTA_PADRAO, tamanhos=TAMANHOS, processos=None):
+        """
+        Args:
+            pasta (str): Pasta das miniaturas e do manifesto
+            tamanhos (tuple): Lados das miniaturas geradas
+            processos (int): Processos auxiliares (None = número de CPUs)
+        """
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.tamanhos = tuple(tamanhos)
+        self.processos = processos
+
+        self._lock = threading.Lock()
+        self._caminho_manifesto = self.pasta / 'manifesto.json'
+        self._manifesto = self._ler_manifesto()
+        self._alteracoes = 0
+        self._em_andamento = {}  # capa -> Future
+        self._executor = None
+
+    def _ler_manifesto(self):
+        try:
+            with open(self._caminho_manifesto, encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _gravar_manifesto(self):
+        """Grava o manifesto (chamado com _lock adquirido)"""
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta, prefix='manifesto.',
+                                                 suffix='.tmp')
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            json.dump(self._manifesto, arquivo, ensure_ascii=False)
+        os.replace(temporario, self._caminho_manifesto)
+        self._alteracoes = 0
+
+    @staticmethod
+    def _chave(origem):
+        return os.path.abspath(origem)
+
+    def caminho(self, origem, lado):
+        """
+        Retorna a miniatura da capa se ela estiver em dia com o arquivo.
+
+        Não gera nada: só consulta o manifesto e faz um stat da capa.
+
+        Args:
+            origem (str): Caminho da capa
+            lado (int): Lado da miniatura (um dos tamanhos)
+
+        Returns:
+            Path: Caminho da miniatura ou None se ainda não foi gerada
+        """
+        with self._lock:
+            entrada = self._manifesto.get(self._chave(origem))
+        if entrada is None:
+            return None
+        try:
+            info = os.stat(origem)
+        except OSError:
+            return None
+        if (info.st_size, info.st_mtime_ns) != (entrada['tamanho'], entrada['mtime_ns']):
+            return None
+        miniatura = self.pasta / f"{entrada['hash']}_{lado}.png"
+        return miniatura if miniatura.exists() else None
+
+    def _obter_executor(self):
+        if self._executor is None:
+            # spawn: a interface tem threads (Tk, buscas), onde fork não é seguro
+            self._executor = ProcessPoolExecutor(max_workers=self.processos,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _submeter(self, origem, funcao, *args, reaproveitar=True):
+        chave = self._chave(origem)
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            if reaproveitar and futuro is not None:
+                return futuro
+            # Resolvido só depois de o manifesto ser atualizado
+            futuro = self._em_andamento[chave] = Future()
+            tarefa = self._obter_executor().submit(funcao, *args, str(self.pasta), self.tamanhos)
+        tarefa.add_done_callback(lambda tarefa: self._concluir(chave, tarefa, futuro))
+        return futuro
+
+    def _concluir(self, chave, tarefa, futuro):
+        try:
+            entrada = tarefa.result()
+        except BaseException as e:
+            with self._lock:
+                if self._em_andamento.get(chave) is futuro:
+                    del self._em_andamento[chave]
+            futuro.set_exception(e)
+            return
+
+        with self._lock:
+            anterior = self._manifesto.get(chave)
+            self._manifesto[chave] = entrada
+            if anterior is not None and anterior['hash'] != entrada['hash']:
+                self._remover_orfas(anterior['hash'])
+            if self._em_andamento.get(chave) is futuro:
+                del self._em_andamento[chave]
+            self._alteracoes += 1
+            if not self._em_andamento or self._alteracoes >= _GRAVAR_A_CADA:
+                self._gravar_manifesto()
+        futuro.set_result(entrada)
+
+    def _remover_orfas(self, resumo):
+        """Apaga as miniaturas de um conteúdo que nenhuma capa usa mais"""
+        if any(entrada['hash'] == resumo for entrada in self._manifesto.values()):
+            return
+        for lado in self.tamanhos:
+            (self.pasta / f"{resumo}_{lado}.png").unlink(missing_ok=True)
+
+    def agendar(self, origem):
+        """
+        Gera (em segundo plano) as miniaturas da capa, se ainda não estiverem em dia.
+
+        Pedidos para a mesma capa enquanto a geração está em andamento
+        recebem o mesmo Future.
+
+        Args:
+            origem (str): Caminho da capa
+
+        Returns:
+            Future: Resolvido com a entrada do manifesto
+        """
+        if all(self.caminho(origem, lado) for lado in self.tamanhos):
+            with self._lock:
+                entrada = self._manifesto[self._chave(origem)]
+            futuro = Future()
+            futuro.set_result(entrada)
+            return futuro
+        return self._submeter(origem, gerar_miniaturas, str(origem))
+
+    def importar(self, arquivo, destino):
+        """
+        Copia (em segundo plano) uma imagem como capa do álbum e gera as miniaturas.
+
+        Args:
+            arquivo (str): Imagem escolhida pelo usuário
+            destino (str): Caminho da capa do álbum
+
+        Returns:
+            Future: Resolvido com a entrada do manifesto da nova capa
+        """
+        return self._submeter(destino, importar_capa, str(arquivo), str(destino),
+                              reaproveitar=False)
+
+    def fechar(self):
+        """Encerra os processos auxiliares e grava o manifesto"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            if self._alteracoes:
+                self._gravar_manifesto()
@@ -0,0 +1,90 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Normalização de texto compartilhada pela busca, pelo relatório e pela
+pontuação dos resultados da API.
+
+dobrar_texto: forma usada nas comparações sem diferenciar maiúsculas nem
+acentos ("Beyoncé" e "BEYONCE" viram "beyonce"). Usa a decomposição de
+compatibilidade (NFKD), então variantes do mesmo caractere também se
+igualam ("ﬁ" e "fi", "²" e "2", letras de largura total). As músicas
+guardam os campos já dobrados (Track.dobrados), então os filtros só
+comparam textos prontos.
+
+normalizar_texto: além de remover os acentos, tira a pontuação e os espaços
+extras (mantém maiúsculas); é o texto enviado nas buscas da API e usado na
+pontuação dos resultados. Usa a decomposição canônica (NFD) e descarta só
+as marcas combinantes (categoria Mn), como sempre fez: "Café ½" vira
+"Cafe ½", não "Cafe 12".
+
+As duas funções guardam os resultados em um cache LRU pelo texto original:
+artistas, álbuns e gêneros se repetem muito entre as músicas.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+
+# Textos distintos guardados no cache de cada função
+TAMANHO_CACHE = 32768
+
+_NAO_PALAVRA = re.compile(r'[^\w\s-]')
+
+# Blocos Unicode de marcas diacríticas combinantes (acentos, cedilha, til...)
+_DIACRITICOS = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+
+def _remover_acentos(texto):
+    """Decompõe (NFKD) e descarta as marcas diacríticas (usada nas comparações)"""
+    return _DIACRITICOS.sub('', unicodedata.normalize('NFKD', texto))
+
+
+def _remover_marcas(texto):
+    """Decompõe (NFD) e descarta as marcas combinantes (categoria Mn)"""
+    return ''.join(char for char in unicodedata.normalize('NFD', texto)
+                   if unicodedata.category(char) != 'Mn')
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def dobrar_texto(texto):
+    """
+    Forma do texto sem maiúsculas nem acentos, para comparações.
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto dobrado (ex.: "Beyoncé" -> "beyonce")
+    """
+    if texto.isascii():
+        # Caminho rápido: sem acentos, e casefold equivale a lower em ASCII
+        return texto.lower()
+    return _remover_acentos(texto).casefold()
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_texto(texto):
+    """
+    Normaliza texto removendo acentos e caracteres especiais para melhorar busca.
+
+    Args:
+        texto (str): Texto a ser normalizado
+
+    Returns:
+        str: Texto normalizado
+    """
+    if not texto:
+        return ""
+
+    # Remove acentos (texto ASCII não tem marcas combinantes)
+    if not texto.isascii():
+        texto = _remover_marcas(texto)
+
+    # Remove caracteres especiais exceto espaços e hífens
+    texto_limpo = _NAO_PALAVRA.sub('', texto)
+
+    # Remove espaços extras
+    return ' '.join(texto_limpo.split())
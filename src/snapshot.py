@@ -0,0 +1,224 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Snapshot binário colunar da playlist ("playlist.txt.snap").
+
+Guarda a TrackTable em seções binárias alinhadas em 8 bytes:
+títulos (bytes UTF-8 concatenados + deslocamentos), o dicionário de valores
+(separados por '\n', que nunca aparece em um campo) e a coluna de códigos
+(uint32) de artista/álbum/gênero, a coluna de anos (uint16) e os anos que
+não são numéricos (JSON).
+
+A leitura mapeia o arquivo (mmap) e usa memoryview.cast sobre as seções,
+sem copiar as colunas; só os dicionários de valores são decodificados na
+abertura (um split por campo), e cada título é decodificado quando acessado.
+
+O cabeçalho registra o tamanho e a data de modificação do playlist.txt
+do qual o snapshot foi gerado: se o texto mudar depois (edição manual,
+compactação do diário sem snapshot), o snapshot é ignorado.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from track import CAMPOS, CAMPOS_CODIFICADOS, TrackTable
+
+
+# Cabeçalho: assinatura, tamanho e mtime do texto de origem, quantidade de linhas
+_ASSINATURA = b'PLSNAP01'
+_CABECALHO = struct.Struct('<8sQQQ')
+_TAMANHO_SECAO = struct.Struct('<Q')
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def caminho_snapshot(nome_arquivo):
+    """Retorna o caminho do snapshot associado ao arquivo da playlist"""
+    return str(nome_arquivo) + '.snap'
+
+
+def _assinatura_texto(nome_arquivo):
+    info = os.stat(nome_arquivo)
+    return info.st_size, info.st_mtime_ns
+
+
+class TextosCompactados:
+    """Sequência de textos guardados como bytes UTF-8 contíguos + deslocamentos"""
+
+    __slots__ = ('_dados', '_offsets')
+
+    def __init__(self, dados, offsets):
+        self._dados = dados
+        self._offsets = offsets  # len(textos) + 1 deslocamentos
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fora da sequência")
+        return str(self._dados[self._offsets[indice]:self._offsets[indice + 1]], 'utf-8')
+
+    def __iter__(self):
+        dados = self._dados
+        inicio = self._offsets[0]
+        for fim in self._offsets[1:]:
+            yield str(dados[inicio:fim], 'utf-8')
+            inicio = fim
+
+
+# ===== Escrita =====
+
+def _textos_para_secoes(textos):
+    """Retorna (bytes concatenados, deslocamentos uint64) de uma lista de textos"""
+    offsets = array('Q', [0])
+    partes = []
+    posicao = 0
+    for texto in textos:
+        dados = texto.encode('utf-8')
+        partes.append(dados)
+        posicao += len(dados)
+        offsets.append(posicao)
+    return b''.join(partes), offsets
+
+
+def _escrever_secao(arquivo, dados):
+    if isinstance(dados, array):
+        if not _LITTLE_ENDIAN:
+            dados = array(dados.typecode, dados)
+            dados.byteswap()
+        dados = dados.tobytes()
+    arquivo.write(_TAMANHO_SECAO.pack(len(dados)))
+    arquivo.write(dados)
+    arquivo.write(b'\0' * (-len(dados) % 8))
+
+
+def escrever_snapshot(nome_arquivo, musicas):
+    """
+    Grava o snapshot das músicas, associado ao estado atual do playlist.txt.
+
+    Deve ser chamado logo depois de gravar o texto com o mesmo conteúdo.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt (já gravado)
+        musicas (iterable): Músicas (Track, dict ou tuplas na ordem de CAMPOS)
+
+    Returns:
+        int: Quantidade de músicas gravadas
+    """
+    tabela = TrackTable()
+    for musica in musicas:
+        if not isinstance(musica, tuple):
+            musica = tuple(musica[campo] for campo in CAMPOS)
+        tabela.adicionar_valores(*musica)
+
+    destino = Path(caminho_snapshot(nome_arquivo))
+    temporario = destino.with_name(destino.name + '.tmp')
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(_CABECALHO.pack(_ASSINATURA, *_assinatura_texto(nome_arquivo), len(tabela)))
+        for secao in _textos_para_secoes(tabela.titulos):
+            _escrever_secao(arquivo, secao)
+        for campo in CAMPOS_CODIFICADOS:
+            _escrever_secao(arquivo, '\n'.join(tabela.valores[campo]).encode('utf-8'))
+            _escrever_secao(arquivo, tabela.colunas[campo])
+        _escrever_secao(arquivo, tabela.anos)
+        anos_texto = {str(linha): ano for linha, ano in tabela.anos_texto.items()}
+        _escrever_secao(arquivo, json.dumps(anos_texto, ensure_ascii=False).encode('utf-8'))
+
+    os.replace(temporario, destino)
+    return len(tabela)
+
+
+def salvar_snapshot(nome_arquivo, musicas):
+    """Como escrever_snapshot, mas só avisa em caso de erro (o snapshot é opcional)"""
+    try:
+        escrever_snapshot(nome_arquivo, musicas)
+    except OSError as e:
+        print(f">> Aviso: não foi possível salvar o snapshot: {e}")
+
+
+# ===== Leitura =====
+
+class _LeitorSecoes:
+    """Percorre as seções do snapshot mapeado, devolvendo memoryviews"""
+
+    def __init__(self, mapa, inicio):
+        self._visao = memoryview(mapa)
+        self._posicao = inicio
+
+    def bytes(self):
+        (tamanho,) = _TAMANHO_SECAO.unpack_from(self._visao, self._posicao)
+        inicio = self._posicao + _TAMANHO_SECAO.size
+        fim = inicio + tamanho
+        if fim > len(self._visao):
+            raise ValueError("snapshot truncado")
+        self._posicao = fim + (-tamanho % 8)
+        return self._visao[inicio:fim]
+
+    def numeros(self, tipo):
+        dados = self.bytes()
+        if _LITTLE_ENDIAN:
+            return dados.cast(tipo)
+        copia = array(tipo, dados.tobytes())
+        copia.byteswap()
+        return copia
+
+    def textos(self):
+        dados = self.bytes()
+        return TextosCompactados(dados, self.numeros('Q'))
+
+
+def carregar_tabela(nome_arquivo):
+    """
+    Abre o snapshot do playlist.txt como TrackTable somente-leitura.
+
+    Args:
+        nome_arquivo (str): Caminho do playlist.txt
+
+    Returns:
+        TrackTable: Tabela com as colunas sobre o arquivo mapeado, ou None se
+        o snapshot não existir, estiver corrompido ou não corresponder ao texto
+    """
+    try:
+        assinatura_texto = _assinatura_texto(nome_arquivo)
+        with open(caminho_snapshot(nome_arquivo), 'rb') as arquivo:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None  # ValueError: snapshot vazio (mmap não aceita)
+
+    try:
+        assinatura, tamanho, mtime, total = _CABECALHO.unpack_from(mapa)
+        if assinatura != _ASSINATURA or (tamanho, mtime) != assinatura_texto:
+            mapa.close()
+            return None
+
+        leitor = _LeitorSecoes(mapa, _CABECALHO.size)
+        titulos = leitor.textos()
+        valores, colunas = {}, {}
+        for campo in CAMPOS_CODIFICADOS:
+            dados = leitor.bytes()
+            # Sem linhas não há valores ('' seria um valor vazio)
+            valores[campo] = str(dados, 'utf-8').split('\n') if total else []
+            colunas[campo] = leitor.numeros('I')
+        anos = leitor.numeros('H')
+        anos_texto = {int(linha): ano
+                      for linha, ano in json.loads(str(leitor.bytes(), 'utf-8')).items()}
+    except (struct.error, ValueError, TypeError):
+        return None
+
+    if len(titulos) != total or any(len(coluna) != total for coluna in colunas.values()):
+        return None
+
+    tabela = TrackTable.de_colunas(titulos, valores, colunas, anos, anos_texto)
+    # As memoryviews apontam para o mapa; ele vive enquanto a tabela existir
+    tabela.mapa = mapa
+    return tabela
@@ -0,0 +1,209 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Execução de tarefas demoradas da interface (enriquecimento, recarga,
+gravação, importação de capas) em um pool de threads.
+
+As threads de trabalho nunca tocam nos widgets: o progresso e o resultado
+de cada tarefa vão para uma fila thread-safe, que a thread da interface
+esvazia com despachar() (ex.: em um root.after). Os callbacks de cada
+tarefa (ao_progredir, ao_concluir, ao_falhar, ao_cancelar) rodam dentro de
+despachar(), portanto na thread da interface.
+
+Cada tarefa tem um token de cancelamento (threading.Event). A função da
+tarefa consulta tarefa.cancelada (ou chama tarefa.verificar(), que levanta
+TarefaCancelada) nos pontos em que pode parar.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Threads do pool (tarefas além disso esperam na fila do executor)
+TRABALHADORES = 3
+
+# Estados de uma tarefa
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+CANCELADA = 'cancelada'
+ERRO = 'erro'
+
+
+class TarefaCancelada(Exception):
+    """Levantada pela função da tarefa ao atender um pedido de cancelamento"""
+
+
+class Tarefa:
+    """Uma operação submetida ao ExecutorTarefas"""
+
+    def __init__(self, nome, executor, exclusiva=False):
+        self.nome = nome
+        self.exclusiva = exclusiva
+        self.estado = PENDENTE
+        self.progresso = ""       # Último texto de progresso despachado
+        self.fracao = None        # Último progresso numérico (0 a 1), se houver
+        self.resultado = None
+        self.erro = None
+        # Token de cancelamento; pode ser passado a quem espera um threading.Event
+        self.cancelamento = threading.Event()
+
+        self._executor = executor
+        self.ao_progredir = None
+        self.ao_concluir = None
+        self.ao_falhar = None
+        self.ao_cancelar = None
+
+    @property
+    def ativa(self):
+        return self.estado in (PENDENTE, EXECUTANDO)
+
+    @property
+    def cancelada(self):
+        """True se o cancelamento foi pedido"""
+        return self.cancelamento.is_set()
+
+    def cancelar(self):
+        """Pede o cancelamento (a função da tarefa decide quando parar)"""
+        self.cancelamento.set()
+
+    def verificar(self):
+        """Levanta TarefaCancelada se o cancelamento foi pedido"""
+        if self.cancelamento.is_set():
+            raise TarefaCancelada()
+
+    def informar(self, texto, fracao=None):
+        """
+        Publica o progresso (pode ser chamado de qualquer thread).
+
+        Args:
+            texto (str): Descrição do progresso, exibida na barra de status
+            fracao (float): Parte concluída, de 0 a 1 (opcional)
+        """
+        self._executor._publicar(self, 'progresso', (texto, fracao))
+
+
+class ExecutorTarefas:
+    """Pool de threads cujos resultados são entregues na thread da interface"""
+
+    def __init__(self, trabalhadores=TRABALHADORES):
+        """
+        Args:
+            trabalhadores (int): Threads do pool
+        """
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores,
+                                        thread_name_prefix='tarefa')
+        self._eventos = queue.Queue()  # (tarefa, evento, valor), lida só em despachar()
+        self.ativas = []               # Tarefas não finalizadas, na ordem de submissão
+        # ao_mudar(ativas): chamado em despachar() quando alguma tarefa muda
+        self.ao_mudar = None
+
+    def submeter(self, nome, funcao, *args, ao_concluir=None, ao_falhar=None,
+                 ao_cancelar=None, ao_progredir=None, exclusiva=False, **kwargs):
+        """
+        Executa funcao(tarefa, *args, **kwargs) em uma thread do pool.
+
+        Args:
+            nome (str): Descrição curta da tarefa (barra de status)
+            funcao (callable): Roda na thread de trabalho; recebe a Tarefa primeiro
+            ao_concluir (callable): ao_concluir(resultado)
+            ao_falhar (callable): ao_falhar(erro); sem ele, o erro fica só em tarefa.erro
+            ao_cancelar (callable): Chamado se a função levantar TarefaCancelada
+            ao_progredir (callable): ao_progredir(texto, fracao)
+            exclusiva (bool): Enquanto executa, a interface não deve alterar a playlist
+
+        Returns:
+            Tarefa: A tarefa submetida (permite cancelar)
+        """
+        tarefa = Tarefa(nome, self, exclusiva)
+        tarefa.ao_concluir = ao_concluir
+        tarefa.ao_falhar = ao_falhar
+        tarefa.ao_cancelar = ao_cancelar
+        tarefa.ao_progredir = ao_progredir
+        self.ativas.append(tarefa)
+        self._pool.submit(self._executar, tarefa, funcao, args, kwargs)
+        if self.ao_mudar is not None:
+            self.ao_mudar(self.ativas)
+        return tarefa
+
+    def _publicar(self, tarefa, evento, valor=None):
+        self._eventos.put((tarefa, evento, valor))
+
+    def _executar(self, tarefa, funcao, args, kwargs):
+        if tarefa.cancelada:
+            self._publicar(tarefa, CANCELADA)
+            return
+        self._publicar(tarefa, EXECUTANDO)
+        try:
+            resultado = funcao(tarefa, *args, **kwargs)
+        except TarefaCancelada:
+            self._publicar(tarefa, CANCELADA)
+        except Exception as e:
+            self._publicar(tarefa, ERRO, e)
+        else:
+            self._publicar(tarefa, CONCLUIDA, resultado)
+
+    def despachar(self):
+        """
+        Entrega os eventos pendentes (chamar só na thread da interface).
+
+        Returns:
+            bool: True se ainda há tarefas ativas (continuar consultando)
+        """
+        mudou = False
+        while True:
+            try:
+                tarefa, evento, valor = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            mudou = True
+
+            if evento == 'progresso':
+                tarefa.progresso, tarefa.fracao = valor
+                if tarefa.ao_progredir is not None:
+                    tarefa.ao_progredir(*valor)
+                continue
+
+            tarefa.estado = evento
+            if evento == EXECUTANDO:
+                continue
+            self.ativas.remove(tarefa)
+            if evento == CONCLUIDA:
+                tarefa.resultado = valor
+                if tarefa.ao_concluir is not None:
+                    tarefa.ao_concluir(valor)
+            elif evento == ERRO:
+                tarefa.erro = valor
+                if tarefa.ao_falhar is not None:
+                    tarefa.ao_falhar(valor)
+            elif tarefa.ao_cancelar is not None:
+                tarefa.ao_cancelar()
+
+        if mudou and self.ao_mudar is not None:
+            self.ao_mudar(self.ativas)
+        return bool(self.ativas)
+
+    def exclusiva(self):
+        """Tarefa exclusiva ativa (ou None)"""
+        for tarefa in self.ativas:
+            if tarefa.exclusiva:
+                return tarefa
+        return None
+
+    def cancelar_todas(self):
+        """Pede o cancelamento de todas as tarefas ativas"""
+        for tarefa in self.ativas:
+            tarefa.cancelar()
+
+    def encerrar(self, esperar=False):
+        """
+        Cancela as tarefas ativas e libera o pool.
+
+        Args:
+            esperar (bool): Espera as tarefas em execução terminarem
+        """
+        self.cancelar_todas()
+        self._pool.shutdown(wait=esperar, cancel_futures=True)
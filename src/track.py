@@ -0,0 +1,308 @@
+"""
+NOMES
+Leonardo Ferreira
+Heloi Vecchi Sgarbi
+Kaua Schiavolin Monteiro
+
+Representações compactas de músicas.
+
+Track: uma música com atributos fixos (__slots__), sem o dicionário por
+instância, mas que continua aceitando acesso por chave (musica['titulo']).
+Guarda também os campos dobrados (sem maiúsculas nem acentos) usados pelas
+buscas, calculados no primeiro uso e descartados a cada edição.
+
+TrackTable: tabela colunar para bibliotecas grandes. Artista, álbum e gênero
+são guardados uma única vez em dicionários de valores e referenciados por
+códigos inteiros; os anos ficam em um array numérico.
+"""
+import sys
+from array import array
+
+from normalizacao import dobrar_texto
+
+
+# Ordem dos campos no arquivo (Titulo;Artista;Album;Genero;Ano)
+CAMPOS = ('titulo', 'artista', 'album', 'genero', 'ano')
+
+# Campos com muitos valores repetidos (guardados por código na TrackTable)
+CAMPOS_CODIFICADOS = ('artista', 'album', 'genero')
+
+# Texto usado quando o ano é desconhecido
+ANO_DESCONHECIDO = '----'
+
+_POSICAO_CAMPO = {campo: posicao for posicao, campo in enumerate(CAMPOS)}
+
+
+class Track:
+    """Música com atributos fixos, compatível com o acesso por chave de um dict"""
+
+    __slots__ = CAMPOS + ('_dobrados',)
+
+    def __init__(self, titulo, artista, album='Desconhecido', genero='Desconhecido', ano=ANO_DESCONHECIDO):
+        self.titulo = titulo
+        # Valores repetidos entre músicas são internados (uma cópia por texto)
+        self.artista = sys.intern(artista)
+        self.album = sys.intern(album)
+        self.genero = sys.intern(genero)
+        self.ano = sys.intern(ano)
+        self._dobrados = None  # Campos dobrados, na ordem de CAMPOS (ver dobrados())
+
+    @classmethod
+    def de_dict(cls, dados):
+        """
+        Cria uma Track a partir de um dicionário com as chaves de CAMPOS.
+
+        Args:
+            dados (dict): Dicionário com os dados da música
+
+        Returns:
+            Track: Nova música
+        """
+        return cls(dados['titulo'], dados['artista'], dados['album'], dados['genero'], dados['ano'])
+
+    # ===== Acesso compatível com dict =====
+
+    def __getitem__(self, campo):
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo, valor):
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        if campo != 'titulo':
+            valor = sys.intern(valor)
+        setattr(self, campo, valor)
+        self._dobrados = None
+
+    def __contains__(self, campo):
+        return campo in CAMPOS
+
+    def __iter__(self):
+        return iter(CAMPOS)
+
+    def __len__(self):
+        return len(CAMPOS)
+
+    def get(self, campo, padrao=None):
+        """Retorna o valor do campo ou padrao se o campo não existir"""
+        if campo not in CAMPOS:
+            return padrao
+        return getattr(self, campo)
+
+    def keys(self):
+        """Retorna os nomes dos campos"""
+        return CAMPOS
+
+    def values(self):
+        """Retorna os valores dos campos, na ordem de CAMPOS"""
+        return self.para_tupla()
+
+    def items(self):
+        """Retorna pares (campo, valor), na ordem de CAMPOS"""
+        return tuple(zip(CAMPOS, self.para_tupla()))
+
+    def para_tupla(self):
+        """Retorna os valores como tupla (titulo, artista, album, genero, ano)"""
+        return (self.titulo, self.artista, self.album, self.genero, self.ano)
+
+    def para_dict(self):
+        """Retorna uma cópia da música como dicionário"""
+        return dict(zip(CAMPOS, self.para_tupla()))
+
+    def dobrados(self):
+        """
+        Retorna os campos sem maiúsculas nem acentos (ver normalizacao.dobrar_texto).
+
+        O resultado fica guardado até a próxima alteração de campo. Uma música
+        de uma Biblioteca compartilhada entre threads deve ser lida e alterada
+        com biblioteca.trava, senão o valor guardado pode ficar desatualizado.
+
+        Returns:
+            tuple: Valores dobrados, na ordem de CAMPOS
+        """
+        dobrados = self._dobrados
+        if dobrados is None:
+            dobrados = self._dobrados = tuple(map(dobrar_texto, self.para_tupla()))
+        return dobrados
+
+    def dobrado(self, campo):
+        """Retorna um campo sem maiúsculas nem acentos"""
+        return self.dobrados()[_POSICAO_CAMPO[campo]]
+
+    def __repr__(self):
+        return f"Track({self.titulo!r}, {self.artista!r}, {self.album!r}, {self.genero!r}, {self.ano!r})"
+
+
+def codificar_ano(texto):
+    """
+    Converte o ano em inteiro para a coluna numérica.
+
+    Args:
+        texto (str): Ano como está no arquivo
+
+    Returns:
+        int: Ano (1..65535) ou 0 se o texto não for um ano representável
+    """
+    if texto.isdigit() and len(texto) <= 5:
+        valor = int(texto)
+        if 0 < valor <= 0xFFFF and str(valor) == texto:
+            return valor
+    return 0
+
+
+class TrackTable:
+    """Tabela colunar de músicas com valores internados e anos numéricos"""
+
+    def __init__(self):
+        self.titulos = []
+        # Para cada campo codificado: lista código -> texto e dict texto -> código
+        self.valores = {campo: [] for campo in CAMPOS_CODIFICADOS}
+        self._codigos = {campo: {} for campo in CAMPOS_CODIFICADOS}
+        self.colunas = {campo: array('I') for campo in CAMPOS_CODIFICADOS}
+        self.anos = array('H')
+        # Anos que não cabem na coluna numérica (ex.: '' ou '19xx'), por linha
+        self.anos_texto = {}
+
+    @classmethod
+    def de_musicas(cls, musicas):
+        """
+        Monta uma tabela a partir de qualquer iterável de músicas (dicts ou Tracks).
+
+        Args:
+            musicas (iterable): Músicas com as chaves de CAMPOS
+
+        Returns:
+            TrackTable: Tabela preenchida
+        """
+        tabela = cls()
+        tabela.extend(musicas)
+        return tabela
+
+    def _codigo(self, campo, texto):
+        """Retorna o código do texto no dicionário do campo, criando se necessário"""
+        if self._codigos is None:
+            self._codigos = {campo: {texto: codigo for codigo, texto in enumerate(self.valores[campo])}
+                             for campo in CAMPOS_CODIFICADOS}
+        codigos = self._codigos[campo]
+        codigo = codigos.get(texto)
+        if codigo is None:
+            codigo = len(self.valores[campo])
+            texto = sys.intern(texto)
+            self.valores[campo].append(texto)
+            codigos[texto] = codigo
+        return codigo
+
+    def _definir_ano(self, linha, texto):
+        valor = codificar_ano(texto)
+        if valor == 0 and texto != ANO_DESCONHECIDO:
+            self.anos_texto[linha] = texto
+        else:
+            self.anos_texto.pop(linha, None)
+        return valor
+
+    @classmethod
+    def de_colunas(cls, titulos, valores, colunas, anos, anos_texto):
+        """
+        Monta uma tabela a partir de colunas prontas (ex.: lidas de um snapshot).
+
+        As colunas podem ser memoryviews somente-leitura; nesse caso a tabela
+        serve para consulta, mas append/definir levantam TypeError.
+
+        Args:
+            titulos (sequence): Títulos, um por linha
+            valores (dict): Campo codificado -> lista código -> texto
+            colunas (dict): Campo codificado -> sequência de códigos
+            anos (sequence): Anos numéricos (0 = ver anos_texto ou '----')
+            anos_texto (dict): Linha -> ano como texto
+
+        Returns:
+            TrackTable: Tabela com as colunas informadas
+        """
+        tabela = cls()
+        tabela.titulos = titulos
+        tabela.valores = valores
+        tabela._codigos = None  # Montado só se a tabela for alterada
+        tabela.colunas = colunas
+        tabela.anos = anos
+        tabela.anos_texto = anos_texto
+        return tabela
+
+    def adicionar_valores(self, titulo, artista, album, genero, ano):
+        """Adiciona uma linha a partir dos cinco valores, na ordem de CAMPOS"""
+        linha = len(self.titulos)
+        self.titulos.append(titulo)
+        self.colunas['artista'].append(self._codigo('artista', artista))
+        self.colunas['album'].append(self._codigo('album', album))
+        self.colunas['genero'].append(self._codigo('genero', genero))
+        self.anos.append(self._definir_ano(linha, ano))
+
+    def append(self, musica):
+        """Adiciona uma música (dict ou Track) ao final da tabela"""
+        self.adicionar_valores(*(musica[campo] for campo in CAMPOS))
+
+    def extend(self, musicas):
+        """Adiciona várias músicas ao final da tabela"""
+        for musica in musicas:
+            self.append(musica)
+
+    def __len__(self):
+        return len(self.titulos)
+
+    def valor(self, linha, campo):
+        """
+        Retorna o texto de um campo de uma linha.
+
+        Args:
+            linha (int): Posição da música na tabela
+            campo (str): Um dos CAMPOS
+
+        Returns:
+            str: Valor do campo
+        """
+        if campo == 'titulo':
+            return self.titulos[linha]
+        if campo == 'ano':
+            ano = self.anos[linha]
+            if ano:
+                return str(ano)
+            return self.anos_texto.get(linha, ANO_DESCONHECIDO)
+        if campo in CAMPOS_CODIFICADOS:
+            return self.valores[campo][self.colunas[campo][linha]]
+        raise KeyError(campo)
+
+    def definir(self, linha, campo, texto):
+        """Altera o valor de um campo de uma linha já existente"""
+        if campo == 'titulo':
+            self.titulos[linha] = texto
+        elif campo == 'ano':
+            self.anos[linha] = self._definir_ano(linha, texto)
+        elif campo in CAMPOS_CODIFICADOS:
+            self.colunas[campo][linha] = self._codigo(campo, texto)
+        else:
+            raise KeyError(campo)
+
+    def __getitem__(self, linha):
+        """Materializa a linha como Track (acesso compatível com dict)"""
+        if linha < 0:
+            linha += len(self)
+        if not 0 <= linha < len(self):
+            raise IndexError("linha fora da tabela")
+        return Track(*(self.valor(linha, campo) for campo in CAMPOS))
+
+    def __iter__(self):
+        # Percorre as colunas diretamente (bem mais rápido que self[linha])
+        artistas, albuns, generos = (self.valores[campo] for campo in CAMPOS_CODIFICADOS)
+        anos_texto = self.anos_texto
+        textos_ano = {}
+        # tolist() converte a coluna inteira em C (array ou memoryview)
+        colunas = zip(self.titulos, *(self.colunas[campo].tolist() for campo in CAMPOS_CODIFICADOS),
+                      self.anos.tolist())
+        for linha, (titulo, artista, album, genero, ano) in enumerate(colunas):
+            if ano:
+                texto_ano = textos_ano.get(ano)
+                if texto_ano is None:
+                    texto_ano = textos_ano[ano] = str(ano)
+            else:
+                texto_ano = anos_texto.get(linha, ANO_DESCONHECIDO)
+            yield Track(titulo, artistas[artista], albuns[album], generos[genero], texto_ano)